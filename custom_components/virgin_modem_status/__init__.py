@@ -1,30 +1,104 @@
 """Virgin Modem Status – Home Assistant custom integration."""
 from __future__ import annotations
+import asyncio
 import logging
+import os
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+import homeassistant.helpers.config_validation as cv
 
-from .const import DOMAIN, DEFAULT_HOST, DEFAULT_SCAN_INTERVAL
+from .const import (
+    DOMAIN,
+    DATA_SCHEDULER,
+    DEFAULT_HOST,
+    DEFAULT_SCAN_INTERVAL,
+    CONF_SCAN_INTERVAL,
+    CONF_HISTORY_RETENTION_DAYS,
+    DEFAULT_HISTORY_RETENTION_DAYS,
+    CONF_CUSTOM_RULES,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    CONF_PARSE_THRESHOLD,
+    DEFAULT_PARSE_THRESHOLD,
+    CONF_ATTRIBUTE_MODE,
+    DEFAULT_ATTRIBUTE_MODE,
+    CONF_BACKEND,
+    CONF_COMMUNITY,
+    CONF_PORT,
+    BACKEND_HTTP,
+    DEFAULT_COMMUNITY,
+    DEFAULT_PORT,
+)
 from .api import VirginApi
+from .classifier import get_classifier, parse_rules
 from .coordinator import VirginCoordinator
+from .persist import STORAGE_VERSION as STATE_STORAGE_VERSION
+from .history import EventHistoryStore
+from .scheduler import VirginPollScheduler
+from .services import async_register_services
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS: list[str] = ["sensor", "binary_sensor"]
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    get_classifier()  # compile the default severity matcher once, up front
+    async_register_services(hass)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    session = async_get_clientsession(hass)
+    # One hub-level scheduler (and keep-alive connection pool) shared by all modems
+    scheduler: VirginPollScheduler | None = hass.data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_SCHEDULER] = VirginPollScheduler(hass)
+
     host = entry.data.get("host", DEFAULT_HOST)
-    scan_interval = entry.options.get("scan_interval", DEFAULT_SCAN_INTERVAL) if entry.options else DEFAULT_SCAN_INTERVAL
+    scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL) if entry.options else DEFAULT_SCAN_INTERVAL
+
+    # Severity classifier: per-modem user rules (from options) ahead of the built-in ones
+    try:
+        user_rules = tuple(parse_rules(entry.options.get(CONF_CUSTOM_RULES, "")))
+    except ValueError as exc:
+        _LOGGER.warning("Ignoring custom severity rules for %s: %s", host, exc)
+        user_rules = ()
+
+    api = VirginApi(
+        host,
+        scheduler.session,
+        parse_threshold=entry.options.get(CONF_PARSE_THRESHOLD, DEFAULT_PARSE_THRESHOLD),
+        backend=entry.data.get(CONF_BACKEND, BACKEND_HTTP),
+        community=entry.data.get(CONF_COMMUNITY, DEFAULT_COMMUNITY),
+        port=entry.data.get(CONF_PORT, DEFAULT_PORT),
+        budget=scheduler.retry_budget,
+    )
+    coordinator = VirginCoordinator(
+        hass,
+        api,
+        scan_interval,
+        get_classifier(user_rules),
+        min_interval=entry.options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+        max_interval=entry.options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+        attribute_mode=entry.options.get(CONF_ATTRIBUTE_MODE, DEFAULT_ATTRIBUTE_MODE),
+        store=_state_store(hass, entry),
+    )
 
-    api = VirginApi(host, session)
-    coordinator = VirginCoordinator(hass, api, scan_interval)
+    # Per-modem on-disk event history (SQLite under .storage, opened off the loop)
+    retention = entry.options.get(CONF_HISTORY_RETENTION_DAYS, DEFAULT_HISTORY_RETENTION_DAYS)
+    history = EventHistoryStore(hass.config.path(".storage", f"{DOMAIN}.{entry.entry_id}.db"), retention)
 
-    # First poll (important)
-    await coordinator.async_config_entry_first_refresh()
+    # Local disk only, both at once: the saved state (last snapshot, health verdict and the delta
+    # window, so rows delivered before the last restart are not re-emitted) and the history database
+    await asyncio.gather(
+        coordinator.state.async_load(),
+        hass.async_add_executor_job(history.open),
+    )
+    coordinator.history = history
+
+    # Entities start from last-known state; the modem is not contacted during setup
+    await coordinator.async_restore()
 
     # Store for platforms
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
@@ -34,6 +108,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         PLATFORMS
     )
 
+    # First poll runs in the background so a slow/offline modem never blocks setup
+    scheduler.async_add(entry.entry_id, coordinator)
+
     # Reload on options change
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     return True
@@ -41,10 +118,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     await hass.config_entries.async_reload(entry.entry_id)
 
+def _state_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    return Store(hass, STATE_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.state")
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    # Drop the modem's history database and saved state along with the entry
+    path = hass.config.path(".storage", f"{DOMAIN}.{entry.entry_id}.db")
+    await hass.async_add_executor_job(_remove_files, (path, f"{path}-wal", f"{path}-shm"))
+    await _state_store(hass, entry).async_remove()
+
+def _remove_files(paths) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        coordinator: VirginCoordinator | None = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        scheduler: VirginPollScheduler | None = hass.data.get(DATA_SCHEDULER)
+        if scheduler is not None:
+            scheduler.async_remove(entry.entry_id)
+            if scheduler.empty:
+                hass.data.pop(DATA_SCHEDULER, None)
+                await scheduler.async_stop()
+        if coordinator is not None:
+            await coordinator.state.async_flush()
+            if coordinator.history is not None:
+                await hass.async_add_executor_job(coordinator.history.close)
     return unload_ok
 
 
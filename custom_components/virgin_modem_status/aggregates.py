@@ -0,0 +1,99 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/aggregates.py
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+from .classifier import SeverityClassifier
+from .const import SEVERITIES
+from .events import EventRow, EventTable
+
+# (time, message, occurrence) – occurrence keeps identical rows in one table distinct
+RowKey = Tuple[str, str, int]
+
+RATE_WINDOW = 3600.0  # seconds covered by the per-hour rate
+
+
+class SeverityAggregates:
+    """
+    Per-severity counters over the modem's current event table, plus a rolling
+    arrivals-per-hour rate.
+
+    Each poll is a single pass over the table: rows already seen in the previous
+    table reuse their cached classification and cost a dict lookup; only rows
+    that are new are classified and counted in, and rows that rotated out are
+    counted out. Nothing is rebuilt from scratch. Arrivals for the rate are the
+    rows the delta engine reports as new (see EventDelta).
+    """
+
+    def __init__(self, rate_window: float = RATE_WINDOW) -> None:
+        self.rate_window = rate_window
+        self.counts: Dict[str, int] = dict.fromkeys(SEVERITIES, 0)
+        self._window: Dict[RowKey, Tuple[str, Optional[str]]] = {}
+        self._arrivals: Deque[Tuple[float, str]] = deque()
+
+    def update(
+        self,
+        table: EventTable,
+        classifier: SeverityClassifier,
+        now: float,
+        arrivals: Iterable[EventRow] = (),
+    ) -> None:
+        """Fold a freshly fetched table in and count `arrivals` (rows of it that are news)."""
+        window: Dict[RowKey, Tuple[str, Optional[str]]] = {}
+        seen: Dict[Tuple[str, str], int] = {}
+        old = self._window
+
+        for row in table.rows:
+            if not (row.time or row.message):
+                continue
+            pair = (row.time, row.message)
+            occurrence = seen.get(pair, 0)
+            seen[pair] = occurrence + 1
+            key = (row.time, row.message, occurrence)
+
+            cached = old.pop(key, None)
+            if cached is None:
+                cached = classifier.classify(row.message, row.priority)
+                self.counts[cached[0]] = self.counts.get(cached[0], 0) + 1
+            row.severity, row.keyword = cached
+            window[key] = cached
+
+        # Whatever is left in the old window rotated out of the modem's table
+        for severity, _ in old.values():
+            self.counts[severity] -= 1
+
+        self._window = window
+        for row in arrivals:
+            self._arrivals.append((now, row.severity))
+        self.expire(now)
+
+    def expire(self, now: float) -> bool:
+        """Drop arrivals older than the rate window; True if anything changed."""
+        cutoff = now - self.rate_window
+        dropped = False
+        while self._arrivals and self._arrivals[0][0] < cutoff:
+            self._arrivals.popleft()
+            dropped = True
+        return dropped
+
+    @property
+    def rate_per_hour(self) -> float:
+        """New events per hour over the rate window."""
+        return round(len(self._arrivals) * 3600.0 / self.rate_window, 2)
+
+    def rates_by_severity(self) -> Dict[str, float]:
+        scale = 3600.0 / self.rate_window
+        by_sev = dict.fromkeys(SEVERITIES, 0)
+        for _, severity in self._arrivals:
+            by_sev[severity] = by_sev.get(severity, 0) + 1
+        return {sev: round(n * scale, 2) for sev, n in by_sev.items()}
+
+    def snapshot(self) -> Dict[str, object]:
+        """Immutable-by-convention copy for the coordinator payload."""
+        return {
+            "counts": dict(self.counts),
+            "rate_per_hour": self.rate_per_hour,
+            "rates": self.rates_by_severity(),
+        }
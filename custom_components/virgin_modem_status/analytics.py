@@ -0,0 +1,203 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/analytics.py
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+# Samples kept per metric (~7 h at the default 90 s scan interval)
+DEFAULT_WINDOW = 288
+EWMA_ALPHA = 0.1
+WARMUP = 30               # samples before anomalies are reported at all
+Z_THRESHOLD = 4.0         # |z| of a single sample against the window
+# CUSUM slack, in standard deviations. At 0.5 the ordinary daily temperature swing
+# (a few tenths of a dB either way of the window mean for hours) walked SNR and
+# upstream power into "drifting" about half the time (tools/bench_analytics.py).
+CUSUM_K = 1.0
+CUSUM_H = 8.0             # CUSUM alarm threshold, in standard deviations
+CUSUM_CAP = 2 * CUSUM_H   # clamp, so the alarm clears within a few hours of recovery
+
+# metric → (direction that is bad: +1 rising / -1 falling, noise floor in the metric's unit).
+# The floor stands in for the standard deviation of a flat-lined metric, so a modem
+# whose SNR sat at exactly 38.0 dB for hours doesn't flag a 0.1 dB wobble.
+LINE_METRICS: Dict[str, Tuple[int, float]] = {
+    "snr_min": (-1, 0.5),              # worst downstream SNR (dB)
+    "snr_mean": (-1, 0.5),             # average downstream SNR (dB)
+    "ds_power_spread": (1, 0.5),       # max - min downstream power (dB) – tilt/ingress
+    "us_power_max": (1, 0.5),          # highest upstream transmit power (dBmV)
+    "uncorrected_per_min": (1, 5.0),   # uncorrectable codewords per minute
+    "t3_per_hour": (1, 20.0),          # fresh T3/T4 time-outs per hour (a lone one isn't news)
+}
+
+
+class RingStats:
+    """
+    Fixed-size ring buffer of samples with O(1) running statistics.
+
+    Running sum / sum of squares are updated as samples enter and leave, and
+    re-summed once per full lap to shed floating-point drift. Also keeps an EWMA,
+    a rate (change per hour across the window) and a two-sided CUSUM.
+    """
+
+    __slots__ = (
+        "size", "min_std", "_values", "_times", "_pos", "count", "_sum", "_sumsq",
+        "ewma", "cusum_hi", "cusum_lo", "last", "last_z",
+    )
+
+    def __init__(self, size: int = DEFAULT_WINDOW, min_std: float = 1e-3) -> None:
+        self.size = size
+        self.min_std = min_std
+        self._values = array("d", bytes(8 * size))
+        self._times = array("d", bytes(8 * size))
+        self._pos = 0
+        self.count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self.ewma: Optional[float] = None
+        self.cusum_hi = 0.0
+        self.cusum_lo = 0.0
+        self.last: Optional[float] = None
+        self.last_z = 0.0
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._sum / self.count if self.count else None
+
+    @property
+    def variance(self) -> Optional[float]:
+        if self.count < 2:
+            return None
+        mean = self._sum / self.count
+        return max(0.0, self._sumsq / self.count - mean * mean)
+
+    @property
+    def std(self) -> Optional[float]:
+        var = self.variance
+        return math.sqrt(var) if var is not None else None
+
+    @property
+    def rate_per_hour(self) -> Optional[float]:
+        """Change per hour between the oldest and newest sample in the window."""
+        if self.count < 2:
+            return None
+        newest = (self._pos - 1) % self.size
+        oldest = self._pos % self.size if self.count == self.size else 0
+        span = self._times[newest] - self._times[oldest]
+        if span <= 0:
+            return None
+        return (self._values[newest] - self._values[oldest]) * 3600.0 / span
+
+    def add(self, now: float, value: float) -> float:
+        """Add a sample; returns its z-score against the window *before* it arrived."""
+        std = self.std
+        z = 0.0
+        if std is not None:
+            z = (value - self._sum / self.count) / max(std, self.min_std)
+            self.cusum_hi = min(CUSUM_CAP, max(0.0, self.cusum_hi + z - CUSUM_K))
+            self.cusum_lo = min(CUSUM_CAP, max(0.0, self.cusum_lo - z - CUSUM_K))
+
+        pos = self._pos
+        if self.count == self.size:
+            old = self._values[pos]
+            self._sum -= old
+            self._sumsq -= old * old
+        else:
+            self.count += 1
+        self._values[pos] = value
+        self._times[pos] = now
+        self._sum += value
+        self._sumsq += value * value
+        self._pos = (pos + 1) % self.size
+        if self._pos == 0:
+            self._resum()
+
+        self.ewma = value if self.ewma is None else self.ewma + EWMA_ALPHA * (value - self.ewma)
+        self.last = value
+        self.last_z = z
+        return z
+
+    def _resum(self) -> None:
+        vals = self._values[:self.count]
+        self._sum = math.fsum(vals)
+        self._sumsq = math.fsum(v * v for v in vals)
+
+    def as_dict(self) -> Dict[str, Any]:
+        def _r(v: Optional[float]) -> Optional[float]:
+            return round(v, 3) if v is not None else None
+        return {
+            "last": _r(self.last),
+            "mean": _r(self.mean),
+            "std": _r(self.std),
+            "ewma": _r(self.ewma),
+            "rate_per_hour": _r(self.rate_per_hour),
+            "z": round(self.last_z, 2),
+            "cusum": round(max(self.cusum_hi, self.cusum_lo), 2),
+            "samples": self.count,
+        }
+
+
+class LineAnalytics:
+    """
+    Rolling-window line-quality analytics for one modem, one RingStats per metric.
+
+    Memory is fixed at construction (two float64 arrays per metric), whatever
+    the uptime. A metric is anomalous when, in its bad direction, the latest
+    sample is more than Z_THRESHOLD standard deviations out, or its one-sided
+    CUSUM exceeds CUSUM_H (slow drifts such as SNR degrading over hours).
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self.metrics: Dict[str, RingStats] = {
+            name: RingStats(window, floor) for name, (_, floor) in LINE_METRICS.items()
+        }
+        self.anomalies: List[str] = []
+
+    def update(self, now: float, sample: Dict[str, Optional[float]]) -> List[str]:
+        """Add one poll's values (None = not available this poll); returns the anomaly reasons."""
+        reasons: List[str] = []
+        for name, value in sample.items():
+            stats = self.metrics.get(name)
+            if stats is None or value is None or math.isnan(value):
+                continue
+            z = stats.add(now, float(value))
+            if stats.count <= WARMUP:
+                continue
+            bad = LINE_METRICS[name][0]
+            cusum = stats.cusum_hi if bad > 0 else stats.cusum_lo
+            if z * bad > Z_THRESHOLD:
+                reasons.append(f"{name} spike")
+            elif cusum > CUSUM_H:
+                reasons.append(f"{name} drifting {'up' if bad > 0 else 'down'}")
+        self.anomalies = reasons
+        return reasons
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Verdict for the coordinator payload – only changes when the verdict does."""
+        return {"anomaly": bool(self.anomalies), "reasons": tuple(self.anomalies)}
+
+    def metrics_dict(self) -> Dict[str, Any]:
+        """Per-metric statistics (attributes / diagnostics)."""
+        return {name: stats.as_dict() for name, stats in self.metrics.items() if stats.count}
+
+
+def line_sample(
+    snr: Tuple[float, ...],
+    ds_power: Tuple[float, ...],
+    us_power: Tuple[float, ...],
+    uncorrected_delta: Optional[float],
+    elapsed: float,
+    t3_count: int,
+) -> Dict[str, Optional[float]]:
+    """Reduce one poll's channel values and fresh events to the LINE_METRICS sample."""
+    per_min = 60.0 / elapsed if elapsed > 0 else None
+    return {
+        "snr_min": min(snr) if snr else None,
+        "snr_mean": sum(snr) / len(snr) if snr else None,
+        "ds_power_spread": max(ds_power) - min(ds_power) if ds_power else None,
+        "us_power_max": max(us_power) if us_power else None,
+        "uncorrected_per_min": (
+            uncorrected_delta * per_min if uncorrected_delta is not None and per_min else None
+        ),
+        "t3_per_hour": t3_count * 60.0 * per_min if per_min else None,
+    }
@@ -1,209 +1,517 @@
 """Virgin Modem Status – Home Assistant custom integration."""
 # custom_components/virgin_modem_status/api.py
 from __future__ import annotations
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+import asyncio
+import codecs
+import hashlib
 import logging
 import json
-import re
-from aiohttp import ClientSession, ClientTimeout, ClientError
-
-from .const import DEFAULT_HOST, ROUTER_STATUS_PATH
+import time
+from aiohttp import ClientResponse, ClientResponseError, ClientSession, ClientTimeout, ClientError
+from aiohttp.hdrs import ETAG, IF_MODIFIED_SINCE, IF_NONE_MATCH, LAST_MODIFIED, RANGE
+
+from .const import (
+    BACKEND_HTTP,
+    BACKEND_SNMP,
+    DEFAULT_COMMUNITY,
+    DEFAULT_HOST,
+    DEFAULT_PARSE_THRESHOLD,
+    DEFAULT_PORT,
+    OID_MSG,
+    OID_PRI,
+    OID_TIME,
+    ROUTER_STATUS_PATH,
+)
+from .channels import CHANNEL_COLUMNS, ChannelSample
+from .events import EventTable
+from .instrumentation import PollStats
+from .profiles import GENERIC_HTML, PROFILES, FirmwareProfile, detect_profile, loads
+from .resilience import HALF_OPEN, CircuitBreaker, RetryBudget, backoff_delay
+
+if TYPE_CHECKING:  # the SNMP codec and HTML parser are imported on first use
+    from .html_parser import HtmlEventStream
+    from .snmp import SnmpClient
 
 _LOGGER = logging.getLogger(__name__)
-_DEFAULT_TIMEOUT = 10  # seconds
+_DEFAULT_TIMEOUT = 10  # seconds, whole fetch including retries
+_CONNECT_TIMEOUT = 3  # seconds to establish the TCP connection
+_READ_TIMEOUT = 5  # seconds of silence tolerated between body chunks
+_PROBE_TIMEOUT = 2  # seconds for the breaker's HEAD probe
+_MAX_ATTEMPTS = 3  # per fetch, while the retry budget allows
+_PROBE_BYTES = 1024  # read by check_reachable()
+_CHUNK_SIZE = 16 * 1024  # bytes read per step while streaming the status page
+_EXECUTOR_BATCH = 128 * 1024  # chars handed to the executor per hop once parsing is off-loaded
+_NOT_JSON = object()  # _parse_json_body(): the body didn't decode as JSON
+
+
+def _snmp_columns() -> Tuple[tuple, Dict[tuple, str]]:
+    """
+    docsDevEvent columns walked by the SNMP backend (time, level, text), plus the
+    channel-table columns walked in the same GETBULK exchange.
+    """
+    from .snmp import parse_oid
+
+    events = (parse_oid(OID_TIME), parse_oid(OID_PRI), parse_oid(OID_MSG))
+    channels = {parse_oid(oid): name for name, (_, oid) in CHANNEL_COLUMNS.items()}
+    return events, channels
 
-# OID column prefixes used by many DOCSIS firmwares
-OID_TIME = "1.3.6.1.2.1.69.1.5.8.1.2."   # docsDevEvTime
-OID_PRI  = "1.3.6.1.2.1.69.1.5.8.1.5."   # docsDevEvLevel / priority
-OID_MSG  = "1.3.6.1.2.1.69.1.5.8.1.7."   # docsDevEvText
 
 class VirginApiError(Exception):
-    """Raised when the Virgin modem status fetch or parse fails."""
+    """
+    Raised when the Virgin modem status fetch or parse fails. `transient` errors
+    (connection refused/reset, timeouts, 5xx) are retried and count towards the
+    circuit breaker; the others mean the modem answered, just not usefully.
+    """
+
+    def __init__(self, message: str, transient: bool = False) -> None:
+        super().__init__(message)
+        self.transient = transient
+
+
+class VirginApiTimeout(VirginApiError):
+    """The modem didn't connect or answer within the deadline."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message, transient=True)
 
 
 class VirginApi:
     """
-    HTTP-backed API for Virgin modem status.
-    Tries JSON (including flat OID maps) first; falls back to HTML parsing (no extra deps).
+    API for Virgin modem status, over HTTP (default) or SNMP v2c.
+    HTTP: the firmware profile (see profiles.py) that matches the host's payload is
+    detected on the first poll and reused until it stops fitting; HTML pages are
+    streamed through the incremental parser as they arrive (no extra deps).
+    SNMP: walks the docsDevEventTable columns with GETBULK (see snmp.py).
+
+    Fetches have separate connect / read deadlines inside an overall `timeout`,
+    transient failures are retried with jittered exponential backoff while the
+    (hub-wide) retry budget allows, and a per-host circuit breaker skips polls of
+    a modem known to be down until a cheap probe says it is back.
     """
 
-    def __init__(self, host: str, session: ClientSession, timeout: int = _DEFAULT_TIMEOUT) -> None:
+    def __init__(
+        self,
+        host: str,
+        session: ClientSession,
+        timeout: int = _DEFAULT_TIMEOUT,
+        parse_threshold: int = DEFAULT_PARSE_THRESHOLD,
+        backend: str = BACKEND_HTTP,
+        community: str = DEFAULT_COMMUNITY,
+        port: int = DEFAULT_PORT,
+        budget: Optional[RetryBudget] = None,
+    ) -> None:
         self.host = host or DEFAULT_HOST
+        self.backend = backend
         self._base = f"http://{self.host}"
         self._session = session
-        self._timeout = ClientTimeout(total=timeout)
+        self._deadline = float(timeout)
+        self._timeout = self._attempt_timeout(self._deadline)
+        self.budget = budget if budget is not None else RetryBudget()
+        self.breaker = CircuitBreaker()
+        # Change detection: validators the firmware may honour, plus a body digest
+        # for firmwares that don't. The last snapshot is handed back as the SAME
+        # object when nothing changed so the coordinator can short-circuit.
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._digest: Optional[bytes] = None
+        self._snapshot: Optional[EventTable] = None
+        self._events: Optional[List[Dict[str, Any]]] = None
+        # Latest per-channel sample (None if the firmware/backend exposes no channel tables);
+        # a new object whenever a changed body was parsed
+        self.channels: Optional[ChannelSample] = None
+        # Firmware profile detected for this host; None until a body was parsed
+        self.profile: Optional[FirmwareProfile] = None
+        # Bodies larger than this (bytes) are parsed in the executor, not on the loop
+        self.parse_threshold = int(parse_threshold)
+        # Per-stage timings, sizes and parse paths (the coordinator adds its own stages)
+        self.stats = PollStats()
+        self._snmp: Optional[SnmpClient] = None
+        if backend == BACKEND_SNMP:
+            # Only SNMP users pay for the BER codec
+            from .snmp import SnmpClient
+
+            self._snmp = SnmpClient(self.host, port, community, timeout=min(timeout, 3))
+            self._snmp_columns, self._snmp_channel_columns = _snmp_columns()
+
+    @property
+    def events(self) -> Optional[List[Dict[str, Any]]]:
+        """Raw rows behind the current snapshot (same object until they change)."""
+        return self._events
+
+    def restore(self, events: List[Dict[str, Any]]) -> EventTable:
+        """
+        Seed the snapshot from rows persisted by a previous run. If the first poll
+        finds the same rows, it hands back this very table (the unchanged path).
+        """
+        self._events = events
+        self._snapshot = EventTable.from_events(events) if events else EventTable([])
+        return self._snapshot
+
+    async def check_reachable(self) -> None:
+        """
+        Cheap connectivity check (config flow): the first KB of the status page,
+        asked for with a Range request, must look like JSON or HTML; over SNMP one
+        single-row GETBULK must be answered. Nothing is parsed or cached.
+        Raises VirginApiTimeout / VirginApiError.
+        """
+        if self._snmp is not None:
+            from .snmp import SnmpError, SnmpTimeout
+
+            try:
+                await self._snmp.probe(self._snmp_columns[0])
+            except SnmpTimeout as exc:
+                raise VirginApiTimeout(f"SNMP probe failed: {exc}") from exc
+            except SnmpError as exc:
+                raise VirginApiError(f"SNMP probe failed: {exc}") from exc
+            return
 
-    async def fetch_snapshot(self) -> Dict[str, Any]:
-        """Fetch modem status and return a flat OID-like dict of the last ~20 events."""
         url = f"{self._base}{ROUTER_STATUS_PATH}"
         try:
-            async with self._session.get(url, timeout=self._timeout) as resp:
+            async with self._session.get(
+                url, timeout=self._timeout, headers={RANGE: f"bytes=0-{_PROBE_BYTES - 1}"}
+            ) as resp:
                 resp.raise_for_status()
-                raw = await resp.text()
-        except (ClientError, Exception) as exc:
-            raise VirginApiError(f"Router status fetch failed: {exc}") from exc
-
-        # Prefer JSON path; cover both array/list layouts and flat OID->value dicts
-        events: List[Dict[str, Any]] = []
-        txt = (raw or "").lstrip()
-        if txt.startswith("{") or txt.startswith("["):
-            try:
-                data = json.loads(txt)
-                events = self._extract_events_from_json(data)
-                if events:
-                    _LOGGER.debug("VirginApi: parsed %d JSON events from %s", len(events), url)
-                    return self._events_to_flat_map(events)
-            except Exception as exc:
-                _LOGGER.debug("VirginApi: JSON parse failed (%s), will try HTML.", exc)
+                head = await resp.content.read(_PROBE_BYTES)
+        except asyncio.TimeoutError as exc:
+            raise VirginApiTimeout(f"Router status probe timed out ({url})") from exc
+        except ClientError as exc:
+            raise VirginApiError(f"Router status probe failed: {exc}") from exc
+        if head.lstrip()[:1] not in (b"{", b"[", b"<"):
+            raise VirginApiError(f"Unexpected response from {url}: {head[:60]!r}")
 
-        # HTML fallback (only warn about login on the HTML path)
-        events = self._extract_events_from_html(raw)
-        _LOGGER.debug(
-            "VirginApi: parsed %d HTML events from %s (first bytes: %r)",
-            len(events), url, raw[:120] if raw else ""
+    @staticmethod
+    def _attempt_timeout(remaining: float) -> ClientTimeout:
+        return ClientTimeout(
+            total=remaining,
+            sock_connect=min(_CONNECT_TIMEOUT, remaining),
+            sock_read=min(_READ_TIMEOUT, remaining),
         )
-        if not events:
-            _LOGGER.warning("VirginApi: no events parsed from %s", url)
-            return {}
-
-        return self._events_to_flat_map(events)
-
-    # ---------- helpers ----------
-
-    def _events_to_flat_map(self, events: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Convert normalised event rows to the flat OID-like structure the coordinator expects."""
-        flat: Dict[str, Any] = {}
-        # keep the last 20 (or fewer) rows
-        tail = events[-20:]
-        for i, ev in enumerate(tail, start=1):
-            t = (ev.get("time") or "").strip()
-            m = (ev.get("message") or "").strip()
-            p = (ev.get("priority") or "").strip()
-            flat[f"{OID_TIME}{i}"] = t
-            flat[f"{OID_MSG}{i}"]  = m
-            if p:
-                flat[f"{OID_PRI}{i}"] = p
-        return flat
-
-    def _extract_events_from_json(self, data: Any) -> List[Dict[str, Any]]:
-        """
-        Handle common JSON layouts:
-        - flat dict of OIDs (your modem does this)
-        - array/list of event dicts
-        - nested under keys like 'events', 'docsisLog', etc.
-        """
-        # 1) Flat OID map?
-        if isinstance(data, dict):
-            evs = self._extract_events_from_oid_dict(data)
-            if evs:
-                return evs
-
-        # 2) Direct list of dicts
-        if isinstance(data, list):
-            return [self._norm_ev(x) for x in data if isinstance(x, dict)]
-
-        # 3) Nested objects
-        if isinstance(data, dict):
-            for key in ("events", "EventLog", "docsis_events", "docsisLog", "log"):
-                val = data.get(key)
-                if isinstance(val, list):
-                    return [self._norm_ev(x) for x in val if isinstance(x, dict)]
-            for parent in ("data", "status", "result"):
-                sub = data.get(parent)
-                if isinstance(sub, (dict, list)):
-                    evs = self._extract_events_from_json(sub)
-                    if evs:
-                        return evs
-        return []
-
-    def _extract_events_from_oid_dict(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """
-        Build event rows from a flat OID map, e.g.:
-          1.3.6.1.2.1.69.1.5.8.1.2.<i> -> time
-          1.3.6.1.2.1.69.1.5.8.1.7.<i> -> message
-          1.3.6.1.2.1.69.1.5.8.1.5.<i> -> priority (optional)
-        """
-        idxs: set[int] = set()
-        for k in data.keys():
-            if k.startswith(OID_TIME) or k.startswith(OID_MSG) or k.startswith(OID_PRI):
-                try:
-                    idxs.add(int(k.split(".")[-1]))
-                except Exception:
-                    pass
-
-        events: List[Dict[str, Any]] = []
-        for i in sorted(idxs):
-            t = str(data.get(f"{OID_TIME}{i}", "")).strip()
-            m = str(data.get(f"{OID_MSG}{i}", "")).strip()
-            p = str(data.get(f"{OID_PRI}{i}", "")).strip()
-            if not (t or m):
-                continue
-            events.append({"time": t, "message": m, "priority": p})
-        return events
 
-    def _extract_events_from_html(self, html: str) -> List[Dict[str, Any]]:
+    async def fetch_snapshot(self) -> EventTable:
         """
-        Heuristic HTML parser:
-        - Look for <tr> with 2–5 <td> cells.
-        - Assume first cell = time, last cell = message, middle = priority where present.
+        Fetch modem status and return an EventTable of the last ~20 events.
+        If the page is unchanged since the previous call, the previous table is returned as-is.
+        Raises VirginApiError straight away (no I/O) while the host's breaker is open.
         """
-        if not html:
-            return []
+        breaker = self.breaker
+        started = time.monotonic()
+        if not breaker.allow(started):
+            raise VirginApiError(
+                f"{self.host} is marked down; next probe in {breaker.retry_in(started):.0f} s"
+            )
+        probing = breaker.state == HALF_OPEN
+        if probing and self._snmp is None and not await self._probe():
+            breaker.record_failure(time.monotonic())
+            raise VirginApiError(f"{self.host} is still unreachable (probe failed)", transient=True)
+
+        # The SNMP client already retries each datagram; a probing fetch gets one shot
+        attempts = 1 if probing or self._snmp is not None else _MAX_ATTEMPTS
+        deadline = started + self._deadline
+        timeout = self._timeout
+        self.budget.on_request()
+        attempt = 1
+        while True:
+            try:
+                table = await (
+                    self._fetch_snmp_snapshot() if self._snmp is not None
+                    else self._fetch_http_snapshot(timeout)
+                )
+            except VirginApiError as exc:
+                if not exc.transient:
+                    breaker.record_success()   # the modem answered
+                    raise
+                delay = backoff_delay(attempt)
+                remaining = deadline - time.monotonic() - delay
+                if attempt >= attempts or remaining < 1 or not self.budget.try_spend():
+                    breaker.record_failure(time.monotonic())
+                    raise
+                _LOGGER.debug(
+                    "VirginApi: %s attempt %d failed (%s), retrying in %.2f s",
+                    self.host, attempt, exc, delay
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+                timeout = self._attempt_timeout(remaining)
+                continue
+            breaker.record_success()
+            return table
 
-        # Normalise whitespace to make regex saner
-        text = re.sub(r"\s+", " ", html)
+    async def _probe(self) -> bool:
+        """Cheap liveness check before a down host gets a full fetch: any HTTP answer will do."""
+        try:
+            async with self._session.head(
+                f"{self._base}/", timeout=ClientTimeout(total=_PROBE_TIMEOUT), allow_redirects=False
+            ):
+                return True
+        except (ClientError, asyncio.TimeoutError) as exc:
+            _LOGGER.debug("VirginApi: probe of %s failed: %s", self.host, exc)
+            return False
+
+    async def _fetch_http_snapshot(self, timeout: ClientTimeout) -> EventTable:
+        """One HTTP attempt of fetch_snapshot(), bounded by `timeout`."""
+        url = f"{self._base}{ROUTER_STATUS_PATH}"
+        headers: Dict[str, str] = {}
+        if self._snapshot is not None:
+            if self._etag:
+                headers[IF_NONE_MATCH] = self._etag
+            if self._last_modified:
+                headers[IF_MODIFIED_SINCE] = self._last_modified
+        stats = self.stats
+        try:
+            sent = time.perf_counter()
+            async with self._session.get(
+                url, timeout=timeout, headers=headers, trace_request_ctx=stats
+            ) as resp:
+                stats.record("ttfb", time.perf_counter() - sent)
+                if resp.status == 304 and self._snapshot is not None:
+                    _LOGGER.debug("VirginApi: %s not modified (304)", url)
+                    stats.record_path("not_modified")
+                    return self._snapshot
+                resp.raise_for_status()
+                hasher = hashlib.blake2b(digest_size=16)
+                events, head = await self._read_events(resp, url, hasher)
+                etag = resp.headers.get(ETAG)
+                last_modified = resp.headers.get(LAST_MODIFIED)
+        except asyncio.TimeoutError as exc:
+            raise VirginApiTimeout(f"Router status fetch timed out ({url})") from exc
+        except ClientResponseError as exc:
+            raise VirginApiError(
+                f"Router status fetch failed: {exc}", transient=exc.status >= 500 or exc.status == 429
+            ) from exc
+        except ClientError as exc:
+            raise VirginApiError(f"Router status fetch failed: {exc}", transient=True) from exc
+        except Exception as exc:
+            raise VirginApiError(f"Router status fetch failed: {exc}") from exc
 
-        # Bail-out if it looks like a login page
-        if re.search(r"(login|sign in)", text, re.I) and "password" in text.lower():
-            _LOGGER.warning("VirginApi: page looks like a login form; cannot parse logs.")
-            return []
+        self._etag, self._last_modified = etag, last_modified
+        digest = hasher.digest()
+        if digest == self._digest and self._snapshot is not None:
+            _LOGGER.debug("VirginApi: %s body unchanged, reusing previous snapshot", url)
+            return self._snapshot
+        self._digest = digest
 
-        rows = re.findall(r"<tr[^>]*>(.*?)</tr>", text, flags=re.I)
-        events: List[Dict[str, Any]] = []
+        if not events:
+            _LOGGER.warning("VirginApi: no events parsed from %s (first bytes: %r)", url, head)
+        return self._table_for(events)
 
-        # Time detector (several common formats)
-        time_pat = re.compile(
-            r"(?:(\d{4}-\d{2}-\d{2})|(\d{1,2}/\d{1,2}/\d{2,4}))\s+(\d{1,2}:\d{2}:\d{2})"
+    def _table_for(self, events: Optional[List[Dict[str, Any]]]) -> EventTable:
+        """
+        Snapshot for freshly parsed events. The body may have changed only in other
+        sections (channel counters tick every poll), so identical events keep the
+        previous table object and the coordinator's unchanged path still applies.
+        """
+        events = events or []
+        if events == self._events and self._snapshot is not None:
+            return self._snapshot
+        self._events = events
+        self._snapshot = EventTable.from_events(events) if events else EventTable([])
+        return self._snapshot
+
+    async def _fetch_snmp_snapshot(self) -> EventTable:
+        """SNMP flavour of fetch_snapshot(): one GETBULK walk of the event and channel columns."""
+        from .snmp import SnmpError, SnmpTimeout, event_rows
+
+        walk_started = time.perf_counter()
+        try:
+            columns = await self._snmp.walk_columns(
+                self._snmp_columns + tuple(self._snmp_channel_columns)
+            )
+        except SnmpTimeout as exc:
+            raise VirginApiTimeout(f"SNMP event table walk failed: {exc}") from exc
+        except SnmpError as exc:
+            raise VirginApiError(f"SNMP event table walk failed: {exc}") from exc
+
+        started = time.perf_counter()
+        self.stats.record("download", started - walk_started)
+        events = event_rows(columns, *self._snmp_columns)
+        sample: ChannelSample = {
+            name: {suffix[0]: value for suffix, value in columns[col].items() if len(suffix) == 1}
+            for col, name in self._snmp_channel_columns.items()
+            if columns.get(col)
+        }
+        self.channels = sample or None
+        self.stats.record_parse(
+            "snmp", "inline", time.perf_counter() - started, self._snmp.bytes_received, len(events)
+        )
+        _LOGGER.debug(
+            "VirginApi: walked %d SNMP events from %s:%d in %d round trip(s) (%d bytes)",
+            len(events), self.host, self._snmp.port, self._snmp.round_trips, self._snmp.bytes_received
         )
 
-        def strip_tags(s: str) -> str:
-            return re.sub(r"<[^>]+>", "", s).strip()
-
-        for row in rows:
-            cells = re.findall(r"<t[dh][^>]*>(.*?)</t[dh]>", row, flags=re.I)
-            if len(cells) < 2:
-                continue
-
-            raw_first = strip_tags(cells[0])
-            raw_last  = strip_tags(cells[-1])
-            raw_mid   = strip_tags(cells[1]) if len(cells) >= 3 else ""
-
-            # Some firmwares put time in 2nd cell
-            if not time_pat.search(raw_first) and time_pat.search(raw_mid):
-                raw_first, raw_mid = raw_mid, raw_first
+        return self._table_for(events)
 
-            # Must have a time-ish first cell
-            if not time_pat.search(raw_first):
+    async def _read_events(
+        self, resp: ClientResponse, url: str, hasher: Any
+    ) -> Tuple[Optional[List[Dict[str, Any]]], str]:
+        """
+        Stream the body in chunks, feeding `hasher` with the raw bytes as they arrive.
+        The first non-blank character decides the path: JSON bodies are accumulated
+        as raw bytes and only parsed if their digest differs from the last poll (None
+        is returned otherwise); anything else is fed to the incremental HTML parser as it arrives,
+        so large pages are never held whole.
+
+        Small bodies are parsed inline. Once a body is known (Content-Length) or seen
+        to exceed `parse_threshold` bytes, parsing moves to the executor in batches so
+        big firmware pages can't stall the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        body_started = time.perf_counter()
+        try:
+            codec = codecs.lookup(resp.charset or "utf-8")
+        except LookupError:
+            codec = codecs.lookup("utf-8")
+        decoder = codec.incrementaldecoder(errors="replace")
+
+        head = ""
+        json_parts: Optional[List[bytes]] = None
+        stream: Optional[HtmlEventStream] = None
+        offload = (resp.content_length or 0) > self.parse_threshold
+        received = 0
+        pending: List[str] = []
+        pending_len = 0
+        inline_s = executor_s = 0.0
+
+        async for chunk in resp.content.iter_chunked(_CHUNK_SIZE):
+            hasher.update(chunk)
+            received += len(chunk)
+            if json_parts is not None:
+                json_parts.append(chunk)
                 continue
-
-            ev = {
-                "time": raw_first,
-                "priority": raw_mid.lower(),
-                "message": raw_last,
-            }
-
-            # Ignore headers / empties
-            if not ev["message"] or ev["message"].lower() in ("message", "event", "description"):
+            text = decoder.decode(chunk)
+            if stream is None:
+                head = (head + text)[:120] if len(head) < 120 else head
+                lead = text.lstrip()
+                if not lead:
+                    continue
+                if lead[0] in "{[":
+                    json_parts = [chunk]
+                    continue
+                else:
+                    from .html_parser import DEFAULT_LAYOUT, ROW_LAYOUTS, HtmlEventStream
+
+                    profile = self.profile
+                    if profile is None or not profile.markup:
+                        profile = detect_profile(text, markup=True) or GENERIC_HTML
+                    stream = HtmlEventStream(layout=ROW_LAYOUTS.get(profile.layout, DEFAULT_LAYOUT))
+            if not offload and received > self.parse_threshold:
+                offload = True
+            if not offload:
+                started = time.perf_counter()
+                stream.feed(text)
+                inline_s += time.perf_counter() - started
                 continue
+            pending.append(text)
+            pending_len += len(text)
+            if pending_len >= _EXECUTOR_BATCH:
+                started = time.perf_counter()
+                await loop.run_in_executor(None, stream.feed, "".join(pending))
+                executor_s += time.perf_counter() - started
+                pending, pending_len = [], 0
+        pending.append(decoder.decode(b"", final=True))
+
+        stats = self.stats
+        if json_parts is not None:
+            started = time.perf_counter()
+            stats.record("download", started - body_started)
+            if hasher.digest() == self._digest and self._snapshot is not None:
+                stats.record_path("unchanged")
+                return None, head
+            # JSON is UTF-8 on the wire: parse the bytes as received, unless the
+            # firmware declared some other charset
+            raw: Union[bytes, str] = b"".join(json_parts)
+            if codec.name not in ("utf-8", "ascii"):
+                raw = raw.decode(codec.name, errors="replace")
+            if len(raw) > self.parse_threshold:
+                mode = "executor"
+                events, channels, profile = await loop.run_in_executor(
+                    None, self._parse_json_body, raw, url, self.profile
+                )
+            else:
+                mode = "inline"
+                events, channels, profile = self._parse_json_body(raw, url, self.profile)
+            stats.record_parse(profile.path, mode, time.perf_counter() - started, received, len(events))
+            self.channels = channels
+            self._use_profile(profile if events or not profile.markup else None)
+            return events, head
+
+        if stream is None:
+            stats.record("download", time.perf_counter() - body_started)
+            return [], head
+        started = time.perf_counter()
+        if offload:
+            await loop.run_in_executor(None, stream.feed, "".join(pending))
+            executor_s += time.perf_counter() - started
+        else:
+            stream.feed(pending[-1])
+            inline_s += time.perf_counter() - started
+        events = stream.close()
+        # No rows (login page, new firmware…): detect again next time
+        self._use_profile(profile if events else None)
+        # HTML is parsed while it streams in: the transfer is what's left of the wall time
+        parse_s = inline_s + executor_s
+        stats.record("download", max(0.0, time.perf_counter() - body_started - parse_s))
+        stats.record_parse(
+            "html", "executor" if offload else "inline", parse_s, received, len(events)
+        )
+        _LOGGER.debug(
+            "VirginApi: parsed %d HTML events from %s (%d rows scanned, %d bytes, "
+            "%.1f ms inline + %.1f ms in executor, first bytes: %r)",
+            len(events), url, stream.rows_seen, received, inline_s * 1000, executor_s * 1000, head
+        )
+        return events, head
 
-            events.append(ev)
-
-        return events
+    def _use_profile(self, profile: Optional[FirmwareProfile]) -> None:
+        if profile is not self.profile:
+            _LOGGER.debug(
+                "VirginApi: %s firmware profile %s -> %s", self.host,
+                self.profile.name if self.profile else None, profile.name if profile else None
+            )
+            self.profile = profile
 
     @staticmethod
-    def _norm_ev(x: Dict[str, Any]) -> Dict[str, Any]:
-        return {
-            "time": x.get("time") or x.get("timestamp") or x.get("date") or x.get("datetime") or "",
-            "message": x.get("message") or x.get("text") or x.get("event") or "",
-            "priority": x.get("priority") or x.get("pri") or x.get("severity") or "",
-        }
+    def _parse_json_body(
+        raw: Union[bytes, str], url: str, profile: Optional[FirmwareProfile]
+    ) -> Tuple[List[Dict[str, Any]], Optional[ChannelSample], FirmwareProfile]:
+        """
+        Turn a buffered JSON body into event rows and, for flat OID maps, the
+        channel-table sample (safe to run in the executor). Bytes go straight to
+        loads() – no str copy of the body is made on the JSON path. `profile` is the
+        one detected on an earlier poll; it is tried alone, and the registry is only
+        consulted again when the payload no longer fits it. Also returns the profile
+        that produced the rows.
+        """
+        data: Any = _NOT_JSON
+        if isinstance(raw, bytes):
+            try:
+                data = loads(raw)
+            except Exception:
+                # Invalid UTF-8 or not JSON at all: try again on leniently decoded text
+                raw = raw.decode("utf-8", errors="replace")
+        if data is _NOT_JSON:
+            try:
+                data = json.loads(raw)
+            except Exception as exc:
+                _LOGGER.debug("VirginApi: JSON parse failed (%s), will try HTML.", exc)
+        if data is not _NOT_JSON:
+            if profile is not None and not profile.markup:
+                parsed = profile.parse(data)
+                if parsed is not None:
+                    return parsed[0], parsed[1], profile
+                _LOGGER.debug("VirginApi: %s no longer fits profile %s, detecting again", url, profile.name)
+            for candidate in PROFILES.values():
+                if candidate.markup or candidate is profile or not candidate.detect(data):
+                    continue
+                parsed = candidate.parse(data)
+                if parsed is not None:
+                    _LOGGER.debug(
+                        "VirginApi: parsed %d events from %s with profile %s",
+                        len(parsed[0]), url, candidate.name
+                    )
+                    return parsed[0], parsed[1], candidate
+        # HTML fallback (only warn about login on the HTML path)
+        from .html_parser import parse_events_html
+
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8", errors="replace")
+        return parse_events_html(raw), None, GENERIC_HTML
@@ -0,0 +1,99 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/attributes.py
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .const import ATTR_MODE_COMPACT, ATTR_MODE_FULL, ATTR_MODE_MINIMAL
+from .events import EventTable
+
+# Bulky per-row attributes: kept on the live state, excluded from the recorder.
+BULKY_ATTRIBUTES = frozenset({"messages", "times", "events"})
+
+
+class EventAttributeCache:
+    """
+    One shared `extra_state_attributes` payload per event table.
+
+    The last-event sensors all read the same dict, built once per (table
+    identity, mode) and reused until the API hands out a new table – snapshots
+    that only refresh channel or rate figures keep the same payload, so the
+    recorder sees no attribute change. The cache also meters how many attribute
+    bytes each new payload carries, split into what the recorder stores and
+    what it skips (BULKY_ATTRIBUTES).
+
+    Modes:
+      full    – OID-keyed `messages`/`times` maps (original layout)
+      compact – one `events` list of (time, priority, message) tuples
+      minimal – status/priority/index only
+    """
+
+    def __init__(self, mode: str = ATTR_MODE_FULL, writers: int = 2) -> None:
+        self.mode = mode
+        self.writers = writers            # entities that write this payload per update
+        self._key: Optional[Tuple[Any, ...]] = None
+        self._payload: Dict[str, Any] = {}
+        # Meter
+        self._started = time.monotonic()
+        self.writes = 0
+        self.total_bytes = 0
+        self.recorded_bytes = 0
+
+    def get(self, data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        data = data or {}
+        table = data.get("table")
+        # Status only varies on its own while there is no table (empty / scanning)
+        key = (table, self.mode, data.get("status"))  # EventTable compares by identity
+        if key != self._key:
+            self._key = key
+            self._payload = self._build(data)
+            self._meter(self._payload)
+        return self._payload
+
+    def _build(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "status": data.get("status"),
+            "priority": data.get("last_event_priority"),
+            "index": data.get("last_event_index"),
+        }
+        table = data.get("table")
+        if not isinstance(table, EventTable) or self.mode == ATTR_MODE_MINIMAL:
+            return payload
+        if self.mode == ATTR_MODE_COMPACT:
+            payload["events"] = [(r.time, r.priority, r.message) for r in table.rows if r.time or r.message]
+        else:
+            payload["messages"] = table.messages
+            payload["times"] = table.times
+        return payload
+
+    def _meter(self, payload: Dict[str, Any]) -> None:
+        if not self.writers:
+            return
+        # Each value is serialised once: the recorded part as a dict, then every bulky
+        # attribute on its own, plus the `, "key": ` framing it adds to the whole dict
+        recorded = len(json.dumps(
+            {k: v for k, v in payload.items() if k not in BULKY_ATTRIBUTES}, default=str
+        ))
+        total = recorded + sum(
+            len(json.dumps(v, default=str)) + len(k) + 6
+            for k, v in payload.items()
+            if k in BULKY_ATTRIBUTES
+        )
+        self.writes += self.writers
+        self.total_bytes += total * self.writers
+        self.recorded_bytes += recorded * self.writers
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Attribute write volume so far, extrapolated to a day."""
+        # Extrapolate over at least an hour so the first few writes don't explode the estimate
+        per_day = 86400.0 / max(time.monotonic() - self._started, 3600.0)
+        return {
+            "mode": self.mode,
+            "writes": self.writes,
+            "total_bytes": self.total_bytes,
+            "recorded_bytes": self.recorded_bytes,
+            "total_bytes_per_day": int(self.total_bytes * per_day),
+            "recorded_bytes_per_day": int(self.recorded_bytes * per_day),
+        }
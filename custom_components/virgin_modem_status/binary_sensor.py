@@ -11,7 +11,40 @@ from .entity import VirginEntity
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback):
     coord: VirginCoordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([VirginReachableBinary(coord, entry)], True)
+    async_add_entities([
+        VirginDocsisHealthyBinary(coord, entry),
+        VirginReachableBinary(coord, entry),
+        VirginLineAnomalyBinary(coord, entry),
+    ])
+
+
+class VirginDocsisHealthyBinary(VirginEntity, BinarySensorEntity):
+    """
+    On while the modem's DOCSIS line is healthy. The verdict (with hysteresis) is
+    computed once per update by the coordinator; this entity only hands it out.
+    """
+    _attr_name = "DOCSIS Healthy"
+    _attr_icon = "mdi:heart-pulse"
+
+    def __init__(self, coordinator: VirginCoordinator, entry: ConfigEntry) -> None:
+        super().__init__(coordinator, entry)
+        self._attr_unique_id = f"{entry.entry_id}_docsis_healthy"
+
+    @property
+    def is_on(self) -> bool | None:
+        # Unknown until the first poll, unless the previous run's verdict was restored
+        health = self.coordinator.health
+        return health.healthy if health is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        health = self.coordinator.health
+        return health.attributes if health is not None else {}
+
+    @property
+    def available(self) -> bool:
+        # An unreachable modem is a health verdict ("modem unreachable"), not unavailability
+        return True
 
 class VirginReachableBinary(VirginEntity, BinarySensorEntity):
     _attr_name = "Modem Reachable"
@@ -22,11 +55,39 @@ class VirginReachableBinary(VirginEntity, BinarySensorEntity):
         self._attr_unique_id = f"{entry.entry_id}_reachable"
 
     @property
-    def is_on(self) -> bool:
-        # If last update succeeded, modem was reachable.
+    def is_on(self) -> bool | None:
+        # If last update succeeded, modem was reachable. A restored snapshot also counts
+        # as a successful update, so nothing is claimed before the first poll.
+        if not self.coordinator.contacted:
+            return None
         return bool(self.coordinator.last_update_success)
 
     @property
     def available(self) -> bool:
         # Entity itself is always present; connectivity is expressed via is_on
         return True
+
+
+class VirginLineAnomalyBinary(VirginEntity, BinarySensorEntity):
+    """On while a line-quality metric spikes or drifts (see analytics.LineAnalytics)."""
+    _attr_name = "Line Quality Anomaly"
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    _attr_icon = "mdi:chart-bell-curve"
+    _unrecorded_attributes = frozenset({"metrics"})
+
+    def __init__(self, coordinator: VirginCoordinator, entry: ConfigEntry) -> None:
+        super().__init__(coordinator, entry)
+        self._attr_unique_id = f"{entry.entry_id}_line_anomaly"
+
+    @property
+    def is_on(self) -> bool | None:
+        verdict = (self.coordinator.data or {}).get("analytics")
+        return verdict["anomaly"] if verdict else None
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        verdict = (self.coordinator.data or {}).get("analytics") or {}
+        return {
+            "reasons": list(verdict.get("reasons", ())),
+            "metrics": self.coordinator.analytics.metrics_dict(),
+        }
@@ -0,0 +1,214 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/channels.py
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from .const import (
+    OID_DS_CHANNEL_ID,
+    OID_DS_CORRECTED,
+    OID_DS_POWER,
+    OID_DS_SNR,
+    OID_DS_UNCORRECTED,
+    OID_US_CHANNEL_ID,
+    OID_US_POWER,
+)
+
+DOWNSTREAM = "downstream"
+UPSTREAM = "upstream"
+
+# Column name → (direction, OID column prefix without the trailing dot)
+CHANNEL_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "ds_id": (DOWNSTREAM, OID_DS_CHANNEL_ID.rstrip(".")),
+    "ds_power": (DOWNSTREAM, OID_DS_POWER.rstrip(".")),
+    "ds_snr": (DOWNSTREAM, OID_DS_SNR.rstrip(".")),
+    "ds_corrected": (DOWNSTREAM, OID_DS_CORRECTED.rstrip(".")),
+    "ds_uncorrected": (DOWNSTREAM, OID_DS_UNCORRECTED.rstrip(".")),
+    "us_id": (UPSTREAM, OID_US_CHANNEL_ID.rstrip(".")),
+    "us_power": (UPSTREAM, OID_US_POWER.rstrip(".")),
+}
+
+# Gauges (TenthdBmV / TenthdB in the MIB → scaled by 0.1) and cumulative Counter32s
+_GAUGES = {"ds_power": "power", "ds_snr": "snr", "us_power": "power"}
+_COUNTERS = {"ds_corrected": "corrected", "ds_uncorrected": "uncorrected"}
+_COUNTER_WRAP = 1 << 32
+
+# {column name: {ifIndex: raw value}}
+ChannelSample = Dict[str, Dict[int, Any]]
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip().split()[0])
+    except (ValueError, IndexError):
+        return None
+
+
+class ChannelBank:
+    """
+    One direction's channels in parallel typed arrays, one slot per ifIndex.
+
+    Slots are append-only, so a channel keeps its slot (and its entities keep
+    reading the same position) for the lifetime of the coordinator. Gauges are
+    array('f'); raw counters array('Q') so deltas stay exact; per-poll deltas
+    are array('f'). A channel missing from a poll reads NaN for its gauges; a
+    counter only reads (and yields deltas) once the modem has reported it.
+    """
+
+    __slots__ = (
+        "direction", "slots", "ifindex", "channel_id", "gauges", "counters", "deltas", "_primed"
+    )
+
+    def __init__(
+        self, direction: str, gauges: Tuple[str, ...], counters: Tuple[str, ...] = ()
+    ) -> None:
+        self.direction = direction
+        self.slots: Dict[int, int] = {}           # ifIndex → slot
+        self.ifindex = array("l")
+        self.channel_id = array("l")
+        self.gauges: Dict[str, array] = {g: array("f") for g in gauges}
+        self.counters: Dict[str, array] = {c: array("Q") for c in counters}
+        self.deltas: Dict[str, array] = {c: array("f") for c in counters}
+        # Per counter and slot: a raw value has been seen (so the next one yields a delta)
+        self._primed: Dict[str, bytearray] = {c: bytearray() for c in counters}
+
+    def __len__(self) -> int:
+        return len(self.ifindex)
+
+    def slot(self, ifindex: int) -> Tuple[int, bool]:
+        """Slot for an ifIndex, created on first sight; returns (slot, created)."""
+        s = self.slots.get(ifindex)
+        if s is not None:
+            return s, False
+        s = self.slots[ifindex] = len(self.ifindex)
+        self.ifindex.append(ifindex)
+        self.channel_id.append(0)
+        for arr in self.gauges.values():
+            arr.append(math.nan)
+        for arr in self.counters.values():
+            arr.append(0)
+        for arr in self.deltas.values():
+            arr.append(0.0)
+        for primed in self._primed.values():
+            primed.append(0)
+        return s, True
+
+    def value(self, slot: int, metric: str) -> Optional[float]:
+        """Current value of a gauge, raw counter or `<counter>_delta`."""
+        if metric in self.gauges:
+            v = self.gauges[metric][slot]
+            return None if math.isnan(v) else round(v, 1)
+        if metric in self.counters:
+            return self.counters[metric][slot] if self._primed[metric][slot] else None
+        if metric.endswith("_delta"):
+            arr = self.deltas.get(metric[:-6])
+            return arr[slot] if arr is not None else None
+        return None
+
+    def set_counter(self, slot: int, metric: str, raw: int) -> None:
+        counters = self.counters[metric]
+        primed = self._primed[metric]
+        if primed[slot]:
+            prev = counters[slot]
+            if raw >= prev:
+                delta = raw - prev
+            elif prev > _COUNTER_WRAP // 2:
+                delta = raw + _COUNTER_WRAP - prev   # Counter32 wrapped
+            else:
+                delta = raw                          # modem reset its counters
+            self.deltas[metric][slot] = delta
+        counters[slot] = raw
+        primed[slot] = 1
+
+    def begin_poll(self) -> None:
+        """Forget last poll's gauges and deltas before a new sample is folded in."""
+        for arr in self.gauges.values():
+            for i in range(len(arr)):
+                arr[i] = math.nan
+        for arr in self.deltas.values():
+            for i in range(len(arr)):
+                arr[i] = 0.0
+
+    def state(self) -> bytes:
+        """Everything value() can read, as bytes: equal between polls iff nothing changed."""
+        parts = [self.ifindex.tobytes(), self.channel_id.tobytes()]
+        for group in (self.gauges, self.counters, self.deltas, self._primed):
+            parts.extend(bytes(arr) for arr in group.values())
+        return b"".join(parts)
+
+    def present(self, metric: str) -> Tuple[float, ...]:
+        """This poll's values of a gauge, skipping channels missing from the sample."""
+        return tuple(v for v in self.gauges[metric] if not math.isnan(v))
+
+    def total_delta(self, metric: str) -> float:
+        arr = self.deltas.get(metric)
+        return float(sum(arr)) if arr is not None else 0.0
+
+
+class ChannelMetrics:
+    """
+    Per-channel downstream/upstream metrics for one modem.
+
+    `update()` folds a ChannelSample in with one pass over its values – no
+    per-poll object churn beyond the sample itself – so 32+ channel DOCSIS 3.1
+    hubs stay cheap to update every poll.
+    """
+
+    def __init__(self) -> None:
+        self.downstream = ChannelBank(DOWNSTREAM, ("power", "snr"), ("corrected", "uncorrected"))
+        self.upstream = ChannelBank(UPSTREAM, ("power",))
+        self.revision = 0
+        self._summary: Optional[Dict[str, Any]] = None
+
+    def bank(self, direction: str) -> ChannelBank:
+        return self.downstream if direction == DOWNSTREAM else self.upstream
+
+    def update(self, sample: ChannelSample) -> List[Tuple[str, int]]:
+        """Apply one poll's sample; returns (direction, slot) of channels seen for the first time."""
+        created: List[Tuple[str, int]] = []
+        before = [bank.state() for bank in (self.downstream, self.upstream)]
+        for bank in (self.downstream, self.upstream):
+            bank.begin_poll()
+
+        for name, values in sample.items():
+            direction, _ = CHANNEL_COLUMNS[name]
+            bank = self.bank(direction)
+            gauge = _GAUGES.get(name)
+            counter = _COUNTERS.get(name)
+            for ifindex, raw in values.items():
+                s, new = bank.slot(ifindex)
+                if new:
+                    created.append((direction, s))
+                number = _number(raw)
+                if number is None:
+                    continue
+                if gauge is not None:
+                    bank.gauges[gauge][s] = number / 10.0
+                elif counter is not None:
+                    bank.set_counter(s, counter, int(number) % _COUNTER_WRAP)
+                else:
+                    bank.channel_id[s] = int(number)
+
+        # NaN gauges compare equal as bytes, so a channel that stays missing is no change
+        if [bank.state() for bank in (self.downstream, self.upstream)] != before:
+            self.revision += 1
+            self._summary = None
+        return created
+
+    def summary(self) -> Dict[str, Any]:
+        """Small dict for the coordinator payload; the same object until a value changes."""
+        if self._summary is not None:
+            return self._summary
+        ds = self.downstream
+        self._summary = {
+            "revision": self.revision,
+            "downstream": len(ds),
+            "upstream": len(self.upstream),
+            "corrected_delta": ds.total_delta("corrected"),
+            "uncorrected_delta": ds.total_delta("uncorrected"),
+        }
+        return self._summary
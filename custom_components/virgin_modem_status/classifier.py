@@ -0,0 +1,150 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/classifier.py
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import re
+
+from .const import DEFAULT_PRIORITY, PRIORITY_RULES, SEVERITIES, TROUBLE_KEYWORDS
+
+Rule = Tuple[str, str]  # (keyword, severity)
+
+# Firmware priority column → severity (used when no keyword rule matches)
+_TEXT_PRIORITIES: Dict[str, str] = {
+    "emergency": "critical",
+    "alert": "critical",
+    "critical": "critical",
+    "crit": "critical",
+    "error": "critical",
+    "warning": "warning",
+    "warn": "warning",
+}
+
+
+class SeverityClassifier:
+    """
+    Precompiled multi-keyword matcher for DOCSIS event text.
+
+    All keywords are folded into ONE pattern shaped as a prefix trie, matched
+    against the lower-cased message: the regex engine skips ahead to offsets
+    that start some keyword and then follows a single branch per character, so
+    the cost per message depends on its length, not on how many rules exist (a
+    flat alternation tries every keyword at every offset). Each hit restarts the
+    search one character later, so overlapping keywords are all seen. Rule
+    order still decides precedence: the lowest-ranked match wins, as with
+    PRIORITY_RULES.
+
+    The trie only reports the longest keyword at each offset, and every other
+    keyword starting there is one of its prefixes; so each keyword is mapped up
+    front to the best-ranked keyword among its own prefixes (itself included).
+    A short user rule like "t3" therefore still beats a built-in "t3 time-out"
+    at the same spot.
+    """
+
+    __slots__ = ("rules", "_pattern", "_rank")
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        rank: Dict[str, Tuple[int, str]] = {}
+        for keyword, severity in rules:
+            keyword = keyword.strip().lower()
+            if keyword and keyword not in rank:     # first rule for a keyword wins
+                rank[keyword] = (len(rank), severity)
+        self.rules: Tuple[Rule, ...] = tuple((k, s) for k, (_, s) in rank.items())
+        # keyword matched → (rank, severity, keyword) of the best rule starting at the same offset
+        self._rank: Dict[str, Tuple[int, str, str]] = {}
+        for keyword in rank:
+            self._rank[keyword] = min(
+                rank[prefix] + (prefix,)
+                for prefix in (keyword[:n] for n in range(1, len(keyword) + 1))
+                if prefix in rank
+            )
+        self._pattern = re.compile(_trie_pattern(rank)) if rank else None
+
+    def classify(self, message: str, priority: str = "") -> Tuple[str, Optional[str]]:
+        """Return (severity, matched keyword or None) in one pass over the message."""
+        if self._pattern is not None and message:
+            text = message.lower()
+            search = self._pattern.search
+            best: Optional[Tuple[int, str, str]] = None
+            match = search(text)
+            while match is not None:
+                hit = self._rank[match.group()]
+                if best is None or hit[0] < best[0]:
+                    best = hit
+                    if hit[0] == 0:
+                        break
+                match = search(text, match.start() + 1)
+            if best is not None:
+                return best[1], best[2]
+        return self._from_priority(priority), None
+
+    @staticmethod
+    def _from_priority(priority: str) -> str:
+        pri_l = (priority or "").strip().lower()
+        if not pri_l:
+            return DEFAULT_PRIORITY
+        sev = _TEXT_PRIORITIES.get(pri_l)
+        if sev:
+            return sev
+        # Numeric priorities (higher means worse on some firmwares)
+        try:
+            if int(pri_l) >= 4:
+                return "warning"
+        except ValueError:
+            pass
+        return DEFAULT_PRIORITY
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Regex matching any of `keywords`, longest first at a given offset, with shared
+    prefixes factored out: "t3 time-out", "t3" and "t4" become `t(?:3(?: time-out)?|4)`
+    (escaped).
+    """
+    root: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = root
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}                       # a keyword ends here
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Greedy: the longer keyword is tried first, the shorter one is the fallback
+        return f"(?:{body})?" if "" in node else body
+
+    return build(root)
+
+
+def parse_rules(text: str) -> List[Rule]:
+    """
+    Parse user rules from options: one `keyword = severity` per line (or `;`-separated).
+    Raises ValueError on malformed lines or unknown severities.
+    """
+    rules: List[Rule] = []
+    for chunk in re.split(r"[\n;]", text or ""):
+        chunk = chunk.strip()
+        if not chunk or chunk.startswith("#"):
+            continue
+        keyword, sep, severity = chunk.rpartition("=")
+        keyword, severity = keyword.strip().lower(), severity.strip().lower()
+        if not sep or not keyword or severity not in SEVERITIES:
+            raise ValueError(f"Invalid rule: {chunk!r}")
+        rules.append((keyword, severity))
+    return rules
+
+
+@lru_cache(maxsize=8)
+def get_classifier(user_rules: Tuple[Rule, ...] = ()) -> SeverityClassifier:
+    """
+    Shared classifier for a rule set: user rules first, then PRIORITY_RULES, then any
+    TROUBLE_KEYWORDS not covered by a rule (as warnings). Compiled once per rule set.
+    """
+    rules: List[Rule] = list(user_rules) + list(PRIORITY_RULES)
+    rules += [(k, "warning") for k in TROUBLE_KEYWORDS]
+    return SeverityClassifier(rules)
+
@@ -1,22 +1,58 @@
 """Virgin Modem Status – Home Assistant custom integration."""
 from __future__ import annotations
-import asyncio
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import selector
 
-from .const import DOMAIN, DEFAULT_HOST
-from .api import VirginApi, VirginApiError
+from .const import (
+    DOMAIN,
+    DEFAULT_HOST,
+    DEFAULT_SCAN_INTERVAL,
+    CONF_SCAN_INTERVAL,
+    CONF_HISTORY_RETENTION_DAYS,
+    DEFAULT_HISTORY_RETENTION_DAYS,
+    CONF_CUSTOM_RULES,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    CONF_PARSE_THRESHOLD,
+    DEFAULT_PARSE_THRESHOLD,
+    CONF_ATTRIBUTE_MODE,
+    DEFAULT_ATTRIBUTE_MODE,
+    ATTRIBUTE_MODES,
+    CONF_BACKEND,
+    CONF_COMMUNITY,
+    CONF_PORT,
+    BACKEND_HTTP,
+    BACKENDS,
+    DEFAULT_COMMUNITY,
+    DEFAULT_PORT,
+)
+from .api import VirginApi, VirginApiError, VirginApiTimeout
+from .classifier import parse_rules
 
 STEP_USER = vol.Schema({
     vol.Required("host", default=DEFAULT_HOST): str,
+    vol.Required(CONF_BACKEND, default=BACKEND_HTTP): selector.SelectSelector(
+        selector.SelectSelectorConfig(options=BACKENDS, translation_key=CONF_BACKEND)
+    ),
+    vol.Optional(CONF_COMMUNITY, default=DEFAULT_COMMUNITY): str,
+    vol.Optional(CONF_PORT, default=DEFAULT_PORT): vol.All(vol.Coerce(int), vol.Range(min=1, max=65535)),
 })
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(self, user_input=None) -> FlowResult:
         if user_input is None:
             return self.async_show_form(step_id="user", data_schema=STEP_USER)
@@ -32,12 +68,18 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         await self.async_set_unique_id(f"{DOMAIN}:{host}")
         self._abort_if_unique_id_configured()
 
-        # Quick connectivity check with a short timeout (api has its own default, but keep this snappy)
-        api = VirginApi(host, async_get_clientsession(self.hass))
+        # Quick reachability probe (first KB of the status page / one SNMP round trip),
+        # bounded by the api's connect/read deadlines within 8 s overall
+        backend = user_input.get(CONF_BACKEND, BACKEND_HTTP)
+        community = user_input.get(CONF_COMMUNITY, DEFAULT_COMMUNITY)
+        port = user_input.get(CONF_PORT, DEFAULT_PORT)
+        api = VirginApi(
+            host, async_get_clientsession(self.hass), timeout=8,
+            backend=backend, community=community, port=port,
+        )
         try:
-            # If your VirginApi supports per-call timeout, pass it; otherwise rely on default.
-            await asyncio.wait_for(api.fetch_snapshot(), timeout=8)
-        except asyncio.TimeoutError:
+            await api.check_reachable()
+        except VirginApiTimeout:
             errors["base"] = "connection_timeout"
         except VirginApiError:
             errors["base"] = "cannot_connect"
@@ -47,8 +89,70 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if errors:
             return self.async_show_form(step_id="user", data_schema=STEP_USER, errors=errors)
 
-        return self.async_create_entry(title="Virgin Modem Status", data={"host": host})
+        data = {"host": host, CONF_BACKEND: backend}
+        if backend != BACKEND_HTTP:
+            data.update({CONF_COMMUNITY: community, CONF_PORT: port})
+        return self.async_create_entry(title="Virgin Modem Status", data=data)
 
     async def async_step_import(self, user_input: dict) -> FlowResult:
         # Optional YAML import → reuse same validation
         return await self.async_step_user(user_input)
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Per-modem options; saving them reloads the entry."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                parse_rules(user_input.get(CONF_CUSTOM_RULES, ""))
+            except ValueError:
+                errors[CONF_CUSTOM_RULES] = "invalid_rules"
+            if not (
+                user_input[CONF_MIN_INTERVAL]
+                <= user_input[CONF_SCAN_INTERVAL]
+                <= user_input[CONF_MAX_INTERVAL]
+            ):
+                errors["base"] = "invalid_interval_range"
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
+
+        opts = user_input or self._entry.options
+        schema = vol.Schema({
+            vol.Required(
+                CONF_SCAN_INTERVAL,
+                default=opts.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
+            vol.Required(
+                CONF_MIN_INTERVAL,
+                default=opts.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
+            vol.Required(
+                CONF_MAX_INTERVAL,
+                default=opts.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=10, max=86400)),
+            vol.Required(
+                CONF_HISTORY_RETENTION_DAYS,
+                default=opts.get(CONF_HISTORY_RETENTION_DAYS, DEFAULT_HISTORY_RETENTION_DAYS),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3650)),
+            vol.Required(
+                CONF_ATTRIBUTE_MODE,
+                default=opts.get(CONF_ATTRIBUTE_MODE, DEFAULT_ATTRIBUTE_MODE),
+            ): selector.SelectSelector(selector.SelectSelectorConfig(
+                options=ATTRIBUTE_MODES,
+                translation_key=CONF_ATTRIBUTE_MODE,
+            )),
+            vol.Required(
+                CONF_PARSE_THRESHOLD,
+                default=opts.get(CONF_PARSE_THRESHOLD, DEFAULT_PARSE_THRESHOLD),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_CUSTOM_RULES,
+                default=opts.get(CONF_CUSTOM_RULES, ""),
+            ): selector.TextSelector(selector.TextSelectorConfig(multiline=True)),
+        })
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
@@ -9,10 +9,53 @@ DEFAULT_COMMUNITY = "public"   # for SNMP v2c (only used if you use SNMP)
 DEFAULT_PORT = 161
 DEFAULT_SCAN_INTERVAL = 90  # seconds
 
+# --- Fetch backend (config entry data) ---
+CONF_BACKEND = "backend"
+CONF_COMMUNITY = "community"
+CONF_PORT = "port"
+BACKEND_HTTP = "http"   # scrape getRouterStatus (JSON or HTML)
+BACKEND_SNMP = "snmp"   # walk docsDevEventTable with SNMP v2c GETBULK
+BACKENDS = [BACKEND_HTTP, BACKEND_SNMP]
+DEFAULT_MIN_INTERVAL = 30   # adaptive polling floor (burst-poll during incidents)
+DEFAULT_MAX_INTERVAL = 600  # adaptive polling ceiling (back-off while the line is stable)
+
+# --- Hub mode (one scheduler polling every configured modem) ---
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"   # hass.data key for the shared VirginPollScheduler
+HUB_MAX_CONCURRENT = 8        # max modem requests in flight at once
+HUB_KEEPALIVE_TIMEOUT = 180   # seconds an idle modem connection is kept for reuse
+
+# --- Options ---
+CONF_SCAN_INTERVAL = "scan_interval"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+CONF_HISTORY_RETENTION_DAYS = "history_retention_days"
+DEFAULT_HISTORY_RETENTION_DAYS = 30  # days of events kept in the on-disk history store
+CONF_CUSTOM_RULES = "custom_rules"   # extra "keyword = severity" lines, checked before PRIORITY_RULES
+
+# --- Services ---
+SERVICE_QUERY_HISTORY = "query_history"
+
+# How the last-event sensors expose the event table as attributes
+CONF_ATTRIBUTE_MODE = "attribute_mode"
+ATTR_MODE_FULL = "full"         # OID-keyed messages/times maps
+ATTR_MODE_COMPACT = "compact"   # one list of (time, priority, message)
+ATTR_MODE_MINIMAL = "minimal"   # no per-row attributes at all
+ATTRIBUTE_MODES = [ATTR_MODE_FULL, ATTR_MODE_COMPACT, ATTR_MODE_MINIMAL]
+DEFAULT_ATTRIBUTE_MODE = ATTR_MODE_FULL
+
+# Status pages larger than this (bytes) are parsed in the executor instead of on the event loop
+CONF_PARSE_THRESHOLD = "parse_threshold"
+DEFAULT_PARSE_THRESHOLD = 64 * 1024
+
 # Optional HTTP endpoint (keep if you also parse the status page elsewhere)
 ROUTER_STATUS_PATH = "/getRouterStatus"
 
 # --- DOCSIS Event Table (standard MIB, 20 rows assumed) ---
+# OID column prefixes used by many DOCSIS firmwares
+OID_TIME = "1.3.6.1.2.1.69.1.5.8.1.2."   # docsDevEvTime
+OID_PRI  = "1.3.6.1.2.1.69.1.5.8.1.5."   # docsDevEvLevel / priority
+OID_MSG  = "1.3.6.1.2.1.69.1.5.8.1.7."   # docsDevEvText
+
 # Time and Message columns you already had:
 EVENT_TIME_OIDS = [f"1.3.6.1.2.1.69.1.5.8.1.2.{i}" for i in range(1, 21)]  # eventDateTime
 EVENT_MSG_OIDS  = [f"1.3.6.1.2.1.69.1.5.8.1.7.{i}" for i in range(1, 21)]  # eventText
@@ -49,8 +92,20 @@ PRIORITY_RULES = [
 ]
 
 DEFAULT_PRIORITY = "notice"  # fallback when nothing matches
+SEVERITIES = ("critical", "warning", "notice")  # worst first
+
+# --- DOCSIS channel tables (DOCS-IF-MIB / DOCS-IF3-MIB), indexed by ifIndex ---
+OID_DS_CHANNEL_ID   = "1.3.6.1.2.1.10.127.1.1.1.1.1."   # docsIfDownChannelId
+OID_DS_POWER        = "1.3.6.1.2.1.10.127.1.1.1.1.6."   # docsIfDownChannelPower (TenthdBmV)
+OID_DS_SNR          = "1.3.6.1.2.1.10.127.1.1.4.1.5."   # docsIfSigQSignalNoise (TenthdB)
+OID_DS_CORRECTED    = "1.3.6.1.2.1.10.127.1.1.4.1.3."   # docsIfSigQCorrecteds (Counter32)
+OID_DS_UNCORRECTED  = "1.3.6.1.2.1.10.127.1.1.4.1.4."   # docsIfSigQUncorrectables (Counter32)
+OID_US_CHANNEL_ID   = "1.3.6.1.2.1.10.127.1.1.2.1.1."   # docsIfUpChannelId
+OID_US_POWER        = "1.3.6.1.4.1.4491.2.1.20.1.2.1.1."  # docsIf3CmStatusUsTxPower (TenthdBmV)
 
-# Custom event names for Logbook entries (used by logbook.py and coordinator)
+# Custom bus event names, fired per new row (described for the Logbook by logbook.py)
 EVENT_GENERAL = f"{DOMAIN}_event"
 EVENT_ERROR   = f"{DOMAIN}_error"
+EVENT_BATCH   = f"{DOMAIN}_events"  # one coalesced event when a poll brings a burst of non-error rows
+EVENT_BATCH_THRESHOLD = 5           # more new non-error rows than this in one poll → single EVENT_BATCH
 
@@ -3,156 +3,404 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
-from typing import Any, Dict, Optional
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.components import logbook as ha_logbook
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
 from .api import VirginApi, VirginApiError
 from .const import (
     DOMAIN,
+    DEFAULT_PRIORITY,
+    SEVERITIES,
     DEFAULT_SCAN_INTERVAL,
-    EVENT_TIME_OIDS,
-    EVENT_MSG_OIDS,
-    TROUBLE_KEYWORDS,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_ATTRIBUTE_MODE,
+    EVENT_BATCH,
+    EVENT_BATCH_THRESHOLD,
     EVENT_ERROR,
     EVENT_GENERAL,
 )
+from .classifier import SeverityClassifier, get_classifier
+from .aggregates import SeverityAggregates
+from .analytics import LineAnalytics, line_sample
+from .attributes import EventAttributeCache
+from .channels import ChannelMetrics, ChannelSample
+from .delta import EventDelta
+from .events import EventRow, EventTable
+from .health import HealthState, HealthTracker
+from .history import EventHistoryStore
+from .persist import PersistedState
+from .polling import AdaptiveInterval
+from .snapshot import SnapshotCache
+from .timeparse import TimestampParser
 
 _LOGGER = logging.getLogger(__name__)
+_ERROR_SEVERITIES = frozenset({"critical", "warning"})
+_T3_KEYWORDS = frozenset({"t3 time-out", "t4 time-out"})
 
 
 class VirginCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
-    """Coordinates polling the modem and exposes a normalised snapshot."""
+    """
+    Coordinates polling the modem and exposes a normalised snapshot.
+    Refreshes are driven by the shared VirginPollScheduler (not HA's per-coordinator
+    timer), which reads `poll_interval` to place this modem's polls. That interval
+    adapts between `min_interval` and `max_interval` (see AdaptiveInterval).
+    """
 
-    def __init__(self, hass: HomeAssistant, api: VirginApi, scan_interval: int = DEFAULT_SCAN_INTERVAL) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: VirginApi,
+        scan_interval: int = DEFAULT_SCAN_INTERVAL,
+        classifier: Optional[SeverityClassifier] = None,
+        min_interval: int = DEFAULT_MIN_INTERVAL,
+        max_interval: int = DEFAULT_MAX_INTERVAL,
+        attribute_mode: str = DEFAULT_ATTRIBUTE_MODE,
+        store: Optional[Store] = None,
+    ) -> None:
         super().__init__(
             hass,
             _LOGGER,
-            name=f"{DOMAIN} coordinator",
-            update_interval=timedelta(seconds=int(scan_interval)),
+            name=f"{DOMAIN} coordinator ({api.host})",
+            update_interval=None,  # scheduled by VirginPollScheduler
+            # Only notify entities when the shaped snapshot actually changed
+            always_update=False,
         )
         self.api = api
-        self._last_logged_signature: Optional[str] = None  # to avoid spamming logbook
+        self.policy = AdaptiveInterval(int(scan_interval), min_interval, max_interval)
+        self.classifier = classifier or get_classifier()
+        self._last_table: Optional[EventTable] = None  # identity of the last API snapshot
+        self._last_channels: Optional[ChannelSample] = None  # identity of the last channel sample
+        # Per-channel power/SNR/codeword metrics (typed arrays; sensors are added as channels appear)
+        self.channels = ChannelMetrics()
+        # Rolling-window trend/anomaly detection over line-quality metrics (fixed memory)
+        self.analytics = LineAnalytics()
+        self._last_sample_at: Optional[float] = None
+        # Optional on-disk event log (attached by async_setup_entry)
+        self.history: Optional[EventHistoryStore] = None
+        self._history_s = 0.0  # time the last history append took (excluded from "shape")
+        # Rows that are genuinely new since the last poll (restart-safe once a Store is attached)
+        # One debounced Store write covers both (and only when either changed)
+        self.state = PersistedState(store)
+        self.delta = EventDelta(self.state.schedule_save)
+        # Last fetched rows, persisted so a restart begins from last-known state
+        self.snapshot = SnapshotCache(self.state.schedule_save)
+        self.state.register("delta", self.delta.dump, self.delta.load)
+        self.state.register("snapshot", self.snapshot.dump, self.snapshot.load)
+        # DOCSIS health verdict with hysteresis; entities read `self.health` as-is. None
+        # (unknown) until the modem has been polled, unless a previous run's was restored
+        self._health = HealthTracker(on_change=self.state.schedule_save)
+        self.health: Optional[HealthState] = None
+        # The latest row and when it happened (its own stamp, else when it first arrived)
+        self._latest_key: Optional[Tuple[str, str]] = None
+        self._latest_at: Optional[datetime] = None
+        self.state.register("health", self._health.dump, self._health.load)
+        # Whether a poll has reached (or failed to reach) the modem since startup
+        self.contacted = False
+        # Firmware time strings → aware datetimes (format detected once, modem's local time)
+        self.timestamps = TimestampParser(
+            dt_util.get_time_zone(hass.config.time_zone) or dt_util.UTC
+        )
+        # Incremental per-severity counters over the current table
+        self.aggregates = SeverityAggregates()
+        # Shared, per-snapshot attribute payload for the last-event sensors
+        self.attributes = EventAttributeCache(attribute_mode)
 
     async def _async_update_data(self) -> Dict[str, Any]:
         """Fetch and shape data. Called by HA on every poll."""
+        stats = self.api.stats
+        started = time.perf_counter()
+        try:
+            table = await self.api.fetch_snapshot()  # EventTable (possibly empty)
+        except VirginApiError as exc:
+            self.contacted = True
+            # Burst-poll until the modem answers again
+            self.policy.on_trouble()
+            previous = self.health
+            if self._update_health(False, (self.data or {}).get("last_event_severity")) is not previous:
+                # HA skips listener updates on repeated failures; a health flip must still land
+                self.async_update_listeners()
+            # Let HA mark entities unavailable but keep last good data if present
+            raise UpdateFailed(str(exc)) from exc
+        self.contacted = True
+        fetched = time.perf_counter()
+        stats.record("fetch", fetched - started)
+        self._history_s = 0.0
+        try:
+            return await self._async_shape(table)
+        finally:
+            # The history append is executor I/O, not shaping
+            stats.record("shape", time.perf_counter() - fetched - self._history_s)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify entities, timing the fan-out (state writes happen synchronously in here)."""
+        started = time.perf_counter()
+        super().async_update_listeners()
+        self.api.stats.record("fanout", time.perf_counter() - started)
+
+    async def _async_shape(self, table: EventTable, announce: bool = True) -> Dict[str, Any]:
+        """
+        Turn a fetched table into the coordinator payload. With `announce` off (restore)
+        rows are only remembered: no bus events, no rate arrivals, no history writes.
+        """
+        # Channel counters move every poll, independently of the event log
+        channels_changed = self._update_channels()
+
+        # Unchanged event log: the API hands back the very same object. Return the
+        # previous shaped snapshot so nothing is rebuilt and no state is written.
+        now = time.monotonic()
+        if table is self._last_table and self.data is not None:
+            self.policy.on_unchanged()
+            # …except the per-hour rate, which decays even while the table is static,
+            # and the channel metrics
+            changes: Dict[str, Any] = {}
+            if self.aggregates.expire(now):
+                changes["severity_stats"] = self.aggregates.snapshot()
+            channels = self.channels.summary()
+            if channels is not self.data.get("channels"):
+                changes["channels"] = channels
+            analytics = self._update_analytics(now, channels_changed, [])
+            if analytics != self.data.get("analytics"):
+                changes["analytics"] = analytics
+            health = self._update_health(True, self.data.get("last_event_severity"))
+            if health is not self.data.get("health"):
+                changes["health"] = health
+            return self.data | changes if changes else self.data
+        self._last_table = table
+        self.snapshot.update(self.api.events)
+
+        # Rows never delivered before (matched on content, so rotation/index shifts are free).
+        # The very first poll after install only establishes the baseline.
+        new_rows = self.delta.update(table)
+        fresh = new_rows if announce and not self.delta.baseline else []
+
+        # One pass over the table: classify only rows that are new since the last
+        # poll (others reuse their cached result) and update the severity counters.
+        self.aggregates.update(table, self.classifier, now, arrivals=fresh)
+
+        # Something changed: tighten right up on fresh trouble, else back to the base rate
+        if any(r.severity in _ERROR_SEVERITIES for r in fresh):
+            self.policy.on_trouble()
+        else:
+            self.policy.on_changed()
+
+        analytics = self._update_analytics(now, channels_changed, fresh)
+
+        # Newest row: by index, unless the synced timestamps show a newest-first table
+        latest = self.timestamps.stamp(table) if table.rows else None
+        self._track_latest(latest, fresh)
+        # A restored snapshot says nothing about the modem now: keep the restored verdict
+        health = self._update_health(True, latest.severity if latest else None) if announce else self.health
+
         # Expose a transient “scanning” state so sensors can reflect progress
         scanning_payload: Dict[str, Any] = {
             "status": "scanning",
             "last_event_message": None,
             "last_event_time": None,
+            "last_event_timestamp": None,
             "last_event_priority": None,
             "last_event_index": None,
+            "last_event_severity": None,
+            "severity_stats": self.aggregates.snapshot(),
+            "channels": self.channels.summary(),
+            "analytics": analytics,
+            "health": health,
         }
 
-        try:
-            raw = await self.api.fetch_snapshot()  # flat OID→value dict (or {})
-        except VirginApiError as exc:
-            # Let HA mark entities unavailable but keep last good data if present
-            raise UpdateFailed(str(exc)) from exc
-
         # Nothing returned? Keep a minimal payload so sensors don’t crash.
-        if not isinstance(raw, dict) or not raw:
+        if not table.rows:
             data = scanning_payload | {"status": "empty"}
             return data
 
-        # Work out the latest event index that has BOTH time and message
-        latest_idx: Optional[int] = None
-        for i in range(1, 999):  # modest upper bound; we only expect up to ~20
-            t = raw.get(f"1.3.6.1.2.1.69.1.5.8.1.2.{i}")
-            m = raw.get(f"1.3.6.1.2.1.69.1.5.8.1.7.{i}")
-            if t or m:
-                latest_idx = i
-        # If modem numbers “oldest→newest”, latest will be the highest present.
-        # If none found, bail gracefully.
-        if latest_idx is None:
-            data = scanning_payload | {"status": "no_events", "raw": raw}
+        if latest is None:
+            data = scanning_payload | {"status": "no_events", "table": table}
             return data
 
-        # Pull the latest row’s fields
-        last_time = str(raw.get(f"1.3.6.1.2.1.69.1.5.8.1.2.{latest_idx}", "")).strip()
-        last_msg  = str(raw.get(f"1.3.6.1.2.1.69.1.5.8.1.7.{latest_idx}", "")).strip()
-        # Some firmwares expose priority/level at .5.<i>
-        last_pri  = str(raw.get(f"1.3.6.1.2.1.69.1.5.8.1.5.{latest_idx}", "")).strip()
-
-        # Assess severity from priority and known trouble keywords
-        is_error = self._looks_bad(last_msg, last_pri)
-
         # Build your shaped snapshot
         data: Dict[str, Any] = {
             "status": "ok",
-            "raw": raw,  # keep for power users / templates
-            "last_event_index": latest_idx,
-            "last_event_time": last_time or None,
-            "last_event_message": last_msg or None,
-            "last_event_priority": last_pri or None,
-            # Also echo lists (useful for tables)
-            "times": {oid: raw.get(oid) for oid in EVENT_TIME_OIDS if oid in raw},
-            "messages": {oid: raw.get(oid) for oid in EVENT_MSG_OIDS if oid in raw},
+            "table": table,  # rows for sensors; OID views (table.flat etc.) are built lazily
+            "last_event_index": latest.index,
+            "last_event_time": latest.time or None,
+            "last_event_timestamp": latest.when,
+            "last_event_message": latest.message or None,
+            "last_event_priority": latest.priority or None,
+            "last_event_severity": latest.severity,
+            "last_event_keyword": latest.keyword,
+            "severity_stats": self.aggregates.snapshot(),
+            "channels": self.channels.summary(),
+            "analytics": analytics,
+            "health": health,
         }
 
-        # Opportunistic Logbook entry for NEW interesting messages
+        # Bus events (and, via logbook.py, Logbook entries) for rows new since the last poll
+        try:
+            self._fire_new_rows(fresh)
+        except Exception:  # event dispatch must never break polling
+            _LOGGER.debug("Event dispatch suppressed due to exception", exc_info=True)
+
+        # Append rows we haven't seen before to the on-disk history (off the event loop);
+        # the baseline goes in too – the store de-duplicates on (time, message)
+        history_started = time.perf_counter()
         try:
-            self._maybe_log(EVENT_ERROR if is_error else EVENT_GENERAL, data, is_error=is_error)
-        except Exception:  # logging must never break polling
-            _LOGGER.debug("Logbook emit suppressed due to exception", exc_info=True)
+            await self._async_record_history(new_rows if announce else [])
+        except Exception:  # history must never break polling
+            _LOGGER.warning("Event history write failed", exc_info=True)
+        self._history_s = time.perf_counter() - history_started
 
         return data
 
+    async def async_restore(self) -> bool:
+        """
+        Publish a snapshot rebuilt from the rows persisted by a previous run (loaded by
+        `state.async_load()`), before the first poll. Restored rows are never announced,
+        even if the delta window somehow lacks them. False when there was nothing to restore.
+        The health verdict is the one persisted with them, if any; reachability stays
+        unknown until the first poll.
+        """
+        self.health = self._health.state
+        events = self.snapshot.events
+        if not events:
+            return False
+        data = await self._async_shape(self.api.restore(events), announce=False)
+        self.async_set_updated_data(data)
+        _LOGGER.debug("Restored %d event rows for %s", len(events), self.api.host)
+        return True
+
+    @property
+    def poll_interval(self) -> timedelta:
+        """Current (adaptive) interval until this modem's next poll."""
+        return self.policy.interval
+
+    @property
+    def base_interval(self) -> timedelta:
+        """Configured scan interval; the scheduler phase-spreads modems on this."""
+        return timedelta(seconds=self.policy.base)
+
     # ----------------- helpers -----------------
 
-    def _looks_bad(self, message: str, priority: str) -> bool:
-        """Heuristic to flag errors/warnings worth logging distinctly."""
-        msg_l = (message or "").lower()
-        pri_l = (priority or "").lower()
+    def _track_latest(self, latest: Optional[EventRow], fresh: List[EventRow]) -> None:
+        """
+        Remember when the newest row happened, so a critical one stops counting against
+        health once it is old. Unsynced rows use the poll that first announced them;
+        baseline and restored rows have no such time, and are not counted at all.
+        """
+        if latest is None:
+            self._latest_key = self._latest_at = None
+            return
+        key = (latest.time, latest.message)
+        if latest.when is not None:
+            self._latest_at = latest.when
+        elif any(row is latest for row in fresh):
+            self._latest_at = dt_util.utcnow()
+        elif key != self._latest_key:
+            self._latest_at = None
+        self._latest_key = key
 
-        # Numeric priorities (higher means worse on some firmwares)
-        try:
-            pnum = int(pri_l)
-            if pnum >= 4:
-                return True
-        except Exception:
-            pass
+    def _update_health(self, fetch_ok: bool, latest_severity: Optional[str]) -> HealthState:
+        """Evaluate DOCSIS health once for this update (entities only read the result)."""
+        self.health = self._health.evaluate(
+            dt_util.utcnow(),
+            time.monotonic(),
+            fetch_ok,
+            latest_severity,
+            self._latest_at,
+            self.aggregates.rates_by_severity(),
+            self.aggregates.rate_per_hour,
+        )
+        return self.health
 
-        # Textual priorities
-        if pri_l in {"warning", "warn", "error", "critical", "crit", "alert"}:
-            return True
+    def _update_analytics(
+        self, now: float, channels_changed: bool, fresh: List[EventRow]
+    ) -> Dict[str, Any]:
+        """Feed this poll's line metrics to the analytics stage; returns its snapshot."""
+        elapsed = now - self._last_sample_at if self._last_sample_at is not None else 0.0
+        self._last_sample_at = now
+        ds, us = self.channels.downstream, self.channels.upstream
+        uncorrected: Optional[float] = None
+        if len(ds):
+            # An identical body means the counters didn't move
+            uncorrected = ds.total_delta("uncorrected") if channels_changed else 0.0
+        t3 = sum(1 for r in fresh if r.keyword in _T3_KEYWORDS)
+        self.analytics.update(now, line_sample(
+            ds.present("snr") if len(ds) else (),
+            ds.present("power") if len(ds) else (),
+            us.present("power") if len(us) else (),
+            uncorrected,
+            elapsed,
+            t3,
+        ))
+        return self.analytics.snapshot()
 
-        # Known DOCSIS “bad things”
-        return any(k in msg_l for k in TROUBLE_KEYWORDS)
+    def _update_channels(self) -> bool:
+        """Fold the API's latest channel sample in (once per new sample); True if it changed."""
+        sample = self.api.channels
+        if sample is self._last_channels:
+            return False
+        self._last_channels = sample
+        if sample:
+            created = self.channels.update(sample)
+            if created:
+                _LOGGER.debug("%s: %d new channel(s) discovered", self.name, len(created))
+        return True
 
-    def _maybe_log(self, event_type: str, data: Dict[str, Any], is_error: bool) -> None:
+    async def _async_record_history(self, new_rows: List[EventRow]) -> None:
+        """Hand rows that weren't in the previous table to the history store."""
+        if self.history is None or not new_rows:
+            return
+        rows = [
+            (r.time, r.message, r.priority, r.severity or DEFAULT_PRIORITY, r.keyword or "")
+            for r in new_rows
+        ]
+        await self.hass.async_add_executor_job(self.history.append, rows)
+
+    def _event_data(self, row: EventRow) -> Dict[str, Any]:
+        return {
+            "host": self.api.host,
+            "index": row.index,
+            "time": row.time,
+            "timestamp": row.when.isoformat() if row.when else None,
+            "priority": row.priority,
+            "message": row.message,
+            "severity": row.severity or DEFAULT_PRIORITY,
+            "keyword": row.keyword,
+        }
+
+    def _fire_new_rows(self, rows: List[EventRow]) -> None:
         """
-        Emit a single concise Logbook entry without backdating. HA’s logbook
-        API (current cores) does NOT accept `when=` any more.
-        We deduplicate by (time + message).
+        Fire EVENT_ERROR (critical/warning) or EVENT_GENERAL per new row, oldest first.
+        Error rows always get their own event, so automations on EVENT_ERROR never
+        miss one. When more than EVENT_BATCH_THRESHOLD other rows arrive in one poll
+        they are coalesced into ONE EVENT_BATCH instead, so an event storm can't
+        flood the bus; it carries those rows and how many errors were fired alongside.
         """
-        msg = data.get("last_event_message") or ""
-        when_txt = data.get("last_event_time") or ""
-        pri = data.get("last_event_priority") or ""
-
-        # Dedup signature
-        sig = f"{when_txt}::{msg}"
-        if sig and sig == self._last_logged_signature:
-            return  # already logged this exact event
-
-        icon = "mdi:alert-circle" if is_error else "mdi:information"
-        pretty = msg
-        if pri:
-            pretty = f"[{str(pri).upper()}] {pretty}"
-        if when_txt:
-            pretty = f"{pretty} (at {when_txt})"
-
-        ha_logbook.async_log_entry(
-            self.hass,
-            name="Virgin Modem",
-            message=pretty or "Modem event",
-            domain=DOMAIN,
-            entity_id=None,
-            icon=icon,
+        if not rows:
+            return
+        fire = self.hass.bus.async_fire
+        others = [r for r in rows if r.severity not in _ERROR_SEVERITIES]
+        batch = len(others) > EVENT_BATCH_THRESHOLD
+        for row in rows:
+            if row.severity in _ERROR_SEVERITIES:
+                fire(EVENT_ERROR, self._event_data(row))
+            elif not batch:
+                fire(EVENT_GENERAL, self._event_data(row))
+        if not batch:
+            return
+        events = [self._event_data(r) for r in others]
+        worst = next(
+            (sev for sev in SEVERITIES if any(e["severity"] == sev for e in events)), DEFAULT_PRIORITY
         )
-        self._last_logged_signature = sig
-
+        fire(EVENT_BATCH, {
+            "host": self.api.host,
+            "count": len(events),
+            "errors": len(rows) - len(others),
+            "severity": worst,
+            "events": events,
+        })
@@ -0,0 +1,85 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/delta.py
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from .events import EventRow, EventTable
+
+# Fingerprints remembered – well above one table (20 rows), so rows that rotate out
+# and later reappear (firmware re-shuffles, index shifts) are still recognised
+DEFAULT_CAPACITY = 512
+
+
+def fingerprint(row: EventRow, occurrence: int) -> str:
+    """Stable row identity: time + message, plus which duplicate of that pair it is."""
+    raw = f"{row.time}\x1f{row.message}\x1f{occurrence}".encode("utf-8", "replace")
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+class EventDelta:
+    """
+    "New rows since last poll" for one modem.
+
+    Rows are matched on content, not position, so table rotation and index shifts
+    cost nothing, and identical (time, message) rows are told apart by their
+    occurrence count within the table. A bounded, recency-ordered set of
+    fingerprints (rows still in the table are refreshed every poll, so they are
+    never evicted) makes each update O(n) in the table size.
+
+    The window is persisted through `on_change` (see persist.PersistedState), so
+    a restart doesn't re-emit rows that were already delivered before it.
+    """
+
+    def __init__(
+        self, on_change: Optional[Callable[[], None]] = None, capacity: int = DEFAULT_CAPACITY
+    ) -> None:
+        self._on_change = on_change
+        self.capacity = capacity
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        # True while no fingerprint has ever been recorded (first poll after install):
+        # that poll's rows are a baseline, not news
+        self.baseline = True
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Restore the fingerprint window saved by a previous run."""
+        seen = data.get("seen") or []
+        self._seen = OrderedDict.fromkeys(str(fp) for fp in seen[-self.capacity:])
+        self.baseline = not self._seen
+
+    def update(self, table: EventTable) -> List[EventRow]:
+        """Return the rows of `table` not seen before (oldest → newest) and remember them."""
+        seen = self._seen
+        counts: Dict[tuple, int] = {}
+        new_rows: List[EventRow] = []
+        self.baseline = not seen
+        changed = False
+
+        for row in table.rows:
+            if not (row.time or row.message):
+                continue
+            pair = (row.time, row.message)
+            occurrence = counts.get(pair, 0)
+            counts[pair] = occurrence + 1
+            fp = fingerprint(row, occurrence)
+            if fp in seen:
+                seen.move_to_end(fp)
+            else:
+                seen[fp] = None
+                new_rows.append(row)
+                changed = True
+
+        while len(seen) > self.capacity:
+            seen.popitem(last=False)
+
+        if changed and self._on_change is not None:
+            self._on_change()
+        return new_rows
+
+    def dump(self) -> Dict[str, Any]:
+        return {"seen": list(self._seen)}
+
+    def __len__(self) -> int:
+        return len(self._seen)
@@ -1,11 +1,38 @@
 """Virgin Modem Status – Home Assistant custom integration."""
 from __future__ import annotations
+import time
 from typing import Any
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
-from .const import DOMAIN
+from .const import DOMAIN, DATA_SCHEDULER
 
 async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
     coord = hass.data[DOMAIN][entry.entry_id]
+    scheduler = hass.data.get(DATA_SCHEDULER)
+    data = dict(coord.data or {})
+    table = data.pop("table", None)
     # Redact nothing here; add redaction if needed.
-    return {"raw": coord.data}
+    return {
+        "backend": coord.api.backend,
+        "firmware_profile": coord.api.profile.name if coord.api.profile else None,
+        "snapshot": data,
+        "raw": table.flat if table is not None else {},
+        "scheduler": scheduler.as_dict() if scheduler else None,
+        "breaker": coord.api.breaker.as_dict(time.monotonic()),
+        "poll_stats": coord.api.stats.as_dict(),
+        "attribute_writes": coord.attributes.as_dict(),
+        "state_store": coord.state.as_dict(),
+        "line_analytics": coord.analytics.metrics_dict(),
+        "time_format": {
+            "format": coord.timestamps.format,
+            "locked": coord.timestamps.locked,
+            "cache": coord.timestamps.cache_info(),
+        },
+        # Only here, not as an entity attribute: the jittered value would churn recorder rows
+        "poll_interval": {
+            "current_s": round(coord.poll_interval.total_seconds(), 1),
+            "base_s": coord.policy.base,
+            "floor_s": coord.policy.floor,
+            "ceiling_s": coord.policy.ceiling,
+        },
+    }
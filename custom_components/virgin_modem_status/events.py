@@ -0,0 +1,99 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/events.py
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from .const import OID_MSG, OID_PRI, OID_TIME
+
+
+class EventRow:
+    """
+    One DOCSIS event-log row (1-based `index` as numbered in the OID table).
+    `severity`/`keyword` are filled in by the SeverityClassifier, `when` (aware
+    datetime, None if unsynced/unparseable) by the TimestampParser.
+    """
+
+    __slots__ = ("index", "time", "message", "priority", "severity", "keyword", "when")
+
+    def __init__(self, index: int, time: str, message: str, priority: str = "") -> None:
+        self.index = index
+        self.time = time
+        self.message = message
+        self.priority = priority
+        self.severity: Optional[str] = None
+        self.keyword: Optional[str] = None
+        self.when: Optional[datetime] = None
+
+    def __repr__(self) -> str:
+        return f"EventRow({self.index}, {self.time!r}, {self.message!r}, {self.priority!r})"
+
+
+class EventTable:
+    """
+    Parsed event table as returned by VirginApi (oldest → newest).
+
+    The newest row is located once at construction. OID-keyed views (`times`,
+    `messages`, `flat`) are only materialised on first access and then cached,
+    so the common poll path never builds strings it doesn't need.
+    """
+
+    __slots__ = ("rows", "latest", "latest_index", "_times", "_messages", "_flat")
+
+    def __init__(self, rows: List[EventRow]) -> None:
+        self.rows = rows
+        # If the modem numbers oldest→newest, the latest is the last row with content
+        self.latest: Optional[EventRow] = next((r for r in reversed(rows) if r.time or r.message), None)
+        self.latest_index: Optional[int] = self.latest.index if self.latest else None
+        self._times: Optional[Dict[str, str]] = None
+        self._messages: Optional[Dict[str, str]] = None
+        self._flat: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_events(cls, events: List[Dict[str, Any]], limit: int = 20) -> "EventTable":
+        """Build from normalised event dicts, keeping the last `limit` rows."""
+        rows: List[EventRow] = []
+        for i, ev in enumerate(events[-limit:], start=1):
+            rows.append(EventRow(
+                i,
+                str(ev.get("time") or "").strip(),
+                str(ev.get("message") or "").strip(),
+                str(ev.get("priority") or "").strip(),
+            ))
+        return cls(rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __bool__(self) -> bool:
+        return self.latest is not None
+
+    def __iter__(self) -> Iterator[EventRow]:
+        return iter(self.rows)
+
+    @property
+    def times(self) -> Dict[str, str]:
+        """{eventDateTime OID: time} for rows that have a time."""
+        if self._times is None:
+            self._times = {f"{OID_TIME}{r.index}": r.time for r in self.rows if r.time}
+        return self._times
+
+    @property
+    def messages(self) -> Dict[str, str]:
+        """{eventText OID: message} for rows that have a message."""
+        if self._messages is None:
+            self._messages = {f"{OID_MSG}{r.index}": r.message for r in self.rows if r.message}
+        return self._messages
+
+    @property
+    def flat(self) -> Dict[str, Any]:
+        """Legacy flat OID→value map (what fetch_snapshot used to return)."""
+        if self._flat is None:
+            flat: Dict[str, Any] = {}
+            for r in self.rows:
+                flat[f"{OID_TIME}{r.index}"] = r.time
+                flat[f"{OID_MSG}{r.index}"] = r.message
+                if r.priority:
+                    flat[f"{OID_PRI}{r.index}"] = r.priority
+            self._flat = flat
+        return self._flat
@@ -0,0 +1,142 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/health.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+# Raw "unhealthy" criteria
+WARNING_RATE = 4.0        # warning-class events per hour
+EVENT_STORM_RATE = 30.0   # events of any severity per hour
+LATEST_WINDOW = 3600.0    # seconds a critical latest event counts against health
+
+# Hysteresis: consecutive evaluations needed to flip, and minimum time in a state
+UNHEALTHY_AFTER = 2
+HEALTHY_AFTER = 3
+MIN_HOLD = 600.0          # seconds
+
+
+class HealthState:
+    """
+    Immutable verdict, built only when it changes. Entities hand out its fields
+    (including the prebuilt attributes dict) as-is, so reads allocate nothing.
+    """
+
+    __slots__ = ("healthy", "reasons", "since", "attributes")
+
+    def __init__(self, healthy: bool, reasons: Tuple[str, ...], since: datetime) -> None:
+        self.healthy = healthy
+        self.reasons = reasons
+        self.since = since
+        self.attributes: Dict[str, Any] = {"reasons": list(reasons), "since": since.isoformat()}
+
+    def __repr__(self) -> str:
+        return f"HealthState({self.healthy}, {self.reasons!r})"
+
+
+class HealthTracker:
+    """
+    DOCSIS health for one modem, evaluated once per coordinator update.
+
+    Unhealthy while the modem can't be reached, the latest event is critical and
+    happened (or, on an unsynced clock, arrived) within LATEST_WINDOW, critical
+    events arrived in the last hour, warnings arrive faster than
+    WARNING_RATE per hour or events of any kind faster than EVENT_STORM_RATE.
+    The published state only flips after UNHEALTHY_AFTER / HEALTHY_AFTER
+    consecutive evaluations agree and MIN_HOLD seconds have passed since the
+    last flip, so auto-heal automations don't see it flap.
+
+    There is no verdict (state None) until the first evaluation, which publishes
+    its result straight away, unless one persisted by a previous run was loaded
+    (see persist.PersistedState); `on_change` fires whenever the verdict changes.
+    """
+
+    def __init__(
+        self,
+        unhealthy_after: int = UNHEALTHY_AFTER,
+        healthy_after: int = HEALTHY_AFTER,
+        min_hold: float = MIN_HOLD,
+        on_change: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.unhealthy_after = unhealthy_after
+        self.healthy_after = healthy_after
+        self.min_hold = min_hold
+        self._on_change = on_change
+        self.state: Optional[HealthState] = None
+        self._streak = 0                  # consecutive evaluations disagreeing with the state
+        self._changed_at: Optional[float] = None
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """The verdict saved by a previous run (ignored if malformed)."""
+        healthy, reasons, since = data.get("healthy"), data.get("reasons"), data.get("since")
+        if not isinstance(healthy, bool) or not isinstance(reasons, list) or not isinstance(since, str):
+            return
+        try:
+            when = datetime.fromisoformat(since)
+        except ValueError:
+            return
+        self.state = HealthState(healthy, tuple(str(r) for r in reasons), when)
+
+    def dump(self) -> Dict[str, Any]:
+        state = self.state
+        if state is None:
+            return {}
+        return {"healthy": state.healthy, "reasons": list(state.reasons), "since": state.since.isoformat()}
+
+    def _publish(self, state: HealthState) -> HealthState:
+        self.state = state
+        if self._on_change is not None:
+            self._on_change()
+        return state
+
+    def evaluate(
+        self,
+        now: datetime,
+        mono: float,
+        fetch_ok: bool,
+        latest_severity: Optional[str],
+        latest_at: Optional[datetime],
+        rates: Mapping[str, float],
+        rate_per_hour: float,
+    ) -> HealthState:
+        """
+        Fold in one update; returns the (possibly unchanged, same-object) state.
+        `latest_at` is when the latest event happened, None if unknown (then a
+        critical latest event no longer counts: it may be days old).
+        """
+        reasons: List[str] = []
+        if not fetch_ok:
+            reasons.append("modem unreachable")
+        if (
+            latest_severity == "critical"
+            and latest_at is not None
+            and (now - latest_at).total_seconds() <= LATEST_WINDOW
+        ):
+            reasons.append("latest event is critical")
+        if rates.get("critical", 0.0) > 0:
+            reasons.append("critical events in the last hour")
+        if rates.get("warning", 0.0) >= WARNING_RATE:
+            reasons.append("warning burst")
+        if rate_per_hour >= EVENT_STORM_RATE:
+            reasons.append("event storm")
+        healthy = not reasons
+
+        state = self.state
+        if state is None:
+            # First contact: nothing to hold against yet
+            return self._publish(HealthState(healthy, tuple(reasons), now))
+        if healthy == state.healthy:
+            self._streak = 0
+            if not healthy and tuple(reasons) != state.reasons:
+                # Still unhealthy, for different reasons: refresh them, keep `since`
+                self._publish(HealthState(False, tuple(reasons), state.since))
+            return self.state
+
+        self._streak += 1
+        needed = self.healthy_after if healthy else self.unhealthy_after
+        held = self._changed_at is None or mono - self._changed_at >= self.min_hold
+        if self._streak >= needed and held:
+            self._streak = 0
+            self._changed_at = mono
+            self._publish(HealthState(healthy, tuple(reasons), now))
+        return self.state
@@ -0,0 +1,153 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/history.py
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:  # sqlite3 is imported by open(), in the executor
+    import sqlite3
+
+_LOGGER = logging.getLogger(__name__)
+
+# Prune at most this often (seconds); appends are cheap, DELETE scans are not free.
+_PRUNE_EVERY = 6 * 3600
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS events (
+        id       INTEGER PRIMARY KEY,
+        ts       REAL    NOT NULL,             -- first seen (epoch seconds)
+        time     TEXT    NOT NULL,             -- modem's own timestamp text
+        message  TEXT    NOT NULL,
+        priority TEXT    NOT NULL DEFAULT '',
+        severity TEXT    NOT NULL,
+        keyword  TEXT    NOT NULL DEFAULT '',  -- matched trouble keyword, if any
+        UNIQUE (time, message)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts)",
+    "CREATE INDEX IF NOT EXISTS idx_events_severity_ts ON events (severity, ts)",
+    "CREATE INDEX IF NOT EXISTS idx_events_keyword_ts ON events (keyword, ts)",
+)
+
+# (time, message, priority, severity, keyword)
+HistoryRow = Tuple[str, str, str, str, str]
+
+
+class EventHistoryStore:
+    """
+    Append-only SQLite log of DOCSIS events for one modem.
+
+    Rows are de-duplicated on (time, message) and indexed by first-seen time,
+    severity and matched keyword, so questions like "T4 timeouts in the last
+    7 days" are index range scans. Every method does blocking I/O – call them
+    through `hass.async_add_executor_job`.
+    """
+
+    def __init__(self, path: str, retention_days: int) -> None:
+        self.path = path
+        self.retention_days = max(1, int(retention_days))
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+    def open(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                return
+            import sqlite3
+
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for stmt in _SCHEMA:
+                conn.execute(stmt)
+            self._conn = conn
+        self.prune()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def append(self, rows: Iterable[HistoryRow], seen: Optional[float] = None) -> int:
+        """Insert new rows (duplicates are ignored); returns how many were written."""
+        seen = time.time() if seen is None else seen
+        with self._lock:
+            if self._conn is None:
+                return 0
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO events (ts, time, message, priority, severity, keyword) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(seen, *row) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                # Don't leave the transaction open: the next append's BEGIN would fail
+                # ("cannot start a transaction within a transaction") for good
+                self._conn.execute("ROLLBACK")
+                raise
+            written = self._conn.total_changes - before
+        if seen - self._last_prune >= _PRUNE_EVERY:
+            self.prune(seen)
+        return written
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop rows older than the retention window."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if self._conn is None:
+                return 0
+            cur = self._conn.execute(
+                "DELETE FROM events WHERE ts < ?", (now - self.retention_days * 86400,)
+            )
+            self._last_prune = now
+            return cur.rowcount
+
+    def query(
+        self,
+        since: float,
+        severity: Optional[str] = None,
+        keyword: Optional[str] = None,
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        """Return the count and newest `limit` events since `since` (epoch seconds)."""
+        where = ["ts >= ?"]
+        args: List[Any] = [since]
+        if severity:
+            where.append("severity = ?")
+            args.append(severity.lower())
+        if keyword:
+            where.append("keyword = ?")
+            args.append(keyword.lower())
+        clause = " AND ".join(where)
+        with self._lock:
+            if self._conn is None:
+                return {"count": 0, "events": []}
+            count = self._conn.execute(f"SELECT COUNT(*) FROM events WHERE {clause}", args).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT ts, time, message, priority, severity, keyword FROM events "
+                f"WHERE {clause} ORDER BY ts DESC, id DESC LIMIT ?",
+                [*args, int(limit)],
+            ).fetchall()
+        return {
+            "count": count,
+            "events": [
+                {
+                    "seen": ts,
+                    "time": t,
+                    "message": m,
+                    "priority": p,
+                    "severity": s,
+                    "keyword": k or None,
+                }
+                for ts, t, m, p, s, k in rows
+            ],
+        }
@@ -0,0 +1,200 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/html_parser.py
+from __future__ import annotations
+from collections import deque
+from typing import Any, Deque, Dict, List
+import logging
+import re
+
+_LOGGER = logging.getLogger(__name__)
+
+# We only ever expose the newest ~20 rows, so that is all we keep while streaming.
+MAX_EVENT_ROWS = 20
+
+# A single row larger than this is not an event row (script blobs, embedded data…);
+# drop it rather than let the buffer grow with the page.
+_MAX_ROW_CHARS = 64 * 1024
+# Characters kept between feeds so tags/markers split across chunks still match.
+_CARRY_CHARS = 32
+_CARRY_TAG_CHARS = 1024
+
+# --- Compiled parsing engine (built once at import) ---
+_ROW_OPEN = re.compile(r"<tr[^>]*>", re.I)
+_ROW_CLOSE = re.compile(r"</tr>", re.I)
+_CELL = re.compile(r"<t[dh][^>]*>(.*?)</t[dh]>", re.I | re.S)
+_TAG = re.compile(r"<[^>]+>")
+_WS = re.compile(r"\s+")
+_LOGIN = re.compile(r"login|sign\s+in", re.I)
+_PASSWORD = re.compile(r"password", re.I)
+
+# Time detector (several common formats)
+_TIME_PAT = re.compile(
+    r"(?:(\d{4}-\d{2}-\d{2})|(\d{1,2}/\d{1,2}/\d{2,4}))\s+(\d{1,2}:\d{2}:\d{2})"
+)
+
+_HEADER_WORDS = frozenset({"message", "event", "description"})
+
+
+def _cell_text(cell: str) -> str:
+    """Tag-free, whitespace-collapsed cell text."""
+    if "<" in cell:
+        cell = _TAG.sub("", cell)
+    return _WS.sub(" ", cell).strip()
+
+
+class RowLayout:
+    """
+    How a firmware lays out one event row. Subclasses turn the raw cell list of a
+    <tr> into an event dict (or None to skip the row). Only the cells a layout
+    actually uses are tag-stripped.
+    """
+
+    name = "base"
+
+    def extract(self, cells: List[str]) -> Dict[str, Any] | None:
+        raise NotImplementedError
+
+    @staticmethod
+    def _event(time_txt: str, priority: str, message: str) -> Dict[str, Any] | None:
+        # Ignore headers / empties
+        if not message or message.lower() in _HEADER_WORDS:
+            return None
+        return {"time": time_txt, "priority": priority.lower(), "message": message}
+
+
+class HeuristicLayout(RowLayout):
+    """
+    Default layout:
+    - 2–5 <td>/<th> cells.
+    - First cell = time, last cell = message, middle = priority where present.
+    - Some firmwares put time in the 2nd cell; that is detected per row.
+    """
+
+    name = "heuristic"
+
+    def extract(self, cells: List[str]) -> Dict[str, Any] | None:
+        if len(cells) < 2:
+            return None
+        first = _cell_text(cells[0])
+        mid = _cell_text(cells[1]) if len(cells) >= 3 else ""
+        if not _TIME_PAT.search(first):
+            # Must have a time-ish cell, first or second
+            if not (mid and _TIME_PAT.search(mid)):
+                return None
+            first, mid = mid, first
+        return self._event(first, mid, _cell_text(cells[-1]))
+
+
+class ColumnLayout(RowLayout):
+    """Fixed column positions (negative indexes count from the end; None = absent)."""
+
+    def __init__(self, name: str, time_col: int, message_col: int, priority_col: int | None = None) -> None:
+        self.name = name
+        self._time = time_col
+        self._msg = message_col
+        self._pri = priority_col
+        self._need = max(c + 1 if c >= 0 else -c for c in (time_col, message_col, priority_col or 0))
+
+    def extract(self, cells: List[str]) -> Dict[str, Any] | None:
+        if len(cells) < self._need:
+            return None
+        time_txt = _cell_text(cells[self._time])
+        if not _TIME_PAT.search(time_txt):
+            return None
+        pri = _cell_text(cells[self._pri]) if self._pri is not None else ""
+        return self._event(time_txt, pri, _cell_text(cells[self._msg]))
+
+
+# Registry of known row layouts; firmware profiles pick one by name.
+ROW_LAYOUTS: Dict[str, RowLayout] = {}
+
+
+def register_layout(layout: RowLayout) -> RowLayout:
+    ROW_LAYOUTS[layout.name] = layout
+    return layout
+
+
+DEFAULT_LAYOUT = register_layout(HeuristicLayout())
+register_layout(ColumnLayout("time_priority_message", 0, 2, 1))
+register_layout(ColumnLayout("time_message", 0, 1))
+register_layout(ColumnLayout("priority_time_message", 1, 2, 0))
+
+
+def _row_to_event(row: str, layout: RowLayout = DEFAULT_LAYOUT) -> Dict[str, Any] | None:
+    """One pass over a row: find its cells, then let the layout pick them apart."""
+    return layout.extract(_CELL.findall(row))
+
+
+class HtmlEventStream:
+    """
+    Incremental, single-pass parser for the modem's HTML event table.
+
+    Feed it decoded text in chunks as it arrives; completed <tr> rows are parsed
+    immediately and only the newest `max_rows` events are retained, so memory
+    stays bounded by one row plus the ring of kept events – not by page size.
+    """
+
+    def __init__(self, max_rows: int = MAX_EVENT_ROWS, layout: RowLayout = DEFAULT_LAYOUT) -> None:
+        self._layout = layout
+        self._buf = ""
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=max_rows)
+        self._saw_login = False
+        self._saw_password = False
+        self.rows_seen = 0
+
+    def feed(self, text: str) -> None:
+        """Consume the next chunk of page text."""
+        if not text:
+            return
+        buf = self._buf + text
+
+        # Bail-out markers for login pages (checked across chunk boundaries)
+        if not self._saw_login and _LOGIN.search(buf):
+            self._saw_login = True
+        if not self._saw_password and _PASSWORD.search(buf):
+            self._saw_password = True
+
+        pos = 0
+        while True:
+            opening = _ROW_OPEN.search(buf, pos)
+            if opening is None:
+                break
+            closing = _ROW_CLOSE.search(buf, opening.end())
+            if closing is None:
+                # Row still incomplete – keep it for the next chunk (unless it is absurd)
+                if len(buf) - opening.start() > _MAX_ROW_CHARS:
+                    pos = len(buf)
+                    break
+                self._buf = buf[opening.start():]
+                return
+            self.rows_seen += 1
+            ev = _row_to_event(buf[opening.end():closing.start()], self._layout)
+            if ev is not None:
+                self._events.append(ev)
+            pos = closing.end()
+
+        # No open row: only a short tail can still matter (a split "<tr …>" or marker)
+        keep = len(buf) - _CARRY_CHARS
+        tag = buf.rfind("<", pos)
+        if tag != -1 and len(buf) - tag <= _CARRY_TAG_CHARS:
+            keep = min(keep, tag)
+        self._buf = buf[max(pos, keep):]
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Finish the stream and return the retained events (oldest → newest)."""
+        self._buf = ""
+        if self._saw_login and self._saw_password:
+            _LOGGER.warning("VirginApi: page looks like a login form; cannot parse logs.")
+            return []
+        return list(self._events)
+
+
+def parse_events_html(
+    html: str, max_rows: int = MAX_EVENT_ROWS, layout: RowLayout = DEFAULT_LAYOUT
+) -> List[Dict[str, Any]]:
+    """Parse a complete page in one go (same engine as the streaming path)."""
+    if not html:
+        return []
+    stream = HtmlEventStream(max_rows, layout)
+    stream.feed(html)
+    return stream.close()
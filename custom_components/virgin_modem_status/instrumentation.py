@@ -0,0 +1,196 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/instrumentation.py
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from typing import Any, Dict, Optional
+
+from aiohttp import TraceConfig
+
+# Poll stages, in pipeline order:
+#   dns, connect  – name resolution / TCP connect (only when no keep-alive connection was reused)
+#   ttfb          – request sent → response headers
+#   download      – body transfer, excluding parse time (SNMP: the GETBULK walk)
+#   parse         – decoding rows, wherever it ran
+#   parse_inline  – the same, only bodies parsed on the event loop
+#   parse_executor – the same, only bodies handed to the executor (their times differ by
+#                   orders of magnitude, so the combined percentiles hide both)
+#   fetch         – the whole fetch, retries included
+#   shape         – coordinator work on the result (delta, aggregates, analytics, payload)
+#   fanout        – listener callbacks / entity state writes
+STAGES = (
+    "dns", "connect", "ttfb", "download", "parse", "parse_inline", "parse_executor",
+    "fetch", "shape", "fanout",
+)
+PARSE_MODES = ("inline", "executor")
+PERCENTILES = (0.5, 0.95, 0.99)
+
+# Every DECAY_EVERY samples all buckets are halved, so percentiles track roughly
+# the last DECAY_EVERY..2*DECAY_EVERY polls instead of all time.
+DECAY_EVERY = 512
+
+
+class Histogram:
+    """
+    Fixed-size log-bucketed histogram: ~15 % wide buckets between `lo` and `hi`,
+    plus an underflow and an overflow bucket. Adding is one log() and an array
+    increment; percentiles are the upper bound of the bucket they fall in
+    (capped by the largest value seen), so they err on the slow side.
+    """
+
+    __slots__ = ("lo", "_log_lo", "_scale", "_counts", "_n", "count", "total", "max", "last")
+
+    def __init__(self, lo: float, hi: float, buckets: int = 120) -> None:
+        self.lo = lo
+        self._log_lo = math.log(lo)
+        self._scale = buckets / (math.log(hi) - self._log_lo)
+        self._n = buckets
+        self._counts = array("I", bytes(4 * (buckets + 2)))
+        self.count = 0       # samples currently weighted in the buckets (decays)
+        self.total = 0       # samples ever recorded
+        self.max = 0.0
+        self.last: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        if value <= self.lo:
+            i = 0
+        else:
+            i = min(self._n + 1, int((math.log(value) - self._log_lo) * self._scale) + 1)
+        self._counts[i] += 1
+        self.count += 1
+        self.total += 1
+        self.last = value
+        if value > self.max:
+            self.max = value
+        if self.total % DECAY_EVERY == 0:
+            self._decay()
+
+    def _decay(self) -> None:
+        counts = self._counts
+        for i in range(len(counts)):
+            counts[i] >>= 1
+        self.count = sum(counts)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank and n:
+                return min(self.max, self.lo * math.exp(i / self._scale))
+        return self.max
+
+    def as_dict(self, scale: float = 1.0, digits: int = 3) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for q in PERCENTILES:
+            v = self.percentile(q)
+            out[f"p{round(q * 100)}"] = round(v * scale, digits) if v is not None else None
+        out["max"] = round(self.max * scale, digits)
+        out["last"] = round(self.last * scale, digits) if self.last is not None else None
+        out["samples"] = self.total
+        return out
+
+
+def _timing() -> Histogram:
+    return Histogram(1e-5, 120.0)      # 10 µs … 2 min
+
+
+class PollStats:
+    """
+    Per-modem poll pipeline instrumentation: a timing histogram per STAGES entry,
+    body size and row count histograms, and counts of the parse path taken
+    (json / oid / html / snmp, or not_modified / unchanged when nothing was parsed).
+    Cheap enough to stay on: a few perf_counter() calls and array increments per poll.
+    """
+
+    def __init__(self) -> None:
+        self.timings: Dict[str, Histogram] = {stage: _timing() for stage in STAGES}
+        self.sizes = Histogram(64, 64 * 1024 * 1024)
+        self.rows = Histogram(1, 100_000, 60)
+        self.paths: Dict[str, int] = {}
+        self.parse_modes: Dict[str, int] = {}     # inline / executor
+        self.reused_connections = 0
+        self.last_path: Optional[str] = None
+
+    def record(self, stage: str, seconds: float) -> None:
+        self.timings[stage].add(seconds)
+
+    def record_path(self, path: str) -> None:
+        self.paths[path] = self.paths.get(path, 0) + 1
+        self.last_path = path
+
+    def record_parse(
+        self, path: str, mode: str, seconds: float, size: int, rows: int
+    ) -> None:
+        """One parsed body: where it was parsed (PARSE_MODES), how long it took, its size and row count."""
+        self.record_path(path)
+        self.parse_modes[mode] = self.parse_modes.get(mode, 0) + 1
+        self.timings["parse"].add(seconds)
+        self.timings[f"parse_{mode}"].add(seconds)
+        self.sizes.add(size)
+        self.rows.add(rows)
+
+    def percentile_ms(self, stage: str, q: float) -> Optional[float]:
+        v = self.timings[stage].percentile(q)
+        return round(v * 1000, 2) if v is not None else None
+
+    def stage_dict(self, stage: str) -> Dict[str, Any]:
+        return self.timings[stage].as_dict(scale=1000)   # milliseconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "timings_ms": {s: self.stage_dict(s) for s, h in self.timings.items() if h.total},
+            "bytes": self.sizes.as_dict(digits=0),
+            "rows": self.rows.as_dict(digits=0),
+            "paths": dict(self.paths),
+            "last_path": self.last_path,
+            "parse_modes": dict(self.parse_modes),
+            "reused_connections": self.reused_connections,
+        }
+
+
+# ----------------- aiohttp tracing -----------------
+# Requests pass their PollStats as `trace_request_ctx`; requests without one are ignored.
+
+async def _on_dns_start(_session: Any, ctx: Any, _params: Any) -> None:
+    ctx.dns_started = time.perf_counter()
+
+
+async def _on_dns_end(_session: Any, ctx: Any, _params: Any) -> None:
+    stats = ctx.trace_request_ctx
+    if isinstance(stats, PollStats):
+        ctx.dns_s = time.perf_counter() - ctx.dns_started
+        stats.record("dns", ctx.dns_s)
+
+
+async def _on_connect_start(_session: Any, ctx: Any, _params: Any) -> None:
+    ctx.connect_started = time.perf_counter()
+
+
+async def _on_connect_end(_session: Any, ctx: Any, _params: Any) -> None:
+    stats = ctx.trace_request_ctx
+    if isinstance(stats, PollStats):
+        # Connection creation includes resolving the host; report the two separately
+        elapsed = time.perf_counter() - ctx.connect_started - getattr(ctx, "dns_s", 0.0)
+        stats.record("connect", max(0.0, elapsed))
+
+
+async def _on_reuse(_session: Any, ctx: Any, _params: Any) -> None:
+    stats = ctx.trace_request_ctx
+    if isinstance(stats, PollStats):
+        stats.reused_connections += 1
+
+
+def trace_config() -> TraceConfig:
+    """TraceConfig for the hub session, recording DNS and connect times into PollStats."""
+    config = TraceConfig()
+    config.on_dns_resolvehost_start.append(_on_dns_start)
+    config.on_dns_resolvehost_end.append(_on_dns_end)
+    config.on_connection_create_start.append(_on_connect_start)
+    config.on_connection_create_end.append(_on_connect_end)
+    config.on_connection_reuseconn.append(_on_reuse)
+    return config
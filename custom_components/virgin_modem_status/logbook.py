@@ -7,13 +7,13 @@ from homeassistant.components.logbook import (
     LOGBOOK_ENTRY_MESSAGE,
     LOGBOOK_ENTRY_NAME,
 )
-from .const import DOMAIN, EVENT_GENERAL, EVENT_ERROR
+from .const import DOMAIN, EVENT_BATCH, EVENT_GENERAL, EVENT_ERROR
 
 
 def async_describe_events(hass, async_describe_event):
     """Register Virgin Modem events for the Logbook (HA-version compatible)."""
 
-    def _fmt(event):
+    def _payload(event):
         # HA passes the whole event; payload lives under event["data"]
         data = {}
         if isinstance(event, dict):
@@ -21,6 +21,16 @@ def async_describe_events(hass, async_describe_event):
             # Some call sites may already pass the payload; handle that too
             if not data and ("message" in event or "time" in event or "priority" in event):
                 data = event
+        elif hasattr(event, "data"):
+            data = event.data or {}
+        return data
+
+    def _name(data):
+        host = str(data.get("host", "")).strip()
+        return f"Virgin Modem ({host})" if host else "Virgin Modem"
+
+    def _fmt(event):
+        data = _payload(event)
 
         pri = str(data.get("priority", "")).strip().upper() or "NOTICE"
         msg = str(data.get("message", "")).strip()
@@ -35,14 +45,36 @@ def async_describe_events(hass, async_describe_event):
             parts.append(f"({t})")
 
         return {
-            LOGBOOK_ENTRY_NAME: "Virgin Modem",
+            LOGBOOK_ENTRY_NAME: _name(data),
             LOGBOOK_ENTRY_MESSAGE: " ".join(parts) if parts else "Event",
         }
 
+    def _fmt_batch(event):
+        # One entry for a burst of non-error rows: count, worst severity and the newest
+        # row; error rows of the same poll have entries of their own
+        data = _payload(event)
+        events = data.get("events") or []
+        count = data.get("count") or len(events)
+        sev = str(data.get("severity", "")).strip().upper() or "NOTICE"
+        text = f"{count} new events (worst: {sev})"
+        if data.get("errors"):
+            text += f", plus {data['errors']} error(s) logged separately"
+        if events:
+            latest = events[-1]
+            text += f", latest: {str(latest.get('message', '')).strip()}"
+            if latest.get("time"):
+                text += f" ({str(latest['time']).strip()})"
+        return {
+            LOGBOOK_ENTRY_NAME: _name(data),
+            LOGBOOK_ENTRY_MESSAGE: text,
+        }
+
     # Prefer the modern 3-argument form. If HA is older, fall back to the 4-argument form.
     try:
         async_describe_event(DOMAIN, EVENT_GENERAL, _fmt)
         async_describe_event(DOMAIN, EVENT_ERROR, _fmt)
+        async_describe_event(DOMAIN, EVENT_BATCH, _fmt_batch)
     except TypeError:
         async_describe_event(DOMAIN, EVENT_GENERAL, "Virgin Modem event", _fmt)
         async_describe_event(DOMAIN, EVENT_ERROR, "Virgin Modem error", _fmt)
+        async_describe_event(DOMAIN, EVENT_BATCH, "Virgin Modem events", _fmt_batch)
@@ -0,0 +1,75 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/persist.py
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from homeassistant.helpers.storage import Store
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# At most one write per this many seconds, however fast the modem is polled;
+# Store also writes anything pending on HA shutdown
+SAVE_DELAY = 120
+
+
+class PersistedState:
+    """
+    Everything one modem must carry across a restart, in a single Store file.
+
+    Parts (the delta window, the last snapshot rows) register a dump/load pair
+    and call `schedule_save()` when they change. The first change starts the
+    SAVE_DELAY timer and later changes ride along with it, so an event storm
+    at a 30 s poll interval still costs one small write every two minutes, and
+    the parts are always written together (a restored snapshot never holds rows
+    the restored delta window doesn't know).
+    """
+
+    def __init__(self, store: Optional[Store] = None, delay: float = SAVE_DELAY) -> None:
+        self._store = store
+        self.delay = delay
+        self._parts: Dict[str, Tuple[Callable[[], Any], Callable[[Any], None]]] = {}
+        self._pending = False
+        self.writes = 0
+
+    def register(self, name: str, dump: Callable[[], Any], load: Callable[[Any], None]) -> None:
+        self._parts[name] = (dump, load)
+
+    async def async_load(self) -> None:
+        """Hand each part its saved data (nothing on the first run)."""
+        if self._store is None:
+            return
+        try:
+            data = await self._store.async_load()
+        except Exception:  # a corrupt cache must never block setup
+            _LOGGER.warning("Could not restore the saved modem state; starting fresh", exc_info=True)
+            data = None
+        if not isinstance(data, dict):
+            return
+
+        for name, (_, load) in self._parts.items():
+            part = data.get(name)
+            if isinstance(part, dict):
+                load(part)
+
+    def schedule_save(self) -> None:
+        """Something changed: make sure a write is coming (without pushing it back)."""
+        if self._store is None or self._pending:
+            return
+        self._pending = True
+        self._store.async_delay_save(self._data_to_save, self.delay)
+
+    async def async_flush(self) -> None:
+        """Write pending changes now (entry unload/reload) instead of waiting for the timer."""
+        if self._store is not None and self._pending:
+            await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        self._pending = False
+        self.writes += 1
+        return {name: dump() for name, (dump, _) in self._parts.items()}
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"writes": self.writes, "pending": self._pending, "save_delay_s": self.delay}
@@ -0,0 +1,52 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/polling.py
+from __future__ import annotations
+
+import random
+from datetime import timedelta
+
+# Multiplier applied per unchanged poll while backing off
+_GROWTH = 1.5
+# ± fraction of random jitter on adapted intervals so a fleet doesn't re-synchronise
+_JITTER = 0.1
+
+
+class AdaptiveInterval:
+    """
+    Poll-interval policy for one modem.
+
+    - Unchanged snapshot: stretch the interval (×1.5) up to `ceiling`.
+    - Changed snapshot, nothing alarming: return to the configured `base`.
+    - Error-class event or failed fetch: drop straight to `floor` (burst-poll).
+
+    At `base` the hub scheduler keeps the modem on its phase slot; any other
+    interval is jittered so modems that adapted together drift apart again.
+    """
+
+    __slots__ = ("base", "floor", "ceiling", "_seconds", "interval")
+
+    def __init__(self, base: float, floor: float, ceiling: float) -> None:
+        self.base = float(base)
+        self.floor = min(float(floor), self.base)
+        self.ceiling = max(float(ceiling), self.base)
+        self._seconds = self.base
+        self.interval = timedelta(seconds=self.base)
+
+    @property
+    def adapted(self) -> bool:
+        return self._seconds != self.base
+
+    def on_unchanged(self) -> None:
+        self._set(min(self.ceiling, max(self._seconds, self.floor) * _GROWTH))
+
+    def on_changed(self) -> None:
+        self._set(self.base)
+
+    def on_trouble(self) -> None:
+        self._set(self.floor)
+
+    def _set(self, seconds: float) -> None:
+        self._seconds = seconds
+        if seconds != self.base:
+            seconds *= random.uniform(1 - _JITTER, 1 + _JITTER)
+        self.interval = timedelta(seconds=seconds)
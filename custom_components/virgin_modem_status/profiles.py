@@ -0,0 +1,225 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/profiles.py
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from .channels import CHANNEL_COLUMNS, ChannelSample
+from .const import OID_MSG, OID_PRI, OID_TIME
+
+try:  # Home Assistant ships orjson; the stdlib parser is the fallback
+    from orjson import loads as _fast_loads
+except ImportError:
+    _fast_loads = None
+
+# (event rows, channel sample) – or None from parse() when the payload isn't this layout
+Parsed = Tuple[List[Dict[str, Any]], Optional[ChannelSample]]
+
+# Keys firmwares nest their event list under, and the wrappers around those
+_EVENT_LIST_KEYS = ("events", "EventLog", "docsis_events", "docsisLog", "log")
+_WRAPPER_KEYS = ("data", "status", "result")
+
+# Column OID (no trailing dot) → event field, and → channel column name
+_EVENT_FIELDS = {OID_TIME[:-1]: "time", OID_MSG[:-1]: "message", OID_PRI[:-1]: "priority"}
+_CHANNEL_BY_OID = {oid: name for name, (_, oid) in CHANNEL_COLUMNS.items()}
+
+
+def loads(raw: bytes) -> Any:
+    """Decode a JSON body straight from bytes (orjson when available)."""
+    return _fast_loads(raw) if _fast_loads is not None else json.loads(raw)
+
+
+class FirmwareProfile:
+    """
+    How one family of firmwares answers /getRouterStatus.
+
+    JSON profiles get the decoded body: `detect()` is a cheap structural check
+    and `parse()` returns the rows (possibly none – an empty log is still this
+    layout) or None when the payload doesn't have this layout at all, which
+    makes the API detect again. Markup profiles get the first chunk of page text
+    in `detect()` and name the html_parser row layout their table uses.
+
+    VirginApi remembers the profile that matched its host, so later polls go
+    straight to the right parser. Profiles are tried in descending `priority`.
+    """
+
+    name = "base"
+    label = ""
+    path = "json"        # parse path reported in the poll stats
+    markup = False
+    layout = "heuristic"  # html_parser.ROW_LAYOUTS entry (markup profiles)
+    priority = 0
+
+    def detect(self, data: Any) -> bool:
+        raise NotImplementedError
+
+    def parse(self, data: Any) -> Optional[Parsed]:
+        return None
+
+
+def split_oid_map(data: Dict[str, Any]) -> Parsed:
+    """
+    Event rows and channel sample from a flat OID map, in one pass over its keys:
+      1.3.6.1.2.1.69.1.5.8.1.2.<i> -> time
+      1.3.6.1.2.1.69.1.5.8.1.7.<i> -> message
+      1.3.6.1.2.1.69.1.5.8.1.5.<i> -> priority (optional)
+      <channel column OID>.<ifIndex> -> channel sample (see channels.py)
+    Each key costs one rpartition and a dict lookup, whatever else the firmware dumps.
+    """
+    rows: Dict[int, Dict[str, Any]] = {}
+    sample: ChannelSample = {}
+    for key, value in data.items():
+        head, _, idx = key.rpartition(".")
+        field = _EVENT_FIELDS.get(head)
+        if field is not None:
+            try:
+                rows.setdefault(int(idx), {})[field] = value
+            except ValueError:
+                pass
+            continue
+        name = _CHANNEL_BY_OID.get(head)
+        if name is not None:
+            try:
+                sample.setdefault(name, {})[int(idx)] = value
+            except ValueError:
+                pass
+
+    events: List[Dict[str, Any]] = []
+    for i in sorted(rows):
+        row = rows[i]
+        t = str(row.get("time", "")).strip()
+        m = str(row.get("message", "")).strip()
+        if not (t or m):
+            continue
+        events.append({"time": t, "message": m, "priority": str(row.get("priority", "")).strip()})
+    return events, sample or None
+
+
+def _norm_ev(x: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "time": x.get("time") or x.get("timestamp") or x.get("date") or x.get("datetime") or "",
+        "message": x.get("message") or x.get("text") or x.get("event") or "",
+        "priority": x.get("priority") or x.get("pri") or x.get("severity") or "",
+    }
+
+
+class OidMapProfile(FirmwareProfile):
+    """Hub 3 style: a flat `{OID: value}` dump of the docsDevEventTable and channel tables."""
+
+    name = "oid_map"
+    label = "Flat SNMP OID map"
+    path = "oid"
+    priority = 30
+
+    def detect(self, data: Any) -> bool:
+        if not isinstance(data, dict):
+            return False
+        # OID dumps are all OIDs; a handful of keys is enough to tell
+        for n, key in enumerate(data):
+            if isinstance(key, str) and key.startswith("1.3.6.1."):
+                return True
+            if n >= 8:
+                break
+        return False
+
+    def parse(self, data: Any) -> Optional[Parsed]:
+        if not isinstance(data, dict):
+            return None
+        return split_oid_map(data)
+
+
+class EventListProfile(FirmwareProfile):
+    """A JSON list of event objects, bare or under one of the usual keys."""
+
+    name = "event_list"
+    label = "JSON event list"
+    priority = 20
+
+    @staticmethod
+    def _rows(data: Any) -> Optional[List[Any]]:
+        if isinstance(data, list):
+            return data
+        if isinstance(data, dict):
+            for key in _EVENT_LIST_KEYS:
+                val = data.get(key)
+                if isinstance(val, list):
+                    return val
+        return None
+
+    def detect(self, data: Any) -> bool:
+        return self._rows(data) is not None
+
+    def parse(self, data: Any) -> Optional[Parsed]:
+        rows = self._rows(data)
+        if rows is None:
+            return None
+        return [_norm_ev(x) for x in rows if isinstance(x, dict)], None
+
+
+class WrappedProfile(FirmwareProfile):
+    """One of the other JSON layouts, wrapped in a `data` / `status` / `result` object."""
+
+    name = "wrapped"
+    label = "Wrapped JSON"
+    priority = 10
+
+    def detect(self, data: Any) -> bool:
+        return isinstance(data, dict) and any(
+            isinstance(data.get(key), (dict, list)) for key in _WRAPPER_KEYS
+        )
+
+    def parse(self, data: Any) -> Optional[Parsed]:
+        if not isinstance(data, dict):
+            return None
+        for key in _WRAPPER_KEYS:
+            sub = data.get(key)
+            if not isinstance(sub, (dict, list)):
+                continue
+            inner = detect_profile(sub, exclude=self)
+            parsed = inner.parse(sub) if inner is not None else None
+            if parsed is not None and parsed[0]:
+                return parsed
+        return None
+
+
+class HtmlTableProfile(FirmwareProfile):
+    """Any firmware serving its event log as an HTML table; the catch-all for markup."""
+
+    name = "html_table"
+    label = "HTML event table"
+    path = "html"
+    markup = True
+    priority = -100
+
+    def detect(self, data: Any) -> bool:
+        return True
+
+
+# Registry of known firmware profiles, kept in detection order. Supporting a new
+# firmware means registering a profile here (or from anywhere at import time).
+PROFILES: Dict[str, FirmwareProfile] = {}
+
+
+def register_profile(profile: FirmwareProfile) -> FirmwareProfile:
+    PROFILES[profile.name] = profile
+    ordered = sorted(PROFILES.values(), key=lambda p: -p.priority)
+    PROFILES.clear()
+    PROFILES.update((p.name, p) for p in ordered)
+    return profile
+
+
+def detect_profile(
+    data: Any, markup: bool = False, exclude: Optional[FirmwareProfile] = None
+) -> Optional[FirmwareProfile]:
+    """First registered profile of the given kind whose detector accepts `data`."""
+    for profile in PROFILES.values():
+        if profile.markup is markup and profile is not exclude and profile.detect(data):
+            return profile
+    return None
+
+
+register_profile(OidMapProfile())
+register_profile(EventListProfile())
+register_profile(WrappedProfile())
+GENERIC_HTML = register_profile(HtmlTableProfile())
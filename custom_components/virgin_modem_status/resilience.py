@@ -0,0 +1,118 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/resilience.py
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, Optional
+
+# Retry budget: each request earns RETRY_RATIO of a retry, capped at RETRY_MAX_TOKENS
+RETRY_RATIO = 0.2
+RETRY_MAX_TOKENS = 10.0
+
+# Circuit breaker
+BREAKER_THRESHOLD = 3       # consecutive failed polls before a host is marked down
+BREAKER_COOLDOWN = 30.0     # first skip period (seconds), doubled per failed probe
+BREAKER_MAX_COOLDOWN = 600.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 4.0) -> float:
+    """Exponential backoff with full jitter for retry `attempt` (1-based)."""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+
+class RetryBudget:
+    """
+    Token bucket bounding retries across every modem sharing it (the hub).
+
+    Each request deposits RETRY_RATIO tokens and each retry spends one, so
+    retries can never exceed ~20 % of traffic – a fleet of rebooting modems
+    degrades to single attempts instead of multiplying load.
+    """
+
+    __slots__ = ("ratio", "max_tokens", "tokens", "spent", "denied")
+
+    def __init__(self, ratio: float = RETRY_RATIO, max_tokens: float = RETRY_MAX_TOKENS) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens / 2
+        self.spent = 0
+        self.denied = 0
+
+    def on_request(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            self.spent += 1
+            return True
+        self.denied += 1
+        return False
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"tokens": round(self.tokens, 2), "retries": self.spent, "denied": self.denied}
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker. After BREAKER_THRESHOLD consecutive failed polls the host is
+    OPEN: polls fail immediately without touching the network until the cooldown
+    passes. Then one poll goes HALF_OPEN – a cheap probe decides whether to close
+    again or re-open with a doubled cooldown.
+    """
+
+    __slots__ = ("threshold", "cooldown", "max_cooldown", "state", "failures", "open_until",
+                 "_next_cooldown", "skipped")
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN,
+        max_cooldown: float = BREAKER_MAX_COOLDOWN,
+    ) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.open_until = 0.0
+        self._next_cooldown = cooldown
+        self.skipped = 0
+
+    def allow(self, now: float) -> bool:
+        """False while OPEN; moves to HALF_OPEN once the cooldown has passed."""
+        if self.state == OPEN:
+            if now < self.open_until:
+                self.skipped += 1
+                return False
+            self.state = HALF_OPEN
+        return True
+
+    def retry_in(self, now: float) -> float:
+        return max(0.0, self.open_until - now)
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._next_cooldown = self.cooldown
+
+    def record_failure(self, now: float) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.threshold:
+            self.state = OPEN
+            self.open_until = now + self._next_cooldown
+            self._next_cooldown = min(self.max_cooldown, self._next_cooldown * 2)
+
+    def as_dict(self, now: Optional[float] = None) -> Dict[str, Any]:
+        info: Dict[str, Any] = {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "skipped_polls": self.skipped,
+        }
+        if self.state == OPEN and now is not None:
+            info["retry_in_s"] = round(self.retry_in(now), 1)
+        return info
@@ -0,0 +1,212 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/scheduler.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from typing import Any, Dict, List, Optional
+
+from aiohttp import ClientSession, TCPConnector
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DOMAIN, HUB_KEEPALIVE_TIMEOUT, HUB_MAX_CONCURRENT
+from .coordinator import VirginCoordinator
+from .instrumentation import Histogram, trace_config
+from .resilience import RetryBudget
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Member:
+    """Scheduling state for one modem (one config entry)."""
+
+    __slots__ = ("key", "coordinator", "offset", "next_due", "task", "running")
+
+    def __init__(self, key: str, coordinator: VirginCoordinator, now: float) -> None:
+        self.key = key
+        self.coordinator = coordinator
+        self.offset = 0.0                 # phase within the interval, set by _rebalance()
+        self.next_due = now               # first poll straight away (off-slot)
+        self.task: Optional[asyncio.Task] = None
+        self.running = False              # task holds a concurrency slot (request under way)
+
+
+class VirginPollScheduler:
+    """
+    Hub-level poller shared by every Virgin modem entry.
+
+    One timer drives all coordinators: polls are phase-spread evenly across the
+    interval (so N modems never fire in a burst), at most `max_concurrent`
+    requests are in flight, and a dedicated keep-alive connector reuses one
+    connection per modem. Nothing here blocks setup – the first poll of a new
+    modem is simply queued. Retries of all modems draw on one shared budget.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_concurrent: int = HUB_MAX_CONCURRENT) -> None:
+        self.hass = hass
+        self.session = ClientSession(
+            connector=TCPConnector(
+                limit=max_concurrent,
+                limit_per_host=1,          # one keep-alive connection per modem
+                keepalive_timeout=HUB_KEEPALIVE_TIMEOUT,
+            ),
+            # DNS / connect timings per modem (see instrumentation.PollStats)
+            trace_configs=[trace_config()],
+        )
+        self._sem = asyncio.Semaphore(max_concurrent)
+        self.retry_budget = RetryBudget()
+        self._members: Dict[str, _Member] = {}
+        self._wakeup = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._epoch = hass.loop.time()
+        self._unsub_stop = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_on_stop)
+        # Counters for diagnostics
+        self.polls = 0
+        self.missed = 0
+        self.coalesced = 0
+        self.max_lag = 0.0
+        # Slot → poll start (queueing behind the concurrency cap included), seconds
+        self.lag = Histogram(1e-4, 600.0)
+
+    # ----------------- membership -----------------
+
+    @callback
+    def async_add(self, key: str, coordinator: VirginCoordinator) -> None:
+        """Start polling a coordinator (first poll is queued immediately)."""
+        self._members[key] = _Member(key, coordinator, self.hass.loop.time())
+        self._rebalance()
+        if self._runner is None or self._runner.done():
+            self._runner = self.hass.async_create_background_task(
+                self._async_run(), name=f"{DOMAIN} poll scheduler"
+            )
+        self._wakeup.set()
+
+    @callback
+    def async_remove(self, key: str) -> None:
+        """Stop polling a coordinator."""
+        member = self._members.pop(key, None)
+        if member and member.task and not member.task.done():
+            member.task.cancel()
+        self._rebalance()
+        self._wakeup.set()
+
+    @property
+    def empty(self) -> bool:
+        return not self._members
+
+    async def async_stop(self) -> None:
+        """Cancel the timer and release the shared connection pool."""
+        if self._unsub_stop:
+            self._unsub_stop()
+            self._unsub_stop = None
+        await self._async_shutdown()
+
+    async def _async_on_stop(self, _event: Event) -> None:
+        self._unsub_stop = None
+        await self._async_shutdown()
+
+    async def _async_shutdown(self) -> None:
+        for member in self._members.values():
+            if member.task and not member.task.done():
+                member.task.cancel()
+        if self._runner and not self._runner.done():
+            self._runner.cancel()
+        self._runner = None
+        if not self.session.closed:
+            await self.session.close()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Scheduler health for diagnostics."""
+        return {
+            "members": len(self._members),
+            "polls": self.polls,
+            "missed_intervals": self.missed,
+            "coalesced_polls": self.coalesced,
+            "max_lag_s": round(self.max_lag, 3),
+            "lag_ms": self.lag.as_dict(scale=1000, digits=1),
+            "retry_budget": self.retry_budget.as_dict(),
+        }
+
+    # ----------------- scheduling -----------------
+
+    def _rebalance(self) -> None:
+        """Spread members sharing an interval evenly across that interval."""
+        groups: Dict[float, List[_Member]] = {}
+        for member in self._members.values():
+            groups.setdefault(member.coordinator.base_interval.total_seconds(), []).append(member)
+        for interval, members in groups.items():
+            members.sort(key=lambda m: m.coordinator.api.host)
+            step = interval / len(members)
+            for i, member in enumerate(members):
+                member.offset = i * step
+
+    def _next_slot(self, member: _Member, now: float) -> float:
+        """
+        Next due time strictly after `now`: phase-aligned while the modem runs at its
+        base interval, otherwise simply `now + interval` (adapted intervals are jittered).
+        """
+        coord = member.coordinator
+        interval = coord.poll_interval.total_seconds()
+        if interval != coord.base_interval.total_seconds():
+            return now + interval
+        base = self._epoch + member.offset
+        return base + (math.floor((now - base) / interval) + 1) * interval
+
+    async def _async_run(self) -> None:
+        loop = self.hass.loop
+        while self._members:
+            self._wakeup.clear()
+            now = loop.time()
+            next_wake = math.inf
+            for member in list(self._members.values()):
+                if member.next_due > now:
+                    next_wake = min(next_wake, member.next_due)
+                    continue
+                if member.task is not None and not member.task.done():
+                    # Previous poll of this modem still pending: don't stack another. If it
+                    # hasn't started yet it will fetch after this slot anyway (coalesced);
+                    # if it is mid-request, this slot is genuinely missed.
+                    if member.running:
+                        self.missed += 1
+                    else:
+                        self.coalesced += 1
+                else:
+                    first = member.task is None
+                    member.task = self.hass.async_create_background_task(
+                        self._async_poll(member, member.next_due), name=f"{DOMAIN} poll {member.coordinator.api.host}"
+                    )
+                    if first:
+                        # The setup poll is an extra one: its slot is placed when it
+                        # completes, so a setup burst can't collide with the phase slots
+                        member.next_due = math.inf
+                        continue
+                member.next_due = self._next_slot(member, now)
+                next_wake = min(next_wake, member.next_due)
+
+            timeout = None if next_wake is math.inf else max(0.0, next_wake - loop.time())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _async_poll(self, member: _Member, due: float) -> None:
+        try:
+            async with self._sem:
+                lag = self.hass.loop.time() - due
+                self.lag.add(lag)
+                self.max_lag = max(self.max_lag, lag)
+                self.polls += 1
+                member.running = True
+                try:
+                    await member.coordinator.async_refresh()
+                finally:
+                    member.running = False
+        finally:
+            # The poll may have adapted the interval – re-place the next one from here
+            # (always: the setup poll's next slot depends on it)
+            if self._members.get(member.key) is member:
+                member.next_due = self._next_slot(member, self.hass.loop.time())
+                self._wakeup.set()
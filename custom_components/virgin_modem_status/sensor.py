@@ -1,30 +1,38 @@
 """Virgin Modem Status – Home Assistant custom integration."""
 # custom_components/virgin_modem_status/sensor.py
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, EVENT_MSG_OIDS, EVENT_TIME_OIDS
+from .attributes import BULKY_ATTRIBUTES
+from .channels import DOWNSTREAM, UPSTREAM, ChannelBank
+from .const import DOMAIN, SEVERITIES
 from .coordinator import VirginCoordinator
+from .events import EventTable
 from .entity import VirginEntity
+from .instrumentation import STAGES
 
+# Only the (polling) poll-stage diagnostic sensors use this; everything else is pushed
+SCAN_INTERVAL = timedelta(minutes=5)
 
-def _latest_present(raw: Dict[str, Any], oids: List[str]) -> Optional[str]:
-    """Return the last non-empty value among the given OIDs from a raw dict."""
-    vals = [raw.get(oid) for oid in oids if raw.get(oid)]
-    return vals[-1] if vals else None
 
-
-def _get_raw_snapshot(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Coordinator now nests OIDs under 'raw'. Fall back to top-level if needed."""
+def _event_table(data: Dict[str, Any]) -> Optional[EventTable]:
+    """The parsed event table the coordinator attached to its snapshot (if any)."""
     if not isinstance(data, dict):
-        return {}
-    raw = data.get("raw")
-    return raw if isinstance(raw, dict) else data
+        return None
+    table = data.get("table")
+    return table if isinstance(table, EventTable) else None
+
+
+def _severity_stats(data: Dict[str, Any]) -> Dict[str, Any]:
+    stats = data.get("severity_stats") if isinstance(data, dict) else None
+    return stats if isinstance(stats, dict) else {}
 
 
 async def async_setup_entry(
@@ -37,14 +45,38 @@ async def async_setup_entry(
         [
             VirginLastEventSensor(coord, entry),
             VirginLastEventTimeSensor(coord, entry),
-        ],
-        True,
+            *(VirginSeverityCountSensor(coord, entry, sev) for sev in SEVERITIES),
+            VirginEventRateSensor(coord, entry),
+            *(VirginCodewordSensor(coord, entry, kind) for kind in ("corrected", "uncorrected")),
+            *(VirginPollStageSensor(coord, entry, stage) for stage in STAGES),
+        ]
     )
 
+    # Per-channel sensors appear as the modem reports channels (bonding groups change)
+    added: Dict[str, int] = {}
+
+    @callback
+    def _async_add_channel_sensors() -> None:
+        new: list = []
+        for bank in (coord.channels.downstream, coord.channels.upstream):
+            start = added.get(bank.direction, 0)
+            for slot in range(start, len(bank)):
+                new.extend(
+                    VirginChannelSensor(coord, entry, bank, slot, metric)
+                    for metric in _CHANNEL_METRICS[bank.direction]
+                )
+            added[bank.direction] = len(bank)
+        if new:
+            async_add_entities(new)
+
+    _async_add_channel_sensors()
+    entry.async_on_unload(coord.async_add_listener(_async_add_channel_sensors))
+
 
 class VirginLastEventSensor(VirginEntity, SensorEntity):
     """Shows the latest DOCSIS event message."""
     _attr_name = "Last DOCSIS Event"
+    _unrecorded_attributes = BULKY_ATTRIBUTES
     _attr_icon = "mdi:information"
 
     def __init__(self, coordinator: VirginCoordinator, entry: ConfigEntry) -> None:
@@ -58,26 +90,23 @@ class VirginLastEventSensor(VirginEntity, SensorEntity):
         msg = d.get("last_event_message")
         if msg:
             return str(msg)
-        # Fallback: read from raw OID map
-        raw = _get_raw_snapshot(d)
-        return _latest_present(raw, EVENT_MSG_OIDS)
+        # Fallback: newest non-empty message in the table
+        table = _event_table(d)
+        if table is None:
+            return None
+        return next((r.message for r in reversed(table.rows) if r.message), None)
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
-        d = self.coordinator.data or {}
-        raw = _get_raw_snapshot(d)
-        return {
-            "status": d.get("status"),
-            "priority": d.get("last_event_priority"),
-            "index": d.get("last_event_index"),
-            "messages": {oid: raw.get(oid) for oid in EVENT_MSG_OIDS if raw.get(oid)},
-            "times": {oid: raw.get(oid) for oid in EVENT_TIME_OIDS if raw.get(oid)},
-        }
+        # Same cached dict for both last-event sensors, rebuilt once per snapshot
+        return self.coordinator.attributes.get(self.coordinator.data)
 
 
 class VirginLastEventTimeSensor(VirginEntity, SensorEntity):
-    """Shows the timestamp of the latest DOCSIS event."""
+    """Shows the timestamp of the latest DOCSIS event (unknown until the modem has ToD sync)."""
     _attr_name = "Last DOCSIS Event Time"
+    _unrecorded_attributes = BULKY_ATTRIBUTES
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
     _attr_icon = "mdi:clock-outline"
 
     def __init__(self, coordinator: VirginCoordinator, entry: ConfigEntry) -> None:
@@ -85,24 +114,172 @@ class VirginLastEventTimeSensor(VirginEntity, SensorEntity):
         self._attr_unique_id = f"{entry.entry_id}_last_event_time"
 
     @property
-    def native_value(self) -> Optional[str]:
+    def native_value(self) -> Optional[datetime]:
         d = self.coordinator.data or {}
-        # Preferred value computed by coordinator (if present)
-        t = d.get("last_event_time")
-        if t:
-            return str(t)
-        # Fallback: read from raw OID map
-        raw = _get_raw_snapshot(d)
-        return _latest_present(raw, EVENT_TIME_OIDS)
+        # Parsed, timezone-aware time of the row the coordinator picked as latest
+        when = d.get("last_event_timestamp")
+        return when if isinstance(when, datetime) else None
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
-        d = self.coordinator.data or {}
-        raw = _get_raw_snapshot(d)
-        return {
-            "status": d.get("status"),
-            "priority": d.get("last_event_priority"),
-            "index": d.get("last_event_index"),
-            "messages": {oid: raw.get(oid) for oid in EVENT_MSG_OIDS if raw.get(oid)},
-            "times": {oid: raw.get(oid) for oid in EVENT_TIME_OIDS if raw.get(oid)},
-        }
+        # Same cached dict for both last-event sensors, rebuilt once per snapshot
+        return self.coordinator.attributes.get(self.coordinator.data)
+
+
+class VirginSeverityCountSensor(VirginEntity, SensorEntity):
+    """How many rows of the modem's current event table have a given severity."""
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "events"
+
+    _ICONS = {"critical": "mdi:alert-octagon", "warning": "mdi:alert", "notice": "mdi:information-outline"}
+
+    def __init__(self, coordinator: VirginCoordinator, entry: ConfigEntry, severity: str) -> None:
+        super().__init__(coordinator, entry)
+        self._severity = severity
+        self._attr_name = f"{severity.capitalize()} Events"
+        self._attr_icon = self._ICONS.get(severity, "mdi:counter")
+        self._attr_unique_id = f"{entry.entry_id}_{severity}_count"
+
+    @property
+    def native_value(self) -> Optional[int]:
+        counts = _severity_stats(self.coordinator.data or {}).get("counts")
+        return counts.get(self._severity, 0) if counts else None
+
+
+class VirginEventRateSensor(VirginEntity, SensorEntity):
+    """New DOCSIS events per hour (rolling one-hour window)."""
+    _attr_name = "DOCSIS Event Rate"
+    _attr_icon = "mdi:chart-line"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "events/h"
+
+    def __init__(self, coordinator: VirginCoordinator, entry: ConfigEntry) -> None:
+        super().__init__(coordinator, entry)
+        self._attr_unique_id = f"{entry.entry_id}_event_rate"
+
+    @property
+    def native_value(self) -> Optional[float]:
+        return _severity_stats(self.coordinator.data or {}).get("rate_per_hour")
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        return {"by_severity": _severity_stats(self.coordinator.data or {}).get("rates", {})}
+
+
+class VirginCodewordSensor(VirginEntity, SensorEntity):
+    """Codewords (all downstream channels) corrected / uncorrectable since the previous poll."""
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "codewords"
+    _attr_icon = "mdi:alert-decagram-outline"
+
+    def __init__(self, coordinator: VirginCoordinator, entry: ConfigEntry, kind: str) -> None:
+        super().__init__(coordinator, entry)
+        self._key = f"{kind}_delta"
+        self._attr_name = f"{kind.capitalize()} Codewords"
+        self._attr_unique_id = f"{entry.entry_id}_{kind}_codewords"
+
+    @property
+    def native_value(self) -> Optional[float]:
+        summary = (self.coordinator.data or {}).get("channels") or {}
+        return summary.get(self._key) if summary.get("downstream") else None
+
+
+# metric key → (name suffix, unit, state class, enabled by default)
+_CHANNEL_METRICS: Dict[str, tuple] = {
+    DOWNSTREAM: (
+        ("power", "Power", "dBmV", SensorStateClass.MEASUREMENT, True),
+        ("snr", "SNR", "dB", SensorStateClass.MEASUREMENT, True),
+        ("corrected", "Corrected", "codewords", SensorStateClass.TOTAL_INCREASING, False),
+        ("uncorrected", "Uncorrectable", "codewords", SensorStateClass.TOTAL_INCREASING, False),
+    ),
+    UPSTREAM: (
+        ("power", "Power", "dBmV", SensorStateClass.MEASUREMENT, True),
+    ),
+}
+
+
+class VirginChannelSensor(VirginEntity, SensorEntity):
+    """
+    One metric of one DOCSIS channel. Reads its fixed slot in the channel bank,
+    so a state read is an array index, not a search.
+    """
+    _attr_icon = "mdi:sine-wave"
+
+    def __init__(
+        self,
+        coordinator: VirginCoordinator,
+        entry: ConfigEntry,
+        bank: ChannelBank,
+        slot: int,
+        metric: tuple,
+    ) -> None:
+        super().__init__(coordinator, entry)
+        key, label, unit, state_class, enabled = metric
+        self._bank = bank
+        self._slot = slot
+        self._key = key
+        prefix = "DS" if bank.direction == DOWNSTREAM else "US"
+        channel = bank.channel_id[slot] or bank.ifindex[slot]
+        self._attr_name = f"{prefix} {channel} {label}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+        self._attr_entity_registry_enabled_default = enabled
+        # ifIndex is stable across channel re-assignments; the channel id is only cosmetic
+        self._attr_unique_id = f"{entry.entry_id}_{bank.direction}_{bank.ifindex[slot]}_{key}"
+
+    @property
+    def native_value(self) -> Optional[float]:
+        return self._bank.value(self._slot, self._key)
+
+    @property
+    def available(self) -> bool:
+        return super().available and self._bank.value(self._slot, self._key) is not None
+
+
+_STAGE_NAMES = {
+    "dns": "DNS Lookup",
+    "connect": "Connect",
+    "ttfb": "Time to First Byte",
+    "download": "Download",
+    "parse": "Parse",
+    "parse_inline": "Parse (Inline)",
+    "parse_executor": "Parse (Executor)",
+    "fetch": "Fetch",
+    "shape": "Processing",
+    "fanout": "Entity Updates",
+}
+
+
+class VirginPollStageSensor(VirginEntity, SensorEntity):
+    """
+    95th-percentile duration of one poll stage (p50/p99/max as attributes).
+    Diagnostic and disabled by default. Polled every SCAN_INTERVAL rather than
+    pushed, so it keeps moving while the modem's snapshot doesn't.
+    """
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, coordinator: VirginCoordinator, entry: ConfigEntry, stage: str) -> None:
+        super().__init__(coordinator, entry)
+        self._stage = stage
+        self._attr_name = f"Poll {_STAGE_NAMES[stage]} p95"
+        self._attr_unique_id = f"{entry.entry_id}_poll_{stage}_p95"
+
+    @property
+    def should_poll(self) -> bool:
+        return True
+
+    async def async_update(self) -> None:
+        """Nothing to fetch: the value is read from the live histograms on each write."""
+
+    @property
+    def native_value(self) -> Optional[float]:
+        return self.coordinator.api.stats.percentile_ms(self._stage, 0.95)
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        return self.coordinator.api.stats.stage_dict(self._stage)
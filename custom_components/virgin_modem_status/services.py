@@ -0,0 +1,61 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/services.py
+from __future__ import annotations
+
+import time
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import DOMAIN, SERVICE_QUERY_HISTORY
+from .coordinator import VirginCoordinator
+
+QUERY_HISTORY_SCHEMA = vol.Schema({
+    vol.Optional("config_entry_id"): cv.string,
+    vol.Optional("days", default=7): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional("severity"): vol.In(["critical", "warning", "notice"]),
+    vol.Optional("keyword"): cv.string,
+    vol.Optional("limit", default=100): vol.All(vol.Coerce(int), vol.Range(min=1, max=5000)),
+})
+
+
+def _resolve_coordinator(hass: HomeAssistant, entry_id: str | None) -> VirginCoordinator:
+    coordinators = hass.data.get(DOMAIN, {})
+    if entry_id:
+        coord = coordinators.get(entry_id)
+        if coord is None:
+            raise HomeAssistantError(f"No Virgin modem is loaded for config entry {entry_id}")
+        return coord
+    if len(coordinators) != 1:
+        raise HomeAssistantError("Several Virgin modems are configured; pass config_entry_id")
+    return next(iter(coordinators.values()))
+
+
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register integration-wide services (idempotent)."""
+    if hass.services.has_service(DOMAIN, SERVICE_QUERY_HISTORY):
+        return
+
+    async def _async_query_history(call: ServiceCall) -> ServiceResponse:
+        coord = _resolve_coordinator(hass, call.data.get("config_entry_id"))
+        if coord.history is None:
+            raise HomeAssistantError("Event history is not available for this modem")
+        since = time.time() - call.data["days"] * 86400
+        return await hass.async_add_executor_job(
+            coord.history.query,
+            since,
+            call.data.get("severity"),
+            call.data.get("keyword"),
+            call.data["limit"],
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_HISTORY,
+        _async_query_history,
+        schema=QUERY_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
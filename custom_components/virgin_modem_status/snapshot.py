@@ -0,0 +1,43 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/snapshot.py
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional
+
+
+class SnapshotCache:
+    """
+    The modem's last fetched event rows, persisted so that after a restart the
+    entities start from last-known state instead of "unknown" while the first
+    poll of a slow or rebooting modem is still outstanding.
+
+    Only the raw rows are kept (everything else is re-derived from them), and
+    `on_change` (see persist.PersistedState) fires only when the API hands over
+    a different row list.
+    """
+
+    def __init__(self, on_change: Optional[Callable[[], None]] = None) -> None:
+        self._on_change = on_change
+        self.events: Optional[List[Dict[str, Any]]] = None
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Rows saved by a previous run (malformed entries are dropped)."""
+        events = data.get("events")
+        if not isinstance(events, list):
+            return
+        self.events = [
+            {"time": str(e.get("time", "")), "message": str(e.get("message", "")),
+             "priority": str(e.get("priority", ""))}
+            for e in events if isinstance(e, dict)
+        ] or None
+
+    def update(self, events: Optional[List[Dict[str, Any]]]) -> None:
+        """Remember the API's current rows; asks for a save only if they changed."""
+        if events is self.events or events is None:
+            return
+        self.events = events
+        if self._on_change is not None:
+            self._on_change()
+
+    def dump(self) -> Dict[str, Any]:
+        return {"events": self.events or []}
@@ -0,0 +1,368 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/snmp.py
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .const import DEFAULT_COMMUNITY, DEFAULT_PORT
+
+_LOGGER = logging.getLogger(__name__)
+
+Oid = Tuple[int, ...]
+
+# --- BER tags (SNMPv2c subset) ---
+_INTEGER = 0x02
+_OCTET_STRING = 0x04
+_NULL = 0x05
+_OBJECT_ID = 0x06
+_SEQUENCE = 0x30
+_IP_ADDRESS = 0x40
+_COUNTER32 = 0x41
+_GAUGE32 = 0x42
+_TIMETICKS = 0x43
+_COUNTER64 = 0x46
+_NO_SUCH_OBJECT = 0x80
+_NO_SUCH_INSTANCE = 0x81
+_END_OF_MIB_VIEW = 0x82
+_GET_BULK = 0xA5
+_RESPONSE = 0xA2
+
+_VERSION_2C = 1
+_ERR_TOO_BIG = 1
+_MAX_ROUNDS = 16          # GETBULK round trips per walk before giving up (runaway agents)
+
+
+class SnmpError(Exception):
+    """Raised when an SNMP exchange fails (timeout, agent error, malformed reply)."""
+
+
+class SnmpTimeout(SnmpError):
+    """Raised when the agent never answered (every retry timed out)."""
+
+
+class EndOfMib:
+    """Marker for noSuchObject / noSuchInstance / endOfMibView varbind values."""
+
+    __slots__ = ("tag",)
+
+    def __init__(self, tag: int) -> None:
+        self.tag = tag
+
+    def __repr__(self) -> str:
+        return f"EndOfMib(0x{self.tag:02x})"
+
+
+# ----------------- BER encoding -----------------
+
+def _len(n: int) -> bytes:
+    if n < 0x80:
+        return bytes((n,))
+    raw = n.to_bytes((n.bit_length() + 7) // 8, "big")
+    return bytes((0x80 | len(raw),)) + raw
+
+
+def _tlv(tag: int, payload: bytes) -> bytes:
+    return bytes((tag,)) + _len(len(payload)) + payload
+
+
+def _int(value: int) -> bytes:
+    return _tlv(_INTEGER, value.to_bytes(value.bit_length() // 8 + 1, "big", signed=True))
+
+
+def _oid(oid: Oid) -> bytes:
+    arcs = [oid[0] * 40 + oid[1], *oid[2:]]
+    out = bytearray()
+    for arc in arcs:
+        chunk = [arc & 0x7F]
+        arc >>= 7
+        while arc:
+            chunk.append(0x80 | (arc & 0x7F))
+            arc >>= 7
+        out += bytes(reversed(chunk))
+    return _tlv(_OBJECT_ID, bytes(out))
+
+
+def encode_get_bulk(
+    community: str, request_id: int, oids: Sequence[Oid], max_repetitions: int
+) -> bytes:
+    """One SNMPv2c GetBulkRequest message (non-repeaters = 0)."""
+    varbinds = b"".join(_tlv(_SEQUENCE, _oid(o) + _tlv(_NULL, b"")) for o in oids)
+    pdu = _tlv(
+        _GET_BULK,
+        _int(request_id) + _int(0) + _int(max_repetitions) + _tlv(_SEQUENCE, varbinds),
+    )
+    return _tlv(_SEQUENCE, _int(_VERSION_2C) + _tlv(_OCTET_STRING, community.encode()) + pdu)
+
+
+# ----------------- BER decoding -----------------
+
+def _read(buf: bytes, pos: int) -> Tuple[int, int, int]:
+    """Return (tag, value start, value end) of the TLV at `pos`."""
+    try:
+        tag = buf[pos]
+        length = buf[pos + 1]
+        pos += 2
+        if length & 0x80:
+            n = length & 0x7F
+            length = int.from_bytes(buf[pos:pos + n], "big")
+            pos += n
+    except IndexError as exc:
+        raise SnmpError("Truncated SNMP message") from exc
+    end = pos + length
+    if end > len(buf):
+        raise SnmpError("Truncated SNMP message")
+    return tag, pos, end
+
+
+def _expect(buf: bytes, pos: int, tag: int) -> Tuple[int, int]:
+    got, start, end = _read(buf, pos)
+    if got != tag:
+        raise SnmpError(f"Unexpected BER tag 0x{got:02x} (wanted 0x{tag:02x})")
+    return start, end
+
+
+def _decode_oid(raw: bytes) -> Oid:
+    if not raw:
+        return ()
+    arcs: List[int] = []
+    value = 0
+    for byte in raw:
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            arcs.append(value)
+            value = 0
+    first = arcs[0]
+    head = (0, first) if first < 40 else (1, first - 40) if first < 80 else (2, first - 80)
+    return head + tuple(arcs[1:])
+
+
+def _decode_value(tag: int, raw: bytes) -> Any:
+    if tag == _INTEGER:
+        return int.from_bytes(raw, "big", signed=True)
+    if tag in (_OCTET_STRING, _IP_ADDRESS):
+        return raw
+    if tag in (_COUNTER32, _GAUGE32, _TIMETICKS, _COUNTER64):
+        return int.from_bytes(raw, "big", signed=False)
+    if tag == _OBJECT_ID:
+        return _decode_oid(raw)
+    if tag in (_NO_SUCH_OBJECT, _NO_SUCH_INSTANCE, _END_OF_MIB_VIEW):
+        return EndOfMib(tag)
+    return None  # NULL and anything exotic
+
+
+def decode_response(buf: bytes) -> Tuple[int, int, int, List[Tuple[Oid, Any]]]:
+    """Decode a Response PDU into (request_id, error_status, error_index, varbinds)."""
+    start, end = _expect(buf, 0, _SEQUENCE)
+    _, pos = _expect(buf, start, _INTEGER)                 # version
+    _, pos = _expect(buf, pos, _OCTET_STRING)              # community
+    pos, end = _expect(buf, pos, _RESPONSE)
+    values: List[int] = []
+    for _ in range(3):                                     # request-id, error-status, error-index
+        s, pos = _expect(buf, pos, _INTEGER)
+        values.append(int.from_bytes(buf[s:pos], "big", signed=True))
+    pos, end = _expect(buf, pos, _SEQUENCE)
+    varbinds: List[Tuple[Oid, Any]] = []
+    while pos < end:
+        vb_start, vb_end = _expect(buf, pos, _SEQUENCE)
+        oid_start, oid_end = _expect(buf, vb_start, _OBJECT_ID)
+        tag, val_start, val_end = _read(buf, oid_end)
+        varbinds.append((_decode_oid(buf[oid_start:oid_end]), _decode_value(tag, buf[val_start:val_end])))
+        pos = vb_end
+    return values[0], values[1], values[2], varbinds
+
+
+def parse_oid(text: str) -> Oid:
+    return tuple(int(x) for x in text.strip(".").split("."))
+
+
+# ----------------- transport -----------------
+
+class _SnmpProtocol(asyncio.DatagramProtocol):
+    """Delivers the reply matching the one outstanding request id."""
+
+    def __init__(self) -> None:
+        self.request_id = -1
+        self.future: Optional[asyncio.Future] = None
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        if self.future is None or self.future.done():
+            return
+        try:
+            reply = decode_response(data)
+        except SnmpError as exc:
+            _LOGGER.debug("VirginSnmp: ignoring malformed datagram from %s: %s", addr, exc)
+            return
+        if reply[0] == self.request_id:    # late replies to earlier retries are dropped
+            self.future.set_result((reply, len(data)))
+
+    def error_received(self, exc: Exception) -> None:
+        if self.future is not None and not self.future.done():
+            self.future.set_exception(SnmpError(f"SNMP socket error: {exc}"))
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if self.future is not None and not self.future.done():
+            self.future.set_exception(SnmpError("SNMP socket closed"))
+
+
+class SnmpClient:
+    """
+    Minimal asyncio SNMP v2c client – just enough to walk table columns with GETBULK.
+
+    Several columns are walked side by side: every round trip asks for the next
+    `max_repetitions` rows of each column still in its subtree, so a 20-row table
+    with a handful of columns comes back in one or two exchanges. No dependency
+    on pysnmp; BER is encoded and decoded by hand.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = DEFAULT_PORT,
+        community: str = DEFAULT_COMMUNITY,
+        timeout: float = 3.0,
+        retries: int = 1,
+        max_repetitions: int = 25,
+    ) -> None:
+        self.host = host
+        self.port = int(port)
+        self.community = community
+        self.timeout = timeout
+        self.retries = retries
+        self.max_repetitions = max_repetitions
+        self._ids = itertools.count(random.randint(1, 0x3FFFFFFF))
+        self.round_trips = 0         # of the last walk
+        self.bytes_received = 0      # of the last walk
+
+    async def walk_columns(self, columns: Sequence[Oid]) -> Dict[Oid, Dict[Oid, Any]]:
+        """
+        Walk each column subtree; returns {column: {row suffix: value}}.
+        Raises SnmpError on timeout, agent error or a malformed reply.
+        """
+        transport, protocol = await self._open()
+        result: Dict[Oid, Dict[Oid, Any]] = {c: {} for c in columns}
+        cursor: Dict[Oid, Oid] = {c: c for c in columns}
+        active: List[Oid] = list(columns)
+        reps = self.max_repetitions
+        self.round_trips = self.bytes_received = 0
+        try:
+            while active:
+                if self.round_trips >= _MAX_ROUNDS:
+                    _LOGGER.debug("VirginSnmp: %s walk stopped after %d rounds", self.host, _MAX_ROUNDS)
+                    break
+                (_, status, _, varbinds), size = await self._exchange(
+                    transport, protocol, [cursor[c] for c in active], reps
+                )
+                self.round_trips += 1
+                self.bytes_received += size
+                if status == _ERR_TOO_BIG and reps > 1:
+                    reps = max(1, reps // 2)        # agent can't fit the reply: ask for fewer rows
+                    continue
+                if status:
+                    raise SnmpError(f"SNMP agent returned error-status {status}")
+                if not varbinds:
+                    break
+                done: set[Oid] = set()
+                width = len(active)
+                for i, (oid, value) in enumerate(varbinds):
+                    column = active[i % width]
+                    if column in done:
+                        continue
+                    if (
+                        isinstance(value, EndOfMib)
+                        or oid[:len(column)] != column
+                        or oid <= cursor[column]           # non-increasing: broken agent
+                    ):
+                        done.add(column)
+                        continue
+                    result[column][oid[len(column):]] = value
+                    cursor[column] = oid
+                active = [c for c in active if c not in done]
+        finally:
+            transport.close()
+        return result
+
+    async def probe(self, column: Oid) -> None:
+        """
+        One GETBULK round trip asking for a single row – proves the agent answers
+        with this community without walking anything. Raises SnmpError.
+        """
+        transport, protocol = await self._open()
+        try:
+            (_, status, _, _), _ = await self._exchange(transport, protocol, [column], 1)
+        finally:
+            transport.close()
+        if status:
+            raise SnmpError(f"SNMP agent returned error-status {status}")
+
+    async def _open(self) -> Tuple[Any, _SnmpProtocol]:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.create_datagram_endpoint(
+                _SnmpProtocol, remote_addr=(self.host, self.port)
+            )
+        except OSError as exc:
+            raise SnmpError(f"Cannot open SNMP socket to {self.host}:{self.port}: {exc}") from exc
+
+    async def _exchange(
+        self, transport: Any, protocol: _SnmpProtocol, oids: List[Oid], reps: int
+    ) -> Tuple[Tuple[int, int, int, List[Tuple[Oid, Any]]], int]:
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retries + 1):
+            request_id = next(self._ids) & 0x7FFFFFFF
+            protocol.request_id = request_id
+            protocol.future = loop.create_future()
+            transport.sendto(encode_get_bulk(self.community, request_id, oids, reps))
+            try:
+                return await asyncio.wait_for(protocol.future, self.timeout)
+            except asyncio.TimeoutError:
+                _LOGGER.debug(
+                    "VirginSnmp: %s:%d timed out (attempt %d/%d)",
+                    self.host, self.port, attempt + 1, self.retries + 1,
+                )
+        raise SnmpTimeout(f"SNMP request to {self.host}:{self.port} timed out")
+
+
+# ----------------- docsDevEventTable -----------------
+
+# docsDevEvLevel enumeration (DOCS-CABLE-DEVICE-MIB)
+_EV_LEVELS = {
+    1: "emergency", 2: "alert", 3: "critical", 4: "error",
+    5: "warning", 6: "notice", 7: "information", 8: "debug",
+}
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace").strip("\x00 ").strip()
+    return "" if value is None or isinstance(value, EndOfMib) else str(value)
+
+
+def _date_and_time(value: Any) -> str:
+    """SNMPv2-TC DateAndTime (8 or 11 octets) → 'YYYY-MM-DD HH:MM:SS'; display strings pass through."""
+    if isinstance(value, bytes) and len(value) in (8, 11):
+        year = int.from_bytes(value[0:2], "big")
+        month, day, hour, minute, second = value[2], value[3], value[4], value[5], value[6]
+        if 1 <= month <= 12 and 1 <= day <= 31 and hour < 24 and minute < 60 and second < 61:
+            return f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}"
+    return _text(value)
+
+
+def event_rows(
+    columns: Dict[Oid, Dict[Oid, Any]], time_col: Oid, level_col: Oid, text_col: Oid
+) -> List[Dict[str, Any]]:
+    """Join walked docsDevEvent columns into normalised event dicts, ordered by docsDevEvIndex."""
+    times, levels, texts = columns.get(time_col, {}), columns.get(level_col, {}), columns.get(text_col, {})
+    events: List[Dict[str, Any]] = []
+    for idx in sorted(set(times) | set(texts)):
+        time_s = _date_and_time(times.get(idx))
+        message = _text(texts.get(idx))
+        if not (time_s or message):
+            continue
+        level = levels.get(idx)
+        priority = _EV_LEVELS.get(level, str(level)) if isinstance(level, int) else _text(level)
+        events.append({"time": time_s, "message": message, "priority": priority})
+    return events
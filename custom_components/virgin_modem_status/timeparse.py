@@ -0,0 +1,167 @@
+"""Virgin Modem Status – Home Assistant custom integration."""
+# custom_components/virgin_modem_status/timeparse.py
+from __future__ import annotations
+
+import re
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from .events import EventRow, EventTable
+
+# Firmware time formats we know about
+FMT_ISO = "iso"        # 2025-01-02 03:04:05 (also with "T")
+FMT_DMY = "dmy"        # 2/1/25 03:04:05 (UK firmwares)
+FMT_MDY = "mdy"        # 1/2/25 03:04:05
+FMT_CTIME = "ctime"    # Thu Jan 02 03:04:05 2025
+
+_ISO = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})[ T](\d{1,2}):(\d{2})(?::(\d{2}))?")
+_SLASH = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})\s+(\d{1,2}):(\d{2})(?::(\d{2}))?")
+_CTIME = re.compile(r"[A-Za-z]{3}\s+([A-Za-z]{3})\s+(\d{1,2})\s+(\d{1,2}):(\d{2}):(\d{2})\s+(\d{4})")
+_MONTHS = {m: i for i, m in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1
+)}
+
+# Rows logged before the modem got Time-of-Day from the CMTS carry epoch-based
+# times (1970-01-01 + uptime). Anything before this year is treated as unsynced.
+_MIN_SYNCED_YEAR = 2000
+_CACHE_SIZE = 256
+
+
+class TimestampParser:
+    """
+    Turns one modem's event-time strings into timezone-aware datetimes.
+
+    The format is detected from the modem's own rows and then locked, so every
+    later string takes a single specialised regex match plus int() conversions
+    (no strptime, no format guessing). D/M vs M/D is decided by the first row
+    with a component above 12; until then `day_first` is assumed and detection
+    stays open. Results are LRU-cached – a table mostly repeats last poll's strings.
+
+    Pre-ToD-sync rows (1970…) and unparseable strings yield None.
+    """
+
+    def __init__(self, tz: tzinfo, day_first: bool = True) -> None:
+        self.tz = tz
+        self.day_first = day_first
+        self.format: Optional[str] = None
+        self.locked = False
+        self._parse = lru_cache(maxsize=_CACHE_SIZE)(self._parse_uncached)
+
+    # ----------------- detection -----------------
+
+    def detect(self, samples: Iterable[str]) -> Optional[str]:
+        """Pick (and, when unambiguous, lock) the format from a batch of time strings."""
+        if self.locked:
+            return self.format
+        found: Optional[str] = None
+        for text in samples:
+            text = (text or "").strip()
+            if not text:
+                continue
+            if _ISO.match(text):
+                found, self.locked = FMT_ISO, True
+                break
+            if _CTIME.match(text):
+                found, self.locked = FMT_CTIME, True
+                break
+            m = _SLASH.match(text)
+            if m:
+                first, second = int(m.group(1)), int(m.group(2))
+                if first > 12:
+                    found, self.locked = FMT_DMY, True
+                    break
+                if second > 12:
+                    found, self.locked = FMT_MDY, True
+                    break
+                found = FMT_DMY if self.day_first else FMT_MDY
+        if found is not None and found != self.format:
+            self.format = found
+            self._parse.cache_clear()
+        return self.format
+
+    # ----------------- parsing -----------------
+
+    def parse(self, text: str) -> Optional[datetime]:
+        """Aware datetime for a firmware time string, or None (unsynced/unknown)."""
+        return self._parse((text or "").strip()) if text else None
+
+    def stamp(self, table: EventTable) -> Optional[EventRow]:
+        """
+        Set `row.when` on every row and return the newest row.
+
+        Tables are normally oldest → newest by index (EventTable.latest), but when
+        the synced timestamps run the other way the firmware lists newest first,
+        and the first row with content is the latest one.
+        """
+        if not self.locked:
+            self.detect(r.time for r in table.rows)
+        synced = []
+        for row in table.rows:
+            row.when = self.parse(row.time)
+            if row.when is not None:
+                synced.append(row)
+        if len(synced) >= 2 and synced[0].when > synced[-1].when:
+            return next((r for r in table.rows if r.time or r.message), table.latest)
+        return table.latest
+
+    def cache_info(self) -> dict:
+        info = self._parse.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+    def _parse_uncached(self, text: str) -> Optional[datetime]:
+        fmt = self.format
+        if fmt == FMT_ISO:
+            when = self._from_iso(text)
+        elif fmt in (FMT_DMY, FMT_MDY):
+            when = self._from_slash(text, fmt == FMT_DMY)
+        elif fmt == FMT_CTIME:
+            when = self._from_ctime(text)
+        else:
+            when = None
+        if when is None:
+            # Off-format string (e.g. a firmware mixing layouts): try the others once
+            when = (
+                self._from_iso(text)
+                or self._from_slash(text, fmt != FMT_MDY and self.day_first)
+                or self._from_ctime(text)
+            )
+        if when is None or when.year < _MIN_SYNCED_YEAR:
+            return None
+        return when
+
+    def _build(
+        self, year: int, month: int, day: int, hour: int, minute: int, second: int
+    ) -> Optional[datetime]:
+        try:
+            return datetime(year, month, day, hour, minute, second, tzinfo=self.tz)
+        except ValueError:
+            return None
+
+    def _from_iso(self, text: str) -> Optional[datetime]:
+        m = _ISO.match(text)
+        if not m:
+            return None
+        y, mo, d, h, mi, s = m.groups()
+        return self._build(int(y), int(mo), int(d), int(h), int(mi), int(s or 0))
+
+    def _from_slash(self, text: str, day_first: bool) -> Optional[datetime]:
+        m = _SLASH.match(text)
+        if not m:
+            return None
+        a, b, y, h, mi, s = m.groups()
+        day, month = (int(a), int(b)) if day_first else (int(b), int(a))
+        year = int(y)
+        if len(y) == 2:
+            year += 1900 if year >= 70 else 2000   # '70 is the pre-sync epoch
+        return self._build(year, month, day, int(h), int(mi), int(s or 0))
+
+    def _from_ctime(self, text: str) -> Optional[datetime]:
+        m = _CTIME.match(text)
+        if not m:
+            return None
+        mon, d, h, mi, s, y = m.groups()
+        month = _MONTHS.get(mon.lower())
+        if month is None:
+            return None
+        return self._build(int(y), month, int(d), int(h), int(mi), int(s))
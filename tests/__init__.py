@@ -0,0 +1 @@
+"""Tests for the Virgin Modem Status integration."""
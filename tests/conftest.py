@@ -0,0 +1,17 @@
+"""Virgin Modem Status – shared test fixtures."""
+# tests/conftest.py
+#
+# Tests run against the integration's modules directly (no running Home
+# Assistant); async tests use pytest-asyncio and the tools/ stub modem.
+from __future__ import annotations
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+
+
+def pytest_configure(config) -> None:
+    config.addinivalue_line("markers", "agent(**config): SnmpStubConfig for the `agent` fixture (tests/test_snmp.py)")
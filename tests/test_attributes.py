@@ -0,0 +1,65 @@
+"""Virgin Modem Status – shared last-event attribute payload tests."""
+# tests/test_attributes.py
+from __future__ import annotations
+
+import json
+from typing import Any, Dict
+
+import pytest
+
+from custom_components.virgin_modem_status.attributes import BULKY_ATTRIBUTES, EventAttributeCache
+from custom_components.virgin_modem_status.const import ATTRIBUTE_MODES, ATTR_MODE_MINIMAL
+from custom_components.virgin_modem_status.events import EventRow, EventTable
+
+
+def _table(*messages: str) -> EventTable:
+    return EventTable([
+        EventRow(i, f"01/06/2024 11:{i:02d}:00", message, "3") for i, message in enumerate(messages, start=1)
+    ])
+
+
+def _data(table: EventTable, **extra: Any) -> Dict[str, Any]:
+    return {"status": "ok", "table": table, "last_event_priority": "3", "last_event_index": len(table.rows), **extra}
+
+
+@pytest.mark.parametrize("mode", ATTRIBUTE_MODES)
+def test_payload_is_keyed_on_the_table_not_the_snapshot(mode: str) -> None:
+    cache = EventAttributeCache(mode)
+    table = _table("T3 time-out", "Loss of Sync")
+    first = cache.get(_data(table))
+
+    # A new snapshot dict around the same table (channel or rate refresh): same payload, not metered
+    assert cache.get(_data(table, severity_stats={"critical": 1})) is first
+    assert cache.writes == cache.writers
+
+    # A new table rebuilds it, even with identical rows
+    assert cache.get(_data(_table("T3 time-out", "Loss of Sync"))) is not first
+    assert cache.writes == 2 * cache.writers
+
+
+def test_status_change_without_a_table_rebuilds() -> None:
+    cache = EventAttributeCache()
+    assert cache.get(None)["status"] is None
+    assert cache.get({"status": "empty"})["status"] == "empty"
+    assert cache.get({"status": "empty", "channels": {}})["status"] == "empty"
+    assert cache.writes == 2 * cache.writers
+
+
+@pytest.mark.parametrize("mode", ATTRIBUTE_MODES)
+def test_meter_matches_the_serialised_payload(mode: str) -> None:
+    cache = EventAttributeCache(mode, writers=1)
+    payload = cache.get(_data(_table("No Ranging Response received - T3 time-out", "DHCP RENEW sent")))
+
+    assert cache.total_bytes == len(json.dumps(payload, default=str))
+    recorded = {k: v for k, v in payload.items() if k not in BULKY_ATTRIBUTES}
+    assert cache.recorded_bytes == len(json.dumps(recorded, default=str))
+    if mode == ATTR_MODE_MINIMAL:
+        assert cache.total_bytes == cache.recorded_bytes
+    else:
+        assert cache.total_bytes > cache.recorded_bytes
+
+
+def test_nothing_metered_without_writers() -> None:
+    cache = EventAttributeCache(writers=0)
+    cache.get(_data(_table("T3 time-out")))
+    assert cache.as_dict()["total_bytes"] == cache.as_dict()["writes"] == 0
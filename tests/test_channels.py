@@ -0,0 +1,104 @@
+"""Virgin Modem Status – per-channel metric tests."""
+# tests/test_channels.py
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from custom_components.virgin_modem_status.channels import ChannelMetrics, ChannelSample
+
+DS = 3          # downstream ifIndex
+US = 100        # upstream ifIndex
+
+
+def _sample(corrected: int = 1000, uncorrected: int = 10, snr: int = 385, **extra: Dict[int, Any]) -> ChannelSample:
+    sample: ChannelSample = {
+        "ds_id": {DS: 1},
+        "ds_power": {DS: 25},
+        "ds_snr": {DS: snr},
+        "ds_corrected": {DS: corrected},
+        "ds_uncorrected": {DS: uncorrected},
+        "us_id": {US: 1},
+        "us_power": {US: 445},
+    }
+    sample.update(extra)
+    return sample
+
+
+def test_first_sample_creates_slots_and_primes_counters() -> None:
+    metrics = ChannelMetrics()
+    created = metrics.update(_sample())
+    assert created == [("downstream", 0), ("upstream", 0)]
+
+    ds = metrics.downstream
+    assert ds.value(0, "snr") == 38.5 and ds.value(0, "power") == 2.5
+    assert metrics.upstream.value(0, "power") == 44.5
+    # Counters read their raw value at once, but the first sample is only a baseline
+    assert ds.value(0, "corrected") == 1000
+    assert ds.value(0, "corrected_delta") == 0.0
+
+    metrics.update(_sample(corrected=1500, uncorrected=12))
+    assert ds.value(0, "corrected_delta") == 500
+    assert metrics.summary()["uncorrected_delta"] == 2
+
+
+def test_counter_missing_from_the_first_poll_is_not_primed() -> None:
+    metrics = ChannelMetrics()
+    sample = _sample()
+    del sample["ds_corrected"]
+    metrics.update(sample)
+    ds = metrics.downstream
+    # The slot exists (other columns), but its corrected counter was never reported
+    assert ds.value(0, "corrected") is None
+    assert ds.value(0, "uncorrected") == 10
+
+    # Its first value is a baseline, not a delta from zero
+    metrics.update(_sample(corrected=1_000_000, uncorrected=15))
+    assert ds.value(0, "corrected_delta") == 0.0
+    assert ds.value(0, "uncorrected_delta") == 5
+    metrics.update(_sample(corrected=1_000_300, uncorrected=15))
+    assert ds.value(0, "corrected_delta") == 300
+
+
+def test_counter_wrap_and_reset() -> None:
+    metrics = ChannelMetrics()
+    metrics.update(_sample(corrected=(1 << 32) - 100))
+    metrics.update(_sample(corrected=50))
+    assert metrics.downstream.value(0, "corrected_delta") == 150   # Counter32 wrapped
+    metrics.update(_sample(corrected=20))
+    assert metrics.downstream.value(0, "corrected_delta") == 20    # modem reset its counters
+
+
+def test_revision_moves_only_when_values_change() -> None:
+    metrics = ChannelMetrics()
+    metrics.update(_sample())
+    first = metrics.summary()
+    assert first["revision"] == 1
+
+    # An identical sample (a new object) changes nothing: same summary, same revision
+    metrics.update(_sample())
+    assert metrics.summary() is first
+
+    # Counters move: deltas change…
+    metrics.update(_sample(corrected=1200))
+    second = metrics.summary()
+    assert second["revision"] == 2 and second["corrected_delta"] == 200
+    # …and the same raw values again drop them back to zero – also a change
+    metrics.update(_sample(corrected=1200))
+    assert metrics.summary()["revision"] == 3 and metrics.summary()["corrected_delta"] == 0
+
+    metrics.update(_sample(snr=380))
+    assert metrics.summary()["revision"] == 4
+
+
+def test_missing_channel_reads_none_until_it_returns() -> None:
+    metrics = ChannelMetrics()
+    metrics.update(_sample())
+    metrics.update(_sample(us_power={}))
+    assert metrics.upstream.value(0, "power") is None
+    assert metrics.upstream.present("power") == ()
+    revision = metrics.revision
+    # Still missing: no change
+    metrics.update(_sample(us_power={}))
+    assert metrics.revision == revision
+    metrics.update(_sample())
+    assert metrics.upstream.value(0, "power") == 44.5 and metrics.revision == revision + 1
@@ -0,0 +1,94 @@
+"""Virgin Modem Status – severity classifier tests."""
+# tests/test_classifier.py
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from custom_components.virgin_modem_status.classifier import (
+    SeverityClassifier,
+    get_classifier,
+    parse_rules,
+)
+
+T3 = "Started Unicast Maintenance Ranging - No Response received - T3 time-out"
+
+
+def test_builtin_rules() -> None:
+    classifier = get_classifier()
+    assert classifier.classify(T3) == ("warning", "t3 time-out")
+    assert classifier.classify("SYNC Timing Synchronization failure - Loss of Sync") == (
+        "critical", "loss of sync"
+    )
+    assert classifier.classify("Honoring MDD", "6") == ("warning", None)
+    assert classifier.classify("Honoring MDD", "") == ("notice", None)
+
+
+def test_user_rule_that_prefixes_a_builtin_keyword_wins() -> None:
+    # "t3" and "t3 time-out" start at the same offset; the longer one is what the
+    # regex reports, but the user rule ranks first
+    classifier = get_classifier(tuple(parse_rules("t3 = critical")))
+    assert classifier.classify(T3) == ("critical", "t3")
+
+
+def test_longer_keyword_wins_when_it_ranks_first() -> None:
+    classifier = SeverityClassifier([("t3 time-out", "critical"), ("t3", "notice")])
+    assert classifier.classify(T3) == ("critical", "t3 time-out")
+    assert classifier.classify("T3 retry") == ("notice", "t3")
+
+
+def test_earlier_rule_wins_across_offsets() -> None:
+    classifier = SeverityClassifier([("time-out", "warning"), ("maintenance", "critical")])
+    assert classifier.classify(T3) == ("warning", "time-out")
+
+
+def test_parse_rules_rejects_unknown_severity() -> None:
+    assert parse_rules("# comment\nfoo = Critical; bar=notice") == [
+        ("foo", "critical"), ("bar", "notice")
+    ]
+    with pytest.raises(ValueError):
+        parse_rules("foo = fatal")
+
+
+def test_prefix_rank_tie_break_picks_the_best_ranked_prefix() -> None:
+    # Three keywords start at the same offset; the trie reports the longest, and the
+    # best-ranked of its prefixes decides – here the middle one
+    classifier = SeverityClassifier([
+        ("no ranging", "critical"), ("no", "notice"), ("no ranging response", "warning"),
+    ])
+    assert classifier.classify("No Ranging Response received - T3 time-out") == ("critical", "no ranging")
+    # …here the shortest
+    classifier = SeverityClassifier([
+        ("no", "notice"), ("no ranging", "critical"), ("no ranging response", "warning"),
+    ])
+    assert classifier.classify("No Ranging Response received") == ("notice", "no")
+    # …and the longest only when it ranks first
+    classifier = SeverityClassifier([
+        ("no ranging response", "warning"), ("no", "notice"), ("no ranging", "critical"),
+    ])
+    assert classifier.classify("No Ranging Response received") == ("warning", "no ranging response")
+    # A better-ranked keyword inside a longer match (overlap, different offset) still wins
+    classifier = SeverityClassifier([("ranging", "critical"), ("no ranging response", "warning")])
+    assert classifier.classify("No Ranging Response received") == ("critical", "ranging")
+
+
+def test_matches_per_rule_scan_on_random_rules() -> None:
+    rng = random.Random(7)
+    alphabet = "ab t-3"
+    for _ in range(200):
+        rules = []
+        for _ in range(rng.randint(1, 12)):
+            keyword = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))).strip()
+            if keyword:
+                rules.append((keyword, rng.choice(("critical", "warning", "notice"))))
+        if not rules:
+            continue
+        classifier = SeverityClassifier(rules)
+        for _ in range(20):
+            message = "".join(rng.choice(alphabet + "AB") for _ in range(rng.randint(0, 20)))
+            # Reference: the first rule (in rank order) whose keyword occurs anywhere
+            expected = next(
+                ((s, k) for k, s in classifier.rules if k in message.lower()), ("notice", None)
+            )
+            assert classifier.classify(message) == expected, (rules, message)
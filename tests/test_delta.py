@@ -0,0 +1,110 @@
+"""Virgin Modem Status – new-row delta engine tests."""
+# tests/test_delta.py
+from __future__ import annotations
+
+from typing import List, Tuple
+
+from custom_components.virgin_modem_status.delta import EventDelta
+from custom_components.virgin_modem_status.events import EventRow, EventTable
+
+T3 = "No Ranging Response received - T3 time-out"
+SYNC = "SYNC Timing Synchronization failure - Loss of Sync"
+
+
+def _table(*rows: Tuple[str, str]) -> EventTable:
+    return EventTable([EventRow(i, t, m, "3") for i, (t, m) in enumerate(rows, start=1)])
+
+
+def _log(start: int, count: int) -> List[Tuple[str, str]]:
+    """`count` consecutive distinct rows, numbered from `start`."""
+    return [(f"01/06/2024 10:{n // 60:02d}:{n % 60:02d}", f"event {n}") for n in range(start, start + count)]
+
+
+def _pairs(rows: List[EventRow]) -> List[Tuple[str, str]]:
+    return [(r.time, r.message) for r in rows]
+
+
+def test_first_table_is_a_baseline() -> None:
+    delta = EventDelta()
+    assert delta.baseline
+    rows = delta.update(_table(*_log(0, 20)))
+    # Returned (the coordinator records them) but flagged as baseline, not news
+    assert len(rows) == 20 and delta.baseline
+    assert delta.update(_table(*_log(0, 20))) == []
+    assert not delta.baseline
+
+
+def test_rotation_only_yields_rows_that_scrolled_in() -> None:
+    delta = EventDelta()
+    delta.update(_table(*_log(0, 20)))
+    # Three new rows: the log drops its three oldest, every index shifts
+    assert _pairs(delta.update(_table(*_log(3, 20)))) == _log(20, 3)
+    assert delta.update(_table(*_log(3, 20))) == []
+
+
+def test_truncated_log_reports_nothing_then_only_new_rows() -> None:
+    delta = EventDelta()
+    delta.update(_table(*_log(0, 20)))
+    # Modem cleared all but its last two rows (reboot, "clear log")
+    assert delta.update(_table(*_log(18, 2))) == []
+    # …and logged afresh after that
+    assert _pairs(delta.update(_table(*_log(18, 2), ("02/06/2024 08:00:00", SYNC)))) == [
+        ("02/06/2024 08:00:00", SYNC)
+    ]
+    # Truncated to nothing: not news, and the window is kept
+    assert delta.update(_table()) == []
+    assert len(delta) == 21
+
+
+def test_rows_reappearing_after_rotating_out_are_not_news() -> None:
+    delta = EventDelta()
+    table = _table(*_log(0, 20))
+    delta.update(table)
+    delta.update(_table(*_log(10, 20)))
+    # Firmware re-shuffle: the old rows come back into view
+    assert delta.update(table) == []
+
+
+def test_duplicate_timestamps_are_told_apart() -> None:
+    delta = EventDelta()
+    same_second = "01/06/2024 11:00:00"
+    delta.update(_table((same_second, T3), (same_second, SYNC)))
+    # The same T3 again in the same second: a second occurrence of the pair is new
+    new = delta.update(_table((same_second, T3), (same_second, SYNC), (same_second, T3)))
+    assert _pairs(new) == [(same_second, T3)]
+    assert new[0].index == 3
+    # Rotation drops the first T3: two T3s remain, both already delivered
+    assert delta.update(_table((same_second, SYNC), (same_second, T3), (same_second, T3))) == []
+
+
+def test_window_survives_a_restart() -> None:
+    saves: List[int] = []
+    delta = EventDelta(on_change=lambda: saves.append(1))
+    delta.update(_table(*_log(0, 20)))
+    delta.update(_table(*_log(5, 20)))
+    assert len(saves) == 2
+    delta.update(_table(*_log(5, 20)))
+    assert len(saves) == 2   # nothing new, no save requested
+
+    restarted = EventDelta()
+    restarted.load(delta.dump())
+    assert not restarted.baseline
+    # Rows delivered before the restart are not re-emitted; rows logged meanwhile are
+    assert _pairs(restarted.update(_table(*_log(8, 20)))) == _log(25, 3)
+
+
+def test_restored_window_keeps_the_newest_fingerprints() -> None:
+    delta = EventDelta(capacity=30)
+    delta.update(_table(*_log(0, 20)))
+    delta.update(_table(*_log(20, 20)))
+    assert len(delta) == 30
+
+    restarted = EventDelta(capacity=25)
+    restarted.load(delta.dump())
+    assert len(restarted) == 25
+    # The rows still in the table were refreshed last, so they survived the trim
+    assert restarted.update(_table(*_log(20, 20))) == []
+
+    empty = EventDelta()
+    empty.load({})
+    assert empty.baseline
@@ -0,0 +1,83 @@
+"""Virgin Modem Status – bus event tests."""
+# tests/test_events.py
+from __future__ import annotations
+
+import tempfile
+from typing import AsyncIterator, List, Tuple
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from homeassistant.core import Event, HomeAssistant
+
+from custom_components.virgin_modem_status.api import VirginApi
+from custom_components.virgin_modem_status.const import (
+    EVENT_BATCH,
+    EVENT_BATCH_THRESHOLD,
+    EVENT_ERROR,
+    EVENT_GENERAL,
+)
+from custom_components.virgin_modem_status.coordinator import VirginCoordinator
+from custom_components.virgin_modem_status.events import EventRow
+
+SYNC = "SYNC Timing Synchronization failure - Loss of Sync"
+DHCP = "DHCP RENEW sent - No response for IPv4"
+
+
+@pytest_asyncio.fixture
+async def coordinator() -> AsyncIterator[VirginCoordinator]:
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="vms-test-"))
+    async with aiohttp.ClientSession() as session:
+        # Nothing listens on this port: the tests never let the coordinator poll
+        yield VirginCoordinator(hass, VirginApi("127.0.0.1:9", session), 90, None)
+
+
+async def _fire(coordinator: VirginCoordinator, rows: List[EventRow]) -> List[Tuple[str, dict]]:
+    hass = coordinator.hass
+    fired: List[Tuple[str, dict]] = []
+
+    def _record(event: Event) -> None:
+        fired.append((event.event_type, event.data))
+
+    unsubs = [hass.bus.async_listen(t, _record) for t in (EVENT_GENERAL, EVENT_ERROR, EVENT_BATCH)]
+    for row in rows:
+        row.severity, row.keyword = coordinator.classifier.classify(row.message, row.priority)
+    coordinator._fire_new_rows(rows)
+    await hass.async_block_till_done()
+    for unsub in unsubs:
+        unsub()
+    return fired
+
+
+def _row(index: int, message: str) -> EventRow:
+    # No priority column: severity comes from the message alone
+    return EventRow(index, f"01/06/2024 11:{index:02d}:00", message)
+
+
+@pytest.mark.asyncio
+async def test_small_poll_fires_one_event_per_row(coordinator: VirginCoordinator) -> None:
+    fired = await _fire(coordinator, [_row(1, DHCP), _row(2, SYNC), _row(3, DHCP)])
+    assert [t for t, _ in fired] == [EVENT_GENERAL, EVENT_ERROR, EVENT_GENERAL]
+    assert fired[1][1]["severity"] == "critical" and fired[1][1]["index"] == 2
+
+
+@pytest.mark.asyncio
+async def test_burst_keeps_error_rows_individual(coordinator: VirginCoordinator) -> None:
+    rows = [_row(i, SYNC if i in (3, 7) else DHCP) for i in range(1, EVENT_BATCH_THRESHOLD + 4)]
+    fired = await _fire(coordinator, rows)
+
+    errors = [data for t, data in fired if t == EVENT_ERROR]
+    assert [e["index"] for e in errors] == [3, 7]
+    assert not any(t == EVENT_GENERAL for t, _ in fired)
+    (batch,) = [data for t, data in fired if t == EVENT_BATCH]
+    assert batch["count"] == len(rows) - 2
+    assert batch["errors"] == 2
+    assert batch["severity"] == "notice"
+    assert [e["index"] for e in batch["events"]] == [i for i in range(1, len(rows) + 1) if i not in (3, 7)]
+
+
+@pytest.mark.asyncio
+async def test_error_storm_is_never_batched(coordinator: VirginCoordinator) -> None:
+    rows = [_row(i, SYNC) for i in range(1, 13)] + [_row(13, DHCP)]
+    fired = await _fire(coordinator, rows)
+    assert [t for t, _ in fired] == [EVENT_ERROR] * 12 + [EVENT_GENERAL]
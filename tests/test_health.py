@@ -0,0 +1,134 @@
+"""Virgin Modem Status – DOCSIS health and restart tests."""
+# tests/test_health.py
+from __future__ import annotations
+
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import AsyncIterator
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from homeassistant.core import HomeAssistant
+
+from custom_components.virgin_modem_status.api import VirginApi
+from custom_components.virgin_modem_status.binary_sensor import (
+    VirginDocsisHealthyBinary,
+    VirginReachableBinary,
+)
+from custom_components.virgin_modem_status.coordinator import VirginCoordinator
+from custom_components.virgin_modem_status.health import HealthTracker
+
+NOW = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+ROWS = [{"time": "01/06/2024 11:58:00", "priority": "critical", "message": "No Ranging Response received - T3 time-out"}]
+
+
+def test_first_verdict_is_published_without_hysteresis() -> None:
+    changes = []
+    tracker = HealthTracker(on_change=lambda: changes.append(1))
+    assert tracker.state is None
+
+    state = tracker.evaluate(NOW, 0.0, False, None, None, {}, 0.0)
+    assert not state.healthy and state.reasons == ("modem unreachable",)
+    assert changes == [1]
+    # Same verdict again: same object, no save requested
+    assert tracker.evaluate(NOW, 1.0, False, None, None, {}, 0.0) is state
+    assert changes == [1]
+
+
+def test_verdict_round_trips_through_dump_and_load() -> None:
+    tracker = HealthTracker()
+    tracker.evaluate(NOW, 0.0, True, "critical", NOW, {}, 0.0)
+
+    restored = HealthTracker()
+    restored.load(tracker.dump())
+    assert not restored.state.healthy
+    assert restored.state.reasons == ("latest event is critical",)
+    assert restored.state.since == NOW
+
+    # Hysteresis carries on from the restored verdict rather than starting over
+    assert not restored.evaluate(NOW, 1.0, True, None, None, {}, 0.0).healthy
+
+    empty = HealthTracker()
+    empty.load({"healthy": "yes", "reasons": [], "since": NOW.isoformat()})
+    assert empty.state is None
+    assert empty.dump() == {}
+
+
+def test_stale_critical_latest_event_is_ignored() -> None:
+    # The latest row is critical but three hours old: the modem has been quiet since
+    stale = HealthTracker().evaluate(NOW, 0.0, True, "critical", NOW - timedelta(hours=3), {}, 0.0)
+    assert stale.healthy
+    # …and when it happened is unknown (unsynced clock, never seen arriving)
+    assert HealthTracker().evaluate(NOW, 0.0, True, "critical", None, {}, 0.0).healthy
+    recent = HealthTracker().evaluate(NOW, 0.0, True, "critical", NOW - timedelta(minutes=20), {}, 0.0)
+    assert recent.reasons == ("latest event is critical",)
+
+
+@pytest_asyncio.fixture
+async def coordinator() -> AsyncIterator[VirginCoordinator]:
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="vms-test-"))
+    async with aiohttp.ClientSession() as session:
+        # Nothing listens on this port: the tests never let the coordinator poll
+        yield VirginCoordinator(hass, VirginApi("127.0.0.1:9", session), 90, None)
+
+
+@pytest.mark.asyncio
+async def test_restore_does_not_claim_the_modem_is_up(coordinator: VirginCoordinator) -> None:
+    entry = SimpleNamespace(entry_id="test")
+    reachable = VirginReachableBinary(coordinator, entry)
+    healthy = VirginDocsisHealthyBinary(coordinator, entry)
+    coordinator.snapshot.load({"events": ROWS})
+
+    assert await coordinator.async_restore()
+    assert coordinator.data["status"] == "ok"
+    # No saved verdict: both stay unknown until the modem is polled
+    assert reachable.is_on is None
+    assert healthy.is_on is None
+    assert healthy.extra_state_attributes == {}
+
+
+@pytest.mark.asyncio
+async def test_restore_keeps_the_persisted_verdict(coordinator: VirginCoordinator) -> None:
+    entry = SimpleNamespace(entry_id="test")
+    healthy = VirginDocsisHealthyBinary(coordinator, entry)
+    saved = HealthTracker()
+    saved.evaluate(NOW, time.monotonic(), False, None, None, {}, 0.0)
+    coordinator.snapshot.load({"events": ROWS})
+    coordinator._health.load(saved.dump())
+
+    assert await coordinator.async_restore()
+    assert healthy.is_on is False
+    assert healthy.extra_state_attributes["reasons"] == ["modem unreachable"]
+    assert coordinator.data["health"] is coordinator.health
+
+
+@pytest.mark.asyncio
+async def test_unchanged_stale_critical_row_does_not_hold_health_down(coordinator: VirginCoordinator) -> None:
+    # ROWS' critical event is stamped 2024: long out of the window by now
+    table = coordinator.api.restore(ROWS)
+    coordinator.async_set_updated_data(await coordinator._async_shape(table))
+    assert coordinator.data["last_event_severity"] == "critical"
+    assert coordinator.health.healthy
+
+    # Unchanged table on the next polls: the same stale row is passed in again
+    for _ in range(3):
+        assert await coordinator._async_shape(table) is coordinator.data
+    assert coordinator.health.healthy
+
+
+@pytest.mark.asyncio
+async def test_unsynced_critical_row_counts_from_its_arrival(coordinator: VirginCoordinator) -> None:
+    unsynced = [dict(ROWS[0], time="01/01/1970 00:03:12")]
+    # Baseline: when the row arrived is unknown, so it does not count
+    await coordinator._async_shape(coordinator.api.restore(unsynced))
+    assert coordinator._latest_at is None
+    assert coordinator.health.healthy
+
+    arrived = unsynced + [dict(ROWS[0], time="01/01/1970 00:09:40")]
+    before = datetime.now(timezone.utc)
+    await coordinator._async_shape(coordinator.api.restore(arrived))
+    # Announced this poll: counted from now, for LATEST_WINDOW
+    assert before <= coordinator._latest_at <= datetime.now(timezone.utc)
@@ -0,0 +1,80 @@
+"""Virgin Modem Status – on-disk event history tests."""
+# tests/test_history.py
+from __future__ import annotations
+
+import os
+import sqlite3
+from typing import Iterator
+
+import pytest
+
+from custom_components.virgin_modem_status.history import EventHistoryStore
+
+DAY = 86400.0
+NOW = 1_717_243_200.0  # 2024-06-01 12:00 UTC
+
+T3 = ("01/06/2024 11:00:00", "No Ranging Response received - T3 time-out", "3", "critical", "t3")
+T4 = ("01/06/2024 11:05:00", "Received Response to Broadcast Maintenance Request - T4 timeout", "3", "critical", "t4")
+DHCP = ("01/06/2024 11:10:00", "DHCP RENEW sent - No response for IPv4", "6", "notice", "")
+
+
+@pytest.fixture
+def store(tmp_path: "os.PathLike[str]") -> Iterator[EventHistoryStore]:
+    history = EventHistoryStore(os.path.join(tmp_path, "history.db"), retention_days=7)
+    history.open()
+    yield history
+    history.close()
+
+
+def test_duplicates_are_ignored(store: EventHistoryStore) -> None:
+    assert store.append([T3, T4], seen=NOW) == 2
+    # Same (time, message) seen again on the next poll, plus one new row
+    assert store.append([T3, T4, DHCP], seen=NOW + 90) == 1
+    result = store.query(since=0)
+    assert result["count"] == 3
+    # First-seen time is kept, not overwritten by the repeat
+    assert {e["message"]: e["seen"] for e in result["events"]}[T3[1]] == NOW
+
+
+def test_failed_append_rolls_back(store: EventHistoryStore) -> None:
+    store.append([T3], seen=NOW)
+    # The second row can't be bound, after T4 has been inserted in the same transaction
+    with pytest.raises(sqlite3.Error):
+        store.append([T4, (object(), "broken", "", "error", "")], seen=NOW)
+    assert store.query(since=0)["count"] == 1
+    # The connection is usable again: no transaction was left open
+    assert store.append([T4], seen=NOW) == 1
+
+
+def test_old_rows_are_pruned(store: EventHistoryStore) -> None:
+    store.append([T3], seen=NOW - 10 * DAY)
+    store.append([T4], seen=NOW - 6 * DAY)
+    store.append([DHCP], seen=NOW)
+    assert store.prune(NOW) == 1
+    assert [e["message"] for e in store.query(since=0)["events"]] == [DHCP[1], T4[1]]
+
+
+def test_append_prunes_periodically(store: EventHistoryStore) -> None:
+    store.prune(NOW)
+    store.append([T3], seen=NOW - 10 * DAY)
+    # Pruned at NOW; the first append a day later prunes again on its own
+    store.append([DHCP], seen=NOW + DAY)
+    assert store.query(since=0)["count"] == 1
+
+
+def test_query_by_severity_and_keyword(store: EventHistoryStore) -> None:
+    store.append([T3, T4, DHCP], seen=NOW)
+    store.append([("02/06/2024 09:00:00", T3[1], "3", "critical", "t3")], seen=NOW + DAY)
+
+    critical = store.query(since=0, severity="CRITICAL")
+    assert critical["count"] == 3
+    t3 = store.query(since=0, keyword="t3")
+    assert t3["count"] == 2
+    # Newest first; the limit caps the rows, not the count
+    limited = store.query(since=0, keyword="T3", limit=1)
+    assert limited["count"] == 2 and len(limited["events"]) == 1
+    assert limited["events"][0]["time"] == "02/06/2024 09:00:00"
+    # The window applies on first-seen time
+    assert store.query(since=NOW + 1, severity="critical")["count"] == 1
+    assert store.query(since=0, severity="notice", keyword="t3")["count"] == 0
+    assert store.query(since=0, severity="notice")["events"][0]["keyword"] is None
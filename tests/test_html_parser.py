@@ -0,0 +1,95 @@
+"""Virgin Modem Status – HTML event-log parser tests and benchmarks."""
+# tests/test_html_parser.py
+#
+# Every page in tests/fixtures/ must come out the same whether it is parsed
+# whole (parse_events_html), streamed in chunks of any size (HtmlEventStream, as
+# VirginApi reads the body), or run through the pre-streaming parser kept in
+# tools/bench_html.py. The benchmarks (pytest-benchmark) time both paths on the
+# fixtures and on a 1 MiB padded stub page:
+#
+#   python -m pytest tests/test_html_parser.py --benchmark-only
+from __future__ import annotations
+
+import codecs
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+from bench_html import legacy_parse
+from custom_components.virgin_modem_status.html_parser import (
+    MAX_EVENT_ROWS,
+    HtmlEventStream,
+    parse_events_html,
+)
+from stub_modem import StubConfig, StubModem
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+PAGES = sorted(name for name in os.listdir(FIXTURES) if name.endswith(".html"))
+# Byte chunk sizes: single bytes split every tag and multi-byte character;
+# 16 KiB is what VirginApi reads
+CHUNK_SIZES = (1, 3, 7, 64, 1000, 4096, 16 * 1024)
+
+
+def _page(name: str) -> bytes:
+    with open(os.path.join(FIXTURES, name), "rb") as fh:
+        return fh.read()
+
+
+def _stream(body: bytes, chunk: int) -> List[Dict[str, Any]]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    stream = HtmlEventStream()
+    for start in range(0, len(body), chunk):
+        stream.feed(decoder.decode(body[start:start + chunk]))
+    stream.feed(decoder.decode(b"", final=True))
+    return stream.close()
+
+
+def _legacy(body: bytes) -> List[Dict[str, Any]]:
+    return legacy_parse(body.decode("utf-8", errors="replace"))[-MAX_EVENT_ROWS:]
+
+
+@pytest.mark.parametrize("chunk", CHUNK_SIZES)
+@pytest.mark.parametrize("name", PAGES)
+def test_chunked_stream_matches_whole_page_and_legacy(name: str, chunk: int) -> None:
+    body = _page(name)
+    whole = parse_events_html(body.decode("utf-8", errors="replace"))
+    assert whole == _legacy(body)
+    assert _stream(body, chunk) == whole
+
+
+def test_fixture_contents() -> None:
+    hub3 = parse_events_html(_page("hub3_event_log.html").decode())
+    assert len(hub3) == MAX_EVENT_ROWS
+    assert hub3[-1] == {
+        "time": "07/06/2024 10:48:21",
+        "priority": "critical",
+        "message": "SYNC Timing Synchronization failure - Failed to acquire QAM/QPSK symbol timing;"
+                   "CM-MAC=00:00:5e:00:53:02;",
+    }
+    # Priority column first: the time is still found in the second cell
+    hub4 = parse_events_html(_page("hub4_priority_first.html").decode())
+    assert hub4[-1] == {"time": "2024-07-08 21:11:25", "priority": "5", "message": "Dynamic Range Window violation"}
+    assert parse_events_html(_page("login_page.html").decode()) == []
+    assert parse_events_html(_page("empty_log.html").decode()) == []
+
+
+_BENCH_PAGES = PAGES + ["stub-padded-1MiB"]
+
+
+def _bench_body(name: str) -> bytes:
+    if name == "stub-padded-1MiB":
+        return StubModem(StubConfig(format="html", pad_bytes=1024 * 1024, seed=1)).render()[0]
+    return _page(name)
+
+
+@pytest.mark.parametrize("path", ("legacy", "streaming"))
+@pytest.mark.parametrize("name", _BENCH_PAGES)
+def test_benchmark_parse(benchmark: Any, name: str, path: str) -> None:
+    body = _bench_body(name)
+    benchmark.group = name
+    if path == "legacy":
+        result = benchmark(_legacy, body)
+    else:
+        result = benchmark(_stream, body, 16 * 1024)
+    assert result == _legacy(body)
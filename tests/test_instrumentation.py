@@ -0,0 +1,25 @@
+"""Virgin Modem Status – poll instrumentation tests."""
+# tests/test_instrumentation.py
+from __future__ import annotations
+
+from custom_components.virgin_modem_status.instrumentation import STAGES, PollStats
+
+
+def test_parse_times_are_kept_per_mode() -> None:
+    stats = PollStats()
+    for _ in range(50):
+        stats.record_parse("oid", "inline", 0.002, 20_000, 20)
+    for _ in range(5):
+        stats.record_parse("html", "executor", 0.200, 2_000_000, 20)
+
+    assert stats.parse_modes == {"inline": 50, "executor": 5}
+    assert stats.timings["parse_inline"].total == 50
+    assert stats.timings["parse_executor"].total == 5
+    assert stats.timings["parse"].total == 55
+    # Each mode's p95 is its own: the few slow executor parses don't drag the inline one up
+    assert stats.percentile_ms("parse_inline", 0.95) <= 2.5
+    assert stats.percentile_ms("parse_executor", 0.95) >= 190
+
+    timings = stats.as_dict()["timings_ms"]
+    assert {"parse", "parse_inline", "parse_executor"} <= timings.keys()
+    assert {"parse_inline", "parse_executor"} <= set(STAGES)
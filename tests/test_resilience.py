@@ -0,0 +1,233 @@
+"""Virgin Modem Status – retry, circuit breaker and deadline tests."""
+# tests/test_resilience.py
+#
+# VirginApi against an in-process stub modem (tools/stub_modem.py) whose
+# fail_rate / reset_rate / hang_rate are switched between requests. Backoff
+# delays are recorded and shortened to nothing, the breaker cooldown and the
+# connect/read deadlines to fractions of a second, so the suite stays quick.
+from __future__ import annotations
+
+import asyncio
+import socket
+import time
+from typing import AsyncIterator, List
+
+import aiohttp
+import pytest
+import pytest_asyncio
+
+from custom_components.virgin_modem_status import api as api_module
+from custom_components.virgin_modem_status.api import VirginApi, VirginApiError, VirginApiTimeout
+from custom_components.virgin_modem_status.events import EventTable
+from custom_components.virgin_modem_status.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    RetryBudget,
+    backoff_delay,
+)
+from stub_modem import StubConfig, StubModem
+
+
+@pytest_asyncio.fixture
+async def stub() -> AsyncIterator[StubModem]:
+    modem = StubModem(StubConfig(format="oid"))
+    await modem.start()
+    yield modem
+    await modem.stop()
+
+
+@pytest_asyncio.fixture
+async def session() -> AsyncIterator[aiohttp.ClientSession]:
+    async with aiohttp.ClientSession() as client:
+        yield client
+
+
+@pytest.fixture
+def delays(monkeypatch: pytest.MonkeyPatch) -> List[int]:
+    """Retry attempts VirginApi backed off for, in order (without actually waiting)."""
+    attempts: List[int] = []
+
+    def _record(attempt: int) -> float:
+        attempts.append(attempt)
+        return 0.0
+
+    monkeypatch.setattr(api_module, "backoff_delay", _record)
+    return attempts
+
+
+def _empty_budget() -> RetryBudget:
+    """A budget with no tokens left: every fetch is a single attempt."""
+    budget = RetryBudget()
+    budget.tokens = 0.0
+    return budget
+
+
+def test_backoff_delay_is_jittered_and_capped() -> None:
+    for attempt, ceiling in ((1, 0.5), (2, 1.0), (3, 2.0), (4, 4.0), (8, 4.0)):
+        samples = [backoff_delay(attempt) for _ in range(200)]
+        assert all(0.0 <= s <= ceiling for s in samples)
+        assert len(set(samples)) > 1
+
+
+@pytest.mark.asyncio
+async def test_503_is_retried_with_backoff(
+    stub: StubModem, session: aiohttp.ClientSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    api = VirginApi(f"127.0.0.1:{stub.port}", session)
+    stub.config.fail_rate = 1.0
+    tokens = api.budget.tokens
+    delays: List[int] = []
+
+    def _recover(attempt: int) -> float:
+        delays.append(attempt)
+        if attempt == 2:
+            stub.config.fail_rate = 0.0
+        return 0.0
+
+    monkeypatch.setattr(api_module, "backoff_delay", _recover)
+    table = await api.fetch_snapshot()
+
+    assert isinstance(table, EventTable) and len(api.events) == 20
+    assert stub.requests == 3
+    assert delays == [1, 2]
+    assert api.budget.spent == 2
+    assert api.budget.tokens == pytest.approx(tokens + api.budget.ratio - 2)
+    assert api.breaker.state == CLOSED and api.breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_reset_connection_is_retried(
+    stub: StubModem, session: aiohttp.ClientSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    api = VirginApi(f"127.0.0.1:{stub.port}", session)
+    stub.config.reset_rate = 1.0
+    delays: List[int] = []
+
+    def _recover(attempt: int) -> float:
+        delays.append(attempt)
+        stub.config.reset_rate = 0.0
+        return 0.0
+
+    monkeypatch.setattr(api_module, "backoff_delay", _recover)
+    table = await api.fetch_snapshot()
+
+    assert isinstance(table, EventTable)
+    assert len(api.events) == 20
+    assert stub.requests == 2
+    assert delays == [1]
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_attempts(stub: StubModem, session: aiohttp.ClientSession, delays: List[int]) -> None:
+    api = VirginApi(f"127.0.0.1:{stub.port}", session)
+    stub.config.fail_rate = 1.0
+
+    with pytest.raises(VirginApiError) as err:
+        await api.fetch_snapshot()
+
+    assert err.value.transient
+    assert stub.requests == api_module._MAX_ATTEMPTS
+    assert delays == [1, 2, 3]   # the last delay is drawn, but the attempt cap ends the fetch
+    assert api.breaker.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_stops_retries(stub: StubModem, session: aiohttp.ClientSession, delays: List[int]) -> None:
+    budget = _empty_budget()
+    first = VirginApi(f"127.0.0.1:{stub.port}", session, budget=budget)
+    second = VirginApi(f"127.0.0.1:{stub.port}", session, budget=budget)
+    stub.config.fail_rate = 1.0
+
+    for api in (first, second):
+        with pytest.raises(VirginApiError):
+            await api.fetch_snapshot()
+
+    # Shared (hub) budget: neither modem got a retry
+    assert stub.requests == 2
+    assert budget.spent == 0
+    assert budget.denied == 2
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_half_opens_and_closes(
+    stub: StubModem, session: aiohttp.ClientSession, delays: List[int]
+) -> None:
+    api = VirginApi(f"127.0.0.1:{stub.port}", session, budget=_empty_budget())
+    api.breaker = CircuitBreaker(threshold=3, cooldown=0.2, max_cooldown=1.0)
+    stub.config.fail_rate = 1.0
+
+    for _ in range(3):
+        with pytest.raises(VirginApiError):
+            await api.fetch_snapshot()
+    assert api.breaker.state == OPEN
+    assert stub.requests == 3
+
+    # Open: the poll fails without touching the network
+    with pytest.raises(VirginApiError, match="marked down"):
+        await api.fetch_snapshot()
+    assert stub.requests == 3
+    assert api.breaker.skipped == 1
+
+    # Cooldown over: one half-open attempt; it fails, so the breaker re-opens for twice as long
+    await asyncio.sleep(0.25)
+    assert api.breaker.allow(time.monotonic())
+    assert api.breaker.state == HALF_OPEN
+    with pytest.raises(VirginApiError):
+        await api.fetch_snapshot()
+    assert stub.requests == 4
+    assert api.breaker.state == OPEN
+    assert api.breaker.retry_in(time.monotonic()) > 0.3
+
+    # Modem back: after the doubled cooldown the probe passes and the fetch closes the breaker
+    stub.config.fail_rate = 0.0
+    await asyncio.sleep(0.45)
+    await api.fetch_snapshot()
+    assert len(api.events) == 20
+    assert api.breaker.state == CLOSED
+    assert api.breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_sock_read_deadline_fires_on_hung_request(
+    stub: StubModem, session: aiohttp.ClientSession, monkeypatch: pytest.MonkeyPatch, delays: List[int]
+) -> None:
+    monkeypatch.setattr(api_module, "_READ_TIMEOUT", 0.2)
+    api = VirginApi(f"127.0.0.1:{stub.port}", session, timeout=5, budget=_empty_budget())
+    stub.config.hang_rate = 1.0
+
+    started = time.monotonic()
+    with pytest.raises(VirginApiTimeout):
+        await api.fetch_snapshot()
+    # The read deadline, not the 5 s overall one, ended the attempt
+    assert time.monotonic() - started < 2.0
+    assert stub.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_sock_connect_deadline_fires_on_unanswered_connect(
+    session: aiohttp.ClientSession, monkeypatch: pytest.MonkeyPatch, delays: List[int]
+) -> None:
+    monkeypatch.setattr(api_module, "_CONNECT_TIMEOUT", 0.2)
+    # A listener that never accepts: once its backlog is full, further SYNs go unanswered
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(0)
+    port = listener.getsockname()[1]
+    fillers = []
+    for _ in range(4):
+        filler = socket.socket()
+        filler.setblocking(False)
+        filler.connect_ex(("127.0.0.1", port))
+        fillers.append(filler)
+    try:
+        api = VirginApi(f"127.0.0.1:{port}", session, timeout=5, budget=_empty_budget())
+        started = time.monotonic()
+        with pytest.raises(VirginApiTimeout):
+            await api.fetch_snapshot()
+        assert time.monotonic() - started < 2.0
+    finally:
+        for filler in fillers:
+            filler.close()
+        listener.close()
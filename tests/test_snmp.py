@@ -0,0 +1,116 @@
+"""Virgin Modem Status – SNMP backend tests."""
+# tests/test_snmp.py
+#
+# SnmpClient and VirginApi(backend="snmp") against the UDP stub agent in
+# tools/stub_snmp.py (its own BER codec, so encoder and decoder are checked
+# against an independent implementation).
+from __future__ import annotations
+
+from datetime import datetime
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+
+from custom_components.virgin_modem_status.api import VirginApi
+from custom_components.virgin_modem_status.classifier import get_classifier
+from custom_components.virgin_modem_status.const import BACKEND_SNMP, OID_MSG, OID_PRI, OID_TIME
+from custom_components.virgin_modem_status.snmp import (
+    SnmpClient,
+    SnmpTimeout,
+    _date_and_time,
+    event_rows,
+    parse_oid,
+)
+from stub_snmp import SnmpStubConfig, StubSnmpAgent, date_and_time
+
+EVENT_COLUMNS = (parse_oid(OID_TIME), parse_oid(OID_PRI), parse_oid(OID_MSG))
+
+
+@pytest_asyncio.fixture
+async def agent(request: pytest.FixtureRequest) -> AsyncIterator[StubSnmpAgent]:
+    marker = request.node.get_closest_marker("agent")
+    stub = StubSnmpAgent(SnmpStubConfig(**(marker.kwargs if marker else {})))
+    await stub.start()
+    yield stub
+    stub.stop()
+
+
+def test_date_and_time_decoding() -> None:
+    when = datetime(2024, 5, 1, 8, 3, 9)
+    assert _date_and_time(date_and_time(when)) == "2024-05-01 08:03:09"
+    assert _date_and_time(date_and_time(when, 11)) == "2024-05-01 08:03:09"
+    # Firmwares that send display strings instead: passed through as text
+    assert _date_and_time(b"01/05/2024 08:03:09") == "01/05/2024 08:03:09"
+    # 8 octets that aren't a valid DateAndTime are not turned into a bogus date
+    assert not _date_and_time(b"\x07\xe8\x0d\x01\x08\x03\x09\x00").startswith("2024-13")
+    assert _date_and_time(None) == ""
+
+
+def test_priority_levels_map_to_severities() -> None:
+    columns = {
+        EVENT_COLUMNS[0]: {(i,): date_and_time(datetime(2024, 5, 1, 8, 0, i)) for i in range(1, 10)},
+        EVENT_COLUMNS[1]: {(i,): i for i in range(1, 10)},
+        EVENT_COLUMNS[2]: {(i,): b"Honoring MDD; IP provisioning mode = IPv4" for i in range(1, 10)},
+    }
+    rows = event_rows(columns, *EVENT_COLUMNS)
+    assert [r["priority"] for r in rows] == [
+        "emergency", "alert", "critical", "error", "warning", "notice", "information", "debug", "9",
+    ]
+    classifier = get_classifier()
+    severities = [classifier.classify(r["message"], r["priority"])[0] for r in rows]
+    assert severities == [
+        "critical", "critical", "critical", "critical", "warning", "notice", "notice", "notice",
+        "warning",   # unknown numeric level: "higher means worse" fallback
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.agent(rows=60, downstream=0, upstream=0)
+async def test_walk_takes_several_round_trips(agent: StubSnmpAgent) -> None:
+    client = SnmpClient("127.0.0.1", agent.port, max_repetitions=8, timeout=1.0)
+    columns = await client.walk_columns(EVENT_COLUMNS)
+
+    assert all(len(columns[c]) == 60 for c in EVENT_COLUMNS)
+    # 60 rows, 8 per exchange, plus the exchange that runs off the end of the columns
+    assert client.round_trips == agent.requests == 8
+    rows = event_rows(columns, *EVENT_COLUMNS)
+    assert len(rows) == 60
+    assert rows[-1]["time"] == agent.clock.strftime("%Y-%m-%d %H:%M:%S")
+
+
+@pytest.mark.asyncio
+@pytest.mark.agent(rows=20, downstream=0, upstream=0, max_varbinds=30)
+async def test_too_big_halves_max_repetitions(agent: StubSnmpAgent) -> None:
+    client = SnmpClient("127.0.0.1", agent.port, max_repetitions=25, timeout=1.0)
+    columns = await client.walk_columns(EVENT_COLUMNS)
+
+    assert agent.too_big == 2
+    assert agent.repetitions[:3] == [25, 12, 6]
+    assert set(agent.repetitions[3:]) == {6}     # stays down for the rest of the walk
+    assert all(len(columns[c]) == 20 for c in EVENT_COLUMNS)
+
+
+@pytest.mark.asyncio
+@pytest.mark.agent(community="private")
+async def test_unanswered_walk_times_out(agent: StubSnmpAgent) -> None:
+    client = SnmpClient("127.0.0.1", agent.port, community="public", timeout=0.2, retries=1)
+    with pytest.raises(SnmpTimeout):
+        await client.walk_columns(EVENT_COLUMNS)
+    assert agent.requests == 2
+
+
+@pytest.mark.asyncio
+async def test_unchanged_table_is_the_same_object(agent: StubSnmpAgent) -> None:
+    api = VirginApi("127.0.0.1", None, backend=BACKEND_SNMP, port=agent.port)
+    first = await api.fetch_snapshot()
+    assert len(api.events) == 20
+    assert api.channels is not None and len(api.channels["ds_power"]) == 24
+
+    assert await api.fetch_snapshot() is first
+
+    agent.add_event(3, "SYNC Timing Synchronization failure - Loss of Sync")
+    changed = await api.fetch_snapshot()
+    assert changed is not first
+    assert api.events[-1]["message"] == "SYNC Timing Synchronization failure - Loss of Sync"
+    assert api.events[-1]["priority"] == "critical"
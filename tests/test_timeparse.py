@@ -0,0 +1,111 @@
+"""Virgin Modem Status – event time parser tests."""
+# tests/test_timeparse.py
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.virgin_modem_status.events import EventRow, EventTable
+from custom_components.virgin_modem_status.timeparse import (
+    FMT_CTIME,
+    FMT_DMY,
+    FMT_ISO,
+    FMT_MDY,
+    TimestampParser,
+)
+
+UK = timezone(timedelta(hours=1))   # BST: the modem logs local time
+
+
+def _table(*times: str) -> EventTable:
+    return EventTable([EventRow(i, t, f"event {i}") for i, t in enumerate(times, start=1)])
+
+
+@pytest.mark.parametrize(
+    ("text", "fmt"),
+    (
+        ("2024-06-07 10:48:21", FMT_ISO),
+        ("2024-06-07T10:48:21", FMT_ISO),
+        ("Fri Jun 07 10:48:21 2024", FMT_CTIME),
+        ("07/06/2024 10:48:21", FMT_DMY),
+        ("7/6/24 10:48:21", FMT_DMY),
+    ),
+)
+def test_formats_parse_to_aware_local_times(text: str, fmt: str) -> None:
+    parser = TimestampParser(UK)
+    parser.detect([text])
+    assert parser.format == fmt
+    assert parser.parse(text) == datetime(2024, 6, 7, 10, 48, 21, tzinfo=UK)
+
+
+def test_unambiguous_row_locks_day_first() -> None:
+    parser = TimestampParser(UK, day_first=False)
+    # 03/06 could be either; 13/06 can only be day/month
+    assert parser.detect(["03/06/2024 09:00:00", "13/06/2024 09:00:00"]) == FMT_DMY
+    assert parser.locked
+    assert parser.parse("03/06/2024 09:00:00") == datetime(2024, 6, 3, 9, 0, tzinfo=UK)
+
+
+def test_unambiguous_row_locks_month_first() -> None:
+    parser = TimestampParser(UK)
+    assert parser.detect(["06/03/2024 09:00:00", "06/13/2024 09:00:00"]) == FMT_MDY
+    assert parser.parse("06/03/2024 09:00:00") == datetime(2024, 6, 3, 9, 0, tzinfo=UK)
+
+
+def test_ambiguous_rows_assume_day_first_and_stay_open() -> None:
+    parser = TimestampParser(UK)
+    table = _table("03/06/2024 09:00:00", "04/06/2024 09:00:00")
+    parser.stamp(table)
+    assert parser.format == FMT_DMY and not parser.locked
+    assert table.rows[0].when == datetime(2024, 6, 3, 9, 0, tzinfo=UK)
+
+    # A later table settles it the other way: cached day-first results are dropped
+    parser.stamp(_table("06/03/2024 09:00:00", "06/13/2024 09:00:00"))
+    assert parser.format == FMT_MDY and parser.locked
+    assert parser.parse("03/06/2024 09:00:00") == datetime(2024, 3, 6, 9, 0, tzinfo=UK)
+
+
+def test_locked_format_is_not_redetected() -> None:
+    parser = TimestampParser(UK)
+    parser.detect(["2024-06-07 10:48:21"])
+    assert parser.detect(["13/06/2024 09:00:00"]) == FMT_ISO
+    # An off-format row (firmware mixing layouts) still parses, through the fallbacks
+    assert parser.parse("13/06/2024 09:00:00") == datetime(2024, 6, 13, 9, 0, tzinfo=UK)
+    # Repeats come from the cache
+    parser.parse("2024-06-07 10:48:21")
+    parser.parse("2024-06-07 10:48:21")
+    assert parser.cache_info()["hits"] >= 1
+
+
+@pytest.mark.parametrize(
+    "text",
+    (
+        "01/01/1970 00:03:12",     # before Time-of-Day sync: epoch + uptime
+        "1/1/70 00:03:12",
+        "1970-01-01 00:03:12",
+        "Thu Jan 01 00:03:12 1970",
+        "",
+        "Time Not Established",
+        "31/02/2024 09:00:00",     # no such date
+    ),
+)
+def test_unsynced_and_garbage_times_are_none(text: str) -> None:
+    parser = TimestampParser(UK)
+    parser.detect(["07/06/2024 10:48:21"])
+    assert parser.parse(text) is None
+
+
+def test_unsynced_rows_do_not_decide_the_order() -> None:
+    parser = TimestampParser(UK)
+    # Oldest → newest; the boot-time rows before sync carry 1970 stamps
+    table = _table("01/01/1970 00:01:10", "07/06/2024 10:48:21", "07/06/2024 10:50:02", "01/01/1970 00:00:40")
+    latest = parser.stamp(table)
+    assert [r.when is None for r in table.rows] == [True, False, False, True]
+    assert latest is table.rows[-1]
+
+
+def test_newest_first_table_is_detected() -> None:
+    parser = TimestampParser(UK)
+    table = _table("07/06/2024 10:50:02", "07/06/2024 10:48:21", "01/01/1970 00:00:40")
+    assert parser.stamp(table) is table.rows[0]
@@ -0,0 +1,195 @@
+"""Virgin Modem Status – line analytics long-run simulation."""
+# tools/bench_analytics.py
+#
+# Feeds a month (by default) of simulated polls through analytics.LineAnalytics,
+# the way the coordinator does (line_sample() per poll), and reports:
+#
+#   - false positives: share of polls flagged outside injected incidents, and
+#     false-alarm episodes (rising edges) per day, on a healthy but realistic
+#     line – diurnal SNR/power swing, noisy codeword counts with the odd small
+#     burst, a stray T3 a day;
+#   - detection: for each injected incident (SNR drifting down over hours, an
+#     uncorrectable storm, a T3 cluster, upstream power climbing), whether and
+#     how fast it was flagged;
+#   - cost: µs per update, and that memory stays flat over the whole run.
+#
+#   python tools/bench_analytics.py --days 30 --interval 90 --seed 1
+#
+# Only needs the integration's own modules (plus homeassistant for the package import).
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_components.virgin_modem_status.analytics import LineAnalytics, line_sample  # noqa: E402
+
+DAY = 86400.0
+DS_CHANNELS = 24
+US_CHANNELS = 4
+# After an incident ends, detectors get this long to settle before alarms count as false
+SETTLE = 3 * 3600.0
+# Incident kind → the metric expected to flag it
+FLAGGED_BY = {
+    "snr_drift": "snr_",
+    "uncorrected_storm": "uncorrected_per_min",
+    "t3_cluster": "t3_per_hour",
+    "us_power_climb": "us_power_max",
+}
+
+
+@dataclass
+class Incident:
+    kind: str
+    start: float        # seconds from the start of the run
+    duration: float
+
+
+def _incidents(days: float) -> List[Incident]:
+    """One of each kind per week, staggered, none in the first two days (warm-up)."""
+    kinds = [
+        ("snr_drift", 6 * 3600.0),     # SNR falls 3 dB over 6 h
+        ("uncorrected_storm", 3600.0),  # uncorrectables ×50 for an hour
+        ("t3_cluster", 1800.0),         # T3s every poll for half an hour
+        ("us_power_climb", 4 * 3600.0),  # upstream power +4 dB over 4 h
+    ]
+    out: List[Incident] = []
+    week = 0
+    while (week * 7 + 2) * DAY < days * DAY:
+        for i, (kind, duration) in enumerate(kinds):
+            start = (week * 7 + 2 + i * 1.5) * DAY + 10 * 3600.0
+            if start + duration < days * DAY:
+                out.append(Incident(kind, start, duration))
+        week += 1
+    return out
+
+
+class LineModel:
+    """A healthy cable line with the usual wobble, plus the injected incidents."""
+
+    def __init__(self, rng: random.Random, incidents: List[Incident]) -> None:
+        self.rng = rng
+        self.incidents = incidents
+        self.snr_base = [38.5 + rng.uniform(-1.0, 1.0) for _ in range(DS_CHANNELS)]
+        self.pwr_base = [2.0 + rng.uniform(-2.0, 2.0) for _ in range(DS_CHANNELS)]
+        self.us_base = [44.0 + rng.uniform(-1.0, 1.0) for _ in range(US_CHANNELS)]
+
+    def _progress(self, t: float, kind: str) -> float:
+        """0 outside the incident, ramping 0 → 1 across it."""
+        for inc in self.incidents:
+            if inc.kind == kind and inc.start <= t < inc.start + inc.duration:
+                return (t - inc.start) / inc.duration
+        return 0.0
+
+    def active(self, t: float, settle: float = 0.0) -> bool:
+        return any(inc.start <= t < inc.start + inc.duration + settle for inc in self.incidents)
+
+    def poll(self, t: float, elapsed: float) -> Dict[str, Optional[float]]:
+        rng = self.rng
+        # Temperature: ±0.4 dB SNR / ±0.6 dB power over the day
+        diurnal = math.sin(2 * math.pi * (t % DAY) / DAY)
+        drift = 3.0 * self._progress(t, "snr_drift")
+        snr = tuple(b - 0.4 * diurnal - drift + rng.gauss(0, 0.25) for b in self.snr_base)
+        ds_power = tuple(b + 0.6 * diurnal + rng.gauss(0, 0.2) for b in self.pwr_base)
+        climb = 4.0 * self._progress(t, "us_power_climb")
+        us_power = tuple(b - 0.5 * diurnal + climb + rng.gauss(0, 0.25) for b in self.us_base)
+
+        per_min = rng.expovariate(1 / 2.0)                  # ~2 uncorrectables a minute
+        if rng.random() < 0.002:                            # the odd small burst
+            per_min += rng.uniform(20, 60)
+        if self._progress(t, "uncorrected_storm"):
+            per_min *= 50
+            per_min += 200
+        t3 = 1 if rng.random() < elapsed / DAY else 0       # a stray T3 about once a day
+        if self._progress(t, "t3_cluster"):
+            t3 += 1
+        return line_sample(snr, ds_power, us_power, per_min * elapsed / 60.0, elapsed, t3)
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    incidents = _incidents(args.days)
+    model = LineModel(rng, incidents)
+    analytics = LineAnalytics()
+    polls = int(args.days * DAY / args.interval)
+
+    samples = [model.poll(i * args.interval, args.interval) for i in range(polls)]
+
+    spent = 0.0
+    flagged_clean = clean = episodes = 0
+    was_false = False
+    detected: Dict[int, Optional[float]] = {i: None for i in range(len(incidents))}
+    reasons_seen: Dict[str, int] = {}
+    for i, sample in enumerate(samples):
+        t = i * args.interval
+        started = time.perf_counter()
+        reasons = analytics.update(t, sample)
+        spent += time.perf_counter() - started
+
+        if model.active(t, SETTLE):
+            for n, inc in enumerate(incidents):
+                if (
+                    detected[n] is None
+                    and inc.start <= t < inc.start + inc.duration
+                    and any(r.startswith(FLAGGED_BY[inc.kind]) for r in reasons)
+                ):
+                    detected[n] = t - inc.start
+            was_false = False
+            continue
+        clean += 1
+        if reasons:
+            flagged_clean += 1
+            for reason in reasons:
+                reasons_seen[reason] = reasons_seen.get(reason, 0) + 1
+            if not was_false:
+                episodes += 1
+        was_false = bool(reasons)
+
+    # Second, traced pass: memory after the first day vs after the whole run
+    fresh = LineAnalytics()
+    day = int(DAY / args.interval)
+    tracemalloc.start()
+    for i, sample in enumerate(samples):
+        fresh.update(i * args.interval, sample)
+        if i == day:
+            mem_after_day = tracemalloc.get_traced_memory()[0]
+    mem_growth = tracemalloc.get_traced_memory()[0] - mem_after_day if polls > day else None
+    tracemalloc.stop()
+
+    return {
+        "days": args.days,
+        "interval_s": args.interval,
+        "polls": polls,
+        "false_positive_rate": round(flagged_clean / clean, 5) if clean else None,
+        "false_alarm_episodes_per_day": round(episodes / args.days, 3),
+        "false_alarm_reasons": reasons_seen,
+        "incidents": [
+            {**asdict(inc), "detected_after_min": round(detected[n] / 60, 1) if detected[n] is not None else None}
+            for n, inc in enumerate(incidents)
+        ],
+        "detected": f"{sum(v is not None for v in detected.values())}/{len(incidents)}",
+        "update_us": round(spent / polls * 1e6, 2),
+        "memory_growth_bytes_after_day_1": mem_growth,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate a month of polls through LineAnalytics.")
+    parser.add_argument("--days", type=float, default=30)
+    parser.add_argument("--interval", type=float, default=90, help="seconds between polls")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Virgin Modem Status – severity classifier micro-benchmark."""
+# tools/bench_classifier.py
+#
+# Times classification of a batch of DOCSIS messages against growing rule sets,
+# for the two ways of matching keywords:
+#
+#   loop        one `keyword in message` test per rule, in rank order, stopping
+#               at the first hit (how trouble keywords were matched before
+#               classifier.py)
+#   classifier  SeverityClassifier: one scan of the message for every keyword
+#               at once, ranks resolved from a precomputed table
+#
+# Rule sets are the built-in rules plus N extra user-style keywords that
+# (like most user rules) rarely occur, so both paths see the same worst case –
+# a message with no or only a late-ranked hit. Both must agree on every
+# message; a mismatch aborts the run. Reported: µs per message, per rule count
+# and batch size, so the growth with messages vs rules can be read off the table.
+#
+#   python tools/bench_classifier.py
+#   python tools/bench_classifier.py --rules 0 --rules 1000 --messages 20 --messages 20000
+#
+# Only needs the integration's own modules (plus homeassistant for the package import).
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import os
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from custom_components.virgin_modem_status.classifier import (  # noqa: E402
+    Rule,
+    SeverityClassifier,
+    get_classifier,
+)
+from stub_modem import MESSAGES  # noqa: E402
+
+SEVERITIES = ("critical", "warning", "notice")
+
+
+def loop_classify(rules: Sequence[Rule], message: str) -> Tuple[Optional[str], Optional[str]]:
+    """Per-rule substring tests in rank order; (severity, keyword) of the first hit."""
+    msg_l = message.lower()
+    for keyword, severity in rules:
+        if keyword in msg_l:
+            return severity, keyword
+    return None, None
+
+
+def rule_set(extra: int, rng: random.Random) -> List[Rule]:
+    """The built-in rules followed by `extra` synthetic user keywords."""
+    words = ("vendor", "code", "ds", "us", "ofdm", "profile", "tlv", "mdd", "cm", "reg")
+    rules = list(get_classifier().rules)
+    for n in range(extra):
+        keyword = f"{rng.choice(words)} {rng.choice(words)} {n:04x}"
+        rules.append((keyword, rng.choice(SEVERITIES)))
+    return rules
+
+
+def messages(count: int, rng: random.Random) -> List[str]:
+    """Realistic event texts (the stub modem's mix) with per-row MAC/channel suffixes."""
+    return [
+        f"{rng.choice(MESSAGES)[1]};CM-MAC=00:00:5e:00:53:{n % 256:02x};CMTS-MAC=00:00:5e:00:54:01;"
+        for n in range(count)
+    ]
+
+
+def _time(fn: Callable[[str], object], batch: List[str], rounds: int) -> float:
+    """Median µs per message over `rounds` passes of the batch."""
+    samples: List[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for message in batch:
+            fn(message)
+        samples.append((time.perf_counter() - started) / len(batch))
+    return statistics.median(samples) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Classification cost vs rule count and message count.")
+    parser.add_argument("--rules", action="append", type=int, help="extra rules on top of the built-in ones")
+    parser.add_argument("--messages", action="append", type=int, help="messages per batch")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    counts = args.messages or [100, 1000, 10000]
+    batches = {n: messages(n, rng) for n in counts}
+    print(f"{'rules':>6} {'messages':>9} {'loop µs/msg':>12} {'classifier µs/msg':>18} {'classifier ms/batch':>20}")
+    for extra in args.rules or [0, 100, 500, 2000]:
+        rules = rule_set(extra, rng)
+        classifier = SeverityClassifier(rules)
+        for n, batch in batches.items():
+            for message in batch:
+                severity, keyword = loop_classify(rules, message)
+                got = classifier.classify(message, "6")
+                if keyword is not None and got != (severity, keyword):
+                    sys.exit(f"{len(rules)} rules: classifier {got} vs loop {(severity, keyword)} on {message!r}")
+            loop_us = _time(lambda m: loop_classify(rules, m), batch, args.rounds)
+            clf_us = _time(classifier.classify, batch, args.rounds)
+            print(f"{len(rules):6d} {n:9d} {loop_us:12.2f} {clf_us:18.2f} {clf_us * n / 1000:20.2f}")
+
+
+if __name__ == "__main__":
+    main()
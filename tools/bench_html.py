@@ -0,0 +1,139 @@
+"""Virgin Modem Status – HTML status-page parser benchmark."""
+# tools/bench_html.py
+#
+# Compares, on large status pages, the original whole-body parser (kept below as
+# `legacy_parse`, exactly as VirginApi._extract_events_from_html was before the
+# streaming rewrite) with the streaming path VirginApi uses now: the body is
+# decoded chunk by chunk and fed to html_parser.HtmlEventStream, which keeps
+# only the newest 20 rows. Pages come from the stub modem (padded with
+# --pad-bytes, or with a long event log) or from recorded files (--payload).
+#
+# Reported per page: median ms per parse and peak KiB allocated while parsing
+# (tracemalloc, decode included for both paths). Both paths must agree on the
+# newest 20 rows; a mismatch aborts the run.
+#
+#   python tools/bench_html.py                              # 1 MB padded page, 5000-row log
+#   python tools/bench_html.py --pad-bytes 4194304 --payload hub3-status.html
+#
+# Needs the integration's runtime dependencies (homeassistant, aiohttp).
+from __future__ import annotations
+
+import argparse
+import codecs
+import os
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from custom_components.virgin_modem_status.html_parser import (  # noqa: E402
+    MAX_EVENT_ROWS,
+    HtmlEventStream,
+)
+from stub_modem import StubConfig, StubModem  # noqa: E402
+
+CHUNK_SIZE = 16 * 1024  # as VirginApi reads the body
+
+
+def legacy_parse(html: str) -> List[Dict[str, Any]]:
+    """The pre-streaming parser: whole-body regex passes, every row kept."""
+    if not html:
+        return []
+    text = re.sub(r"\s+", " ", html)
+    if re.search(r"(login|sign in)", text, re.I) and "password" in text.lower():
+        return []
+    rows = re.findall(r"<tr[^>]*>(.*?)</tr>", text, flags=re.I)
+    events: List[Dict[str, Any]] = []
+    time_pat = re.compile(
+        r"(?:(\d{4}-\d{2}-\d{2})|(\d{1,2}/\d{1,2}/\d{2,4}))\s+(\d{1,2}:\d{2}:\d{2})"
+    )
+
+    def strip_tags(s: str) -> str:
+        return re.sub(r"<[^>]+>", "", s).strip()
+
+    for row in rows:
+        cells = re.findall(r"<t[dh][^>]*>(.*?)</t[dh]>", row, flags=re.I)
+        if len(cells) < 2:
+            continue
+        raw_first = strip_tags(cells[0])
+        raw_last = strip_tags(cells[-1])
+        raw_mid = strip_tags(cells[1]) if len(cells) >= 3 else ""
+        if not time_pat.search(raw_first) and time_pat.search(raw_mid):
+            raw_first, raw_mid = raw_mid, raw_first
+        if not time_pat.search(raw_first):
+            continue
+        ev = {"time": raw_first, "priority": raw_mid.lower(), "message": raw_last}
+        if not ev["message"] or ev["message"].lower() in ("message", "event", "description"):
+            continue
+        events.append(ev)
+    return events
+
+
+def _legacy(body: bytes) -> List[Dict[str, Any]]:
+    return legacy_parse(body.decode("utf-8", errors="replace"))[-MAX_EVENT_ROWS:]
+
+
+def _streaming(body: bytes) -> List[Dict[str, Any]]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    stream = HtmlEventStream()
+    for start in range(0, len(body), CHUNK_SIZE):
+        stream.feed(decoder.decode(body[start:start + CHUNK_SIZE]))
+    stream.feed(decoder.decode(b"", final=True))
+    return stream.close()
+
+
+PATHS: Dict[str, Callable[[bytes], Any]] = {"legacy": _legacy, "streaming": _streaming}
+
+
+def _measure(fn: Callable[[bytes], Any], body: bytes, rounds: int) -> Tuple[float, float]:
+    """Median ms per call, and peak KiB allocated by one call."""
+    samples: List[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn(body)
+        samples.append(time.perf_counter() - started)
+    tracemalloc.start()
+    fn(body)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(samples) * 1000, peak / 1024
+
+
+def pages(args: argparse.Namespace) -> List[Tuple[str, bytes]]:
+    out = [
+        (f"padded {args.pad_bytes // 1024} KiB",
+         StubModem(StubConfig(format="html", pad_bytes=args.pad_bytes, seed=args.seed)).render()[0]),
+        (f"{args.log_rows}-row log",
+         StubModem(StubConfig(format="html", rows=args.log_rows, seed=args.seed)).render()[0]),
+    ]
+    for path in args.payload or []:
+        with open(path, "rb") as fh:
+            out.append((os.path.basename(path), fh.read()))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the legacy and streaming HTML parsers.")
+    parser.add_argument("--pad-bytes", type=int, default=1024 * 1024)
+    parser.add_argument("--log-rows", type=int, default=5000)
+    parser.add_argument("--payload", action="append", help="recorded status page")
+    parser.add_argument("--rounds", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'page':24} {'KiB':>8}" + "".join(f" {name + ' ms':>13} {'peak KiB':>9}" for name in PATHS))
+    for name, body in pages(args):
+        expected = _legacy(body)
+        if _streaming(body) != expected:
+            sys.exit(f"{name}: streaming parser disagrees with the legacy parser")
+        cells = "".join(f" {ms:13.2f} {kib:9.1f}" for ms, kib in (_measure(fn, body, args.rounds) for fn in PATHS.values()))
+        print(f"{name:24} {len(body) / 1024:8.1f}{cells}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Virgin Modem Status – hub scheduler load run against many stub modems."""
+# tools/bench_hub.py
+#
+# Starts N in-process stub modems (tools/stub_modem.py, one port each) and
+# polls them all through one VirginPollScheduler – shared keep-alive pool,
+# concurrency cap and retry budget, as in a multi-site install – for a while.
+# Reported: polls made vs due, missed intervals (a request still under way when
+# the modem's next slot came), coalesced polls (a slot that came while the
+# previous poll was still queued behind the concurrency cap), slot → start lag
+# percentiles (setup burst and steady state apart), and CPU use per interval-long
+# window, to show the load stays flat once the setup burst of polls is spread.
+# CPU is the whole process, so it includes the stub servers themselves.
+#
+#   python tools/bench_hub.py --modems 200 --interval 10 --duration 120
+#
+# Needs the integration's runtime dependencies (homeassistant, aiohttp).
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.virgin_modem_status.api import VirginApi  # noqa: E402
+from custom_components.virgin_modem_status.const import HUB_MAX_CONCURRENT  # noqa: E402
+from custom_components.virgin_modem_status.coordinator import VirginCoordinator  # noqa: E402
+from custom_components.virgin_modem_status.instrumentation import Histogram  # noqa: E402
+from custom_components.virgin_modem_status.scheduler import VirginPollScheduler  # noqa: E402
+from stub_modem import StubConfig, StubModem  # noqa: E402
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    stubs = [
+        StubModem(StubConfig(
+            format="oid", rotation=0.2, latency=args.latency, jitter=args.latency / 2, seed=i
+        ))
+        for i in range(args.modems)
+    ]
+    ports = [await stub.start() for stub in stubs]
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="vms-hub-"))
+    scheduler = VirginPollScheduler(hass, max_concurrent=args.concurrency)
+    coordinators: List[VirginCoordinator] = []
+    try:
+        started = time.monotonic()
+        cpu_started = time.process_time()
+        for i, port in enumerate(ports):
+            api = VirginApi(f"127.0.0.1:{port}", scheduler.session, budget=scheduler.retry_budget)
+            # Fixed interval (floor = ceiling) so every modem keeps its phase slot
+            coord = VirginCoordinator(
+                hass, api, args.interval, None, min_interval=args.interval, max_interval=args.interval
+            )
+            coordinators.append(coord)
+            scheduler.async_add(f"modem-{i}", coord)
+
+        windows: List[Dict[str, Any]] = []
+        polls = missed = coalesced = 0
+        setup_lag: Dict[str, Any] = {}
+        wall, cpu = started, cpu_started
+        while wall - started < args.duration:
+            await asyncio.sleep(args.interval)
+            now, now_cpu = time.monotonic(), time.process_time()
+            windows.append({
+                "t_s": round(now - started, 1),
+                "polls": scheduler.polls - polls,
+                "missed": scheduler.missed - missed,
+                "coalesced": scheduler.coalesced - coalesced,
+                "cpu_pct": round(100 * (now_cpu - cpu) / (now - wall), 1),
+            })
+            if not setup_lag:
+                # Everything after the first window is steady state
+                setup_lag = scheduler.lag.as_dict(scale=1000, digits=1)
+                scheduler.lag = Histogram(1e-4, 600.0)
+            wall, cpu = now, now_cpu
+            polls, missed, coalesced = scheduler.polls, scheduler.missed, scheduler.coalesced
+        elapsed = time.monotonic() - started
+        stats = scheduler.as_dict()
+        failures = sum(not c.last_update_success for c in coordinators)
+    finally:
+        await scheduler.async_stop()
+        for stub in stubs:
+            await stub.stop()
+
+    steady = [w["cpu_pct"] for w in windows[1:]] or [w["cpu_pct"] for w in windows]
+    return {
+        "modems": args.modems,
+        "interval_s": args.interval,
+        "concurrency": args.concurrency,
+        "stub_latency_s": args.latency,
+        "elapsed_s": round(elapsed, 1),
+        "polls": stats["polls"],
+        "missed_intervals": stats["missed_intervals"],
+        "coalesced_polls": stats["coalesced_polls"],
+        "failed_modems": failures,
+        "lag_ms_setup": setup_lag,
+        "lag_ms_steady": stats["lag_ms"],
+        "cpu_pct_steady": {"min": min(steady), "max": max(steady)},
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "windows": windows,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-run the hub scheduler against many stub modems.")
+    parser.add_argument("--modems", type=int, default=200)
+    parser.add_argument("--interval", type=int, default=10, help="poll interval per modem (s)")
+    parser.add_argument("--duration", type=float, default=60, help="run length (s)")
+    parser.add_argument("--concurrency", type=int, default=HUB_MAX_CONCURRENT)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub response latency (s)")
+    parser.add_argument("--output", help="write the JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Virgin Modem Status – JSON parse-path micro-benchmark."""
+# tools/bench_parse.py
+#
+# Times the ways a flat-OID /getRouterStatus body can be turned into event rows
+# and a channel sample, on recorded firmware bodies (--payload, repeatable) or
+# on stub-generated maps with realistic numbers of unrelated OIDs:
+#
+#   text      decode to str, json.loads, then one scan of every key for the event
+#             columns and another for the channel columns (the previous path)
+#   stdlib    json.loads on the raw bytes + the single-pass OidMapProfile.parse
+#   orjson    the same with orjson (what profiles.loads() uses when installed)
+#
+# Every path must produce the same rows; a mismatch aborts the run.
+#
+#   python tools/bench_parse.py --payload hub3.json --payload hub3-busy.json
+#   python tools/bench_parse.py --extra-oids 200 --extra-oids 1200
+#
+# Needs the integration's runtime dependencies (homeassistant, aiohttp).
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from custom_components.virgin_modem_status.channels import CHANNEL_COLUMNS  # noqa: E402
+from custom_components.virgin_modem_status.const import OID_MSG, OID_PRI, OID_TIME  # noqa: E402
+from custom_components.virgin_modem_status.profiles import PROFILES  # noqa: E402
+from stub_modem import StubConfig, StubModem  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+OID_MAP = PROFILES["oid_map"]
+_COLUMN_BY_OID = {oid: name for name, (_, oid) in CHANNEL_COLUMNS.items()}
+
+
+def _text(raw: bytes) -> Any:
+    """The previous path, kept here as the baseline."""
+    data = json.loads(raw.decode("utf-8", errors="replace").lstrip())
+    idxs = set()
+    for k in data.keys():
+        if k.startswith(OID_TIME) or k.startswith(OID_MSG) or k.startswith(OID_PRI):
+            try:
+                idxs.add(int(k.split(".")[-1]))
+            except Exception:
+                pass
+    events = []
+    for i in sorted(idxs):
+        t = str(data.get(f"{OID_TIME}{i}", "")).strip()
+        m = str(data.get(f"{OID_MSG}{i}", "")).strip()
+        p = str(data.get(f"{OID_PRI}{i}", "")).strip()
+        if t or m:
+            events.append({"time": t, "message": m, "priority": p})
+    sample: Dict[str, Dict[int, Any]] = {}
+    for key, value in data.items():
+        if not key.startswith("1.3.6.1."):
+            continue
+        head, _, idx = key.rpartition(".")
+        name = _COLUMN_BY_OID.get(head)
+        if name is not None:
+            sample.setdefault(name, {})[int(idx)] = value
+    return events, sample or None
+
+
+PATHS: Dict[str, Callable[[bytes], Any]] = {
+    "text": _text,
+    "stdlib": lambda raw: OID_MAP.parse(json.loads(raw)),
+}
+if orjson is not None:
+    PATHS["orjson"] = lambda raw: OID_MAP.parse(orjson.loads(raw))
+
+
+def _time(fn: Callable[[bytes], Any], raw: bytes, rounds: int) -> Tuple[float, float]:
+    """Median µs per call over `rounds` batches, and peak KiB allocated by one call."""
+    n = max(1, 200_000 // max(1, len(raw)))
+    samples: List[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(n):
+            fn(raw)
+        samples.append((time.perf_counter() - started) / n)
+    tracemalloc.start()
+    fn(raw)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(samples) * 1e6, peak / 1024
+
+
+def bodies(args: argparse.Namespace) -> List[Tuple[str, bytes]]:
+    out: List[Tuple[str, bytes]] = []
+    for path in args.payload or []:
+        with open(path, "rb") as fh:
+            out.append((os.path.basename(path), fh.read()))
+    for extra in args.extra_oids or ([] if out else [0, 200, 1200]):
+        stub = StubModem(StubConfig(format="oid", extra_oids=extra, seed=args.seed))
+        out.append((f"stub+{extra}", stub.render()[0]))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the flat-OID JSON parse paths.")
+    parser.add_argument("--payload", action="append", help="recorded /getRouterStatus body")
+    parser.add_argument("--extra-oids", action="append", type=int, help="stub map with N unrelated OIDs")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson is not installed; skipping that path", file=sys.stderr)
+    if not args.payload:
+        print("no --payload given: stub maps only, not recorded firmware bodies", file=sys.stderr)
+    print(f"{'body':24} {'KiB':>8} {'rows':>5}" + "".join(f" {name + ' µs':>12} {'KiB':>7}" for name in PATHS))
+    for name, raw in bodies(args):
+        expected = _text(raw)
+        for path, fn in PATHS.items():
+            if fn(raw) != expected:
+                sys.exit(f"{name}: {path} path disagrees with the text path")
+        cells = "".join(f" {us:12.1f} {kib:7.1f}" for us, kib in (_time(fn, raw, args.rounds) for fn in PATHS.values()))
+        print(f"{name:24} {len(raw) / 1024:8.1f} {len(expected[0]):5d}{cells}")
+
+
+if __name__ == "__main__":
+    main()
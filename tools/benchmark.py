@@ -0,0 +1,268 @@
+"""Virgin Modem Status – end-to-end poll benchmark against the local stub modem."""
+# tools/benchmark.py
+#
+# Runs VirginApi + VirginCoordinator (no running Home Assistant, just a bare
+# HomeAssistant object) against tools/stub_modem.py and reports, per scenario:
+# polls per second, poll / fetch / parse / shape latency percentiles, transient
+# and retained allocations per poll (tracemalloc) and peak RSS. Results are
+# written as JSON so runs on different commits can be compared. A startup run
+# measures time-to-ready (restored snapshot) and the config-flow probe against
+# a modem that never answers.
+#
+#   python tools/benchmark.py --output bench/base.json
+#   python tools/benchmark.py --compare bench/base.json
+#
+# Needs the integration's runtime dependencies (homeassistant, aiohttp).
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, replace
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from aiohttp import ClientSession  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.virgin_modem_status.api import VirginApi  # noqa: E402
+from custom_components.virgin_modem_status.coordinator import VirginCoordinator  # noqa: E402
+from custom_components.virgin_modem_status.instrumentation import trace_config  # noqa: E402
+from stub_modem import StubConfig, StubModem  # noqa: E402
+
+SCHEMA = 1
+
+SCENARIOS: Dict[str, StubConfig] = {
+    "oid": StubConfig(format="oid", rotation=0.5),
+    "json": StubConfig(format="json", rotation=0.5),
+    "html": StubConfig(format="html", rotation=0.5),
+    "html-large": StubConfig(format="html", rotation=0.5, pad_bytes=512 * 1024),
+    "html-1mb": StubConfig(format="html", rotation=0.5, pad_bytes=1024 * 1024),   # see bench_html.py
+    "oid-bulky": StubConfig(format="oid", rotation=0.5, extra_oids=600),   # real firmware OID dumps
+    "oid-static": StubConfig(format="oid", downstream=0, upstream=0),   # unchanged-body path
+    "flaky": StubConfig(format="oid", rotation=0.5, latency=0.002, fail_rate=0.1, reset_rate=0.05),
+}
+
+# metric → True when higher is better (compared by --compare)
+COMPARED = {
+    "polls_per_s": True,
+    "poll_ms.p50": False,
+    "poll_ms.p95": False,
+    "parse_ms.p95": False,
+    "shape_ms.p95": False,
+    "alloc_peak_kb_per_poll": False,
+    "retained_blocks_per_poll": False,
+}
+
+
+def _quantiles_ms(samples: List[float]) -> Dict[str, Optional[float]]:
+    if len(samples) < 2:
+        return {"p50": None, "p95": None, "p99": None}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": round(cuts[49] * 1000, 3), "p95": round(cuts[94] * 1000, 3), "p99": round(cuts[98] * 1000, 3)}
+
+
+def _percentiles(stage: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: stage.get(k) for k in ("p50", "p95", "p99")}
+
+
+async def run_scenario(name: str, config: StubConfig, polls: int, warmup: int) -> Dict[str, Any]:
+    stub = StubModem(config)
+    port = await stub.start()
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="vms-bench-"))
+    try:
+        async with ClientSession(trace_configs=[trace_config()]) as session:
+            api = VirginApi(f"127.0.0.1:{port}", session)
+            coord = VirginCoordinator(hass, api, 90, None)
+
+            for _ in range(warmup):
+                await coord.async_refresh()
+
+            # Timing pass (no tracing overhead)
+            durations: List[float] = []
+            failures = 0
+            started = time.perf_counter()
+            for _ in range(polls):
+                t0 = time.perf_counter()
+                await coord.async_refresh()
+                durations.append(time.perf_counter() - t0)
+                failures += not coord.last_update_success
+            elapsed = time.perf_counter() - started
+
+            # Allocation pass: transient peak per poll, and blocks still held afterwards
+            alloc_polls = max(1, polls // 4)
+            tracemalloc.start()
+            peaks: List[int] = []
+            before = tracemalloc.take_snapshot()
+            for _ in range(alloc_polls):
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                await coord.async_refresh()
+                peaks.append(tracemalloc.get_traced_memory()[1] - base)
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            retained = sum(s.count_diff for s in after.compare_to(before, "filename"))
+
+            stats = api.stats.as_dict()
+            timings = stats["timings_ms"]
+    finally:
+        await stub.stop()
+
+    return {
+        "stub": asdict(config),
+        "polls": polls,
+        "failures": failures,
+        "polls_per_s": round(polls / elapsed, 2) if elapsed else None,
+        "poll_ms": _quantiles_ms(durations),
+        "fetch_ms": _percentiles(timings.get("fetch", {})),
+        "ttfb_ms": _percentiles(timings.get("ttfb", {})),
+        "parse_ms": _percentiles(timings.get("parse", {})),
+        "parse_inline_ms": _percentiles(timings.get("parse_inline", {})),
+        "parse_executor_ms": _percentiles(timings.get("parse_executor", {})),
+        "shape_ms": _percentiles(timings.get("shape", {})),
+        "paths": stats["paths"],
+        "body_bytes": stats["bytes"].get("last"),
+        "alloc_peak_kb_per_poll": round(statistics.mean(peaks) / 1024, 1),
+        "retained_blocks_per_poll": round(retained / alloc_polls, 1),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "requests_served": stub.requests,
+    }
+
+
+async def run_startup(seed: int) -> Dict[str, Any]:
+    """Time-to-ready and reachability-probe time against a hung modem."""
+    stub = StubModem(StubConfig(format="oid", hang_rate=1.0, seed=seed))
+    port = await stub.start()
+    events = [
+        {"time": t.strftime("%d/%m/%Y %H:%M:%S"), "priority": str(level), "message": msg}
+        for t, level, msg in stub.log.events
+    ]
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="vms-bench-"))
+    try:
+        async with ClientSession(trace_configs=[trace_config()]) as session:
+            started = time.perf_counter()
+            api = VirginApi(f"127.0.0.1:{port}", session)
+            coord = VirginCoordinator(hass, api, 90, None)
+            coord.snapshot.load({"events": events})
+            await coord.async_restore()
+            ready = time.perf_counter() - started
+
+            probe_api = VirginApi(f"127.0.0.1:{port}", session, timeout=8)
+            started = time.perf_counter()
+            try:
+                await probe_api.check_reachable()
+                probe_error = None
+            except Exception as exc:  # expected: the stub never answers
+                probe_error = type(exc).__name__
+            probe = time.perf_counter() - started
+    finally:
+        await stub.stop()
+    return {
+        "ready_ms": round(ready * 1000, 3),
+        "restored_status": (coord.data or {}).get("status"),
+        "probe_s": round(probe, 3),
+        "probe_error": probe_error,
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metric(result: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = result
+    for part in path.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value if isinstance(value, (int, float)) else None
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float) -> List[str]:
+    """Print a per-metric comparison; returns the regressions beyond `tolerance`."""
+    regressions: List[str] = []
+    print(f"\n{'scenario / metric':40} {'base':>12} {'now':>12} {'change':>9}")
+    for name, result in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        for path, higher_better in COMPARED.items():
+            old, new = _metric(base, path), _metric(result, path)
+            if old is None or new is None or old == 0:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_better else change
+            flag = "  REGRESSION" if worse > tolerance else ""
+            print(f"{name + ' / ' + path:40} {old:12.3f} {new:12.3f} {change:+8.1%}{flag}")
+            if flag:
+                regressions.append(f"{name}/{path}")
+    return regressions
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    names = args.scenario or list(SCENARIOS)
+    results: Dict[str, Any] = {}
+    for name in names:
+        config = replace(SCENARIOS[name], seed=args.seed)
+        print(f"running {name} ({args.polls} polls)…", file=sys.stderr)
+        results[name] = await run_scenario(name, config, args.polls, args.warmup)
+    print("running startup…", file=sys.stderr)
+    startup = await run_startup(args.seed)
+    return {
+        "schema": SCHEMA,
+        "commit": _commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": results,
+        "startup": startup,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the poll pipeline against the stub modem.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--polls", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON results here (default: stdout)")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative regression")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(main_async(args))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            regressions = compare(json.load(fh), report, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
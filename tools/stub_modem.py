@@ -0,0 +1,278 @@
+"""Virgin Modem Status – local stub modem for development and benchmarks."""
+# tools/stub_modem.py
+#
+# Serves /getRouterStatus the way Virgin Hub firmwares do – as a flat OID map,
+# a JSON event list or an HTML page – from generated or recorded payloads,
+# with configurable latency, payload size, log rotation and failure injection.
+#
+#   python tools/stub_modem.py --format oid --port 8080 --rotation 0.2 --fail-rate 0.05
+#
+# then point the integration (or tools/benchmark.py) at 127.0.0.1:8080.
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+STATUS_PATH = "/getRouterStatus"
+FORMATS = ("oid", "json", "html")
+
+# docsDevEventTable / channel-table column prefixes (kept in sync with const.py)
+OID_TIME = "1.3.6.1.2.1.69.1.5.8.1.2."
+OID_PRI = "1.3.6.1.2.1.69.1.5.8.1.5."
+OID_MSG = "1.3.6.1.2.1.69.1.5.8.1.7."
+OID_DS_CHANNEL_ID = "1.3.6.1.2.1.10.127.1.1.1.1.1."
+OID_DS_POWER = "1.3.6.1.2.1.10.127.1.1.1.1.6."
+OID_DS_SNR = "1.3.6.1.2.1.10.127.1.1.4.1.5."
+OID_DS_CORRECTED = "1.3.6.1.2.1.10.127.1.1.4.1.3."
+OID_DS_UNCORRECTED = "1.3.6.1.2.1.10.127.1.1.4.1.4."
+OID_US_CHANNEL_ID = "1.3.6.1.2.1.10.127.1.1.2.1.1."
+OID_US_POWER = "1.3.6.1.4.1.4491.2.1.20.1.2.1.1."
+OID_VENDOR = "1.3.6.1.4.1.4115.1.20.1.1."     # Arris enterprise subtree (filler)
+
+# (docsDevEvLevel, message) – a realistic mix, T3/T4 and sync losses included
+MESSAGES: Tuple[Tuple[int, str], ...] = (
+    (6, "Started Unicast Maintenance Ranging - No Response received - T3 time-out"),
+    (5, "No Ranging Response received - T3 time-out"),
+    (3, "Unicast Maintenance Ranging attempted - No response - Retries exhausted"),
+    (3, "Received Response to Broadcast Maintenance Request, But no Unicast Maintenance opportunities received - T4 timeout"),
+    (3, "SYNC Timing Synchronization failure - Loss of Sync"),
+    (6, "Honoring MDD; IP provisioning mode = IPv4"),
+    (6, "DHCP RENEW sent - No response for IPv4"),
+    (5, "TLV-11 - unrecognized OID"),
+    (6, "REG RSP not received"),
+    (4, "DBC-REQ Mismatch Between Calculated Value for P1.6hi Compared to CCAP Provided Value"),
+)
+
+
+@dataclass
+class StubConfig:
+    format: str = "oid"
+    rows: int = 20                  # rows in the modem's event log
+    downstream: int = 24            # downstream channels (oid format only)
+    upstream: int = 4
+    pad_bytes: int = 0              # extra filler, to model bulky firmware pages
+    extra_oids: int = 0             # unrelated OIDs in the map, as real firmwares dump (oid format)
+    rotation: float = 0.0           # new log rows per request (fractions accumulate)
+    latency: float = 0.0            # seconds before the response headers
+    jitter: float = 0.0             # ± seconds added to latency
+    fail_rate: float = 0.0          # share of requests answered 503
+    hang_rate: float = 0.0          # share of requests never answered
+    reset_rate: float = 0.0         # share of requests whose connection is dropped
+    payload: Optional[str] = None   # serve this recorded file instead of generating
+    seed: int = 1
+
+
+@dataclass
+class _Log:
+    """The modem's rotating event log: the newest `rows` events."""
+    rows: int
+    rng: random.Random
+    events: List[Tuple[datetime, int, str]] = field(default_factory=list)
+    clock: datetime = field(default_factory=lambda: datetime(2024, 5, 1, 8, 0, 0))
+    _carry: float = 0.0
+
+    def __post_init__(self) -> None:
+        for _ in range(self.rows):
+            self.add()
+
+    def add(self) -> None:
+        self.clock += timedelta(seconds=self.rng.randint(5, 900))
+        level, message = self.rng.choice(MESSAGES)
+        self.events.append((self.clock, level, message))
+        del self.events[:-self.rows]
+
+    def rotate(self, rate: float) -> None:
+        self._carry += rate
+        while self._carry >= 1.0:
+            self._carry -= 1.0
+            self.add()
+
+
+class StubModem:
+    """aiohttp application emulating one modem; also usable in-process (see benchmark.py)."""
+
+    def __init__(self, config: StubConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.log = _Log(config.rows, self.rng)
+        self.counters = [0] * config.downstream
+        self.requests = 0
+        self._recorded: Optional[Tuple[bytes, str]] = None
+        if config.payload:
+            with open(config.payload, "rb") as fh:
+                body = fh.read()
+            self._recorded = (body, "application/json" if body.lstrip()[:1] in (b"{", b"[") else "text/html")
+        self.app = web.Application()
+        self.app.router.add_get(STATUS_PATH, self._handle)
+        self.app.router.add_route("HEAD", "/", self._handle_head)
+        self._runner: Optional[web.AppRunner] = None
+        self._release = asyncio.Event()     # ends hung requests on stop()
+        self.port: Optional[int] = None
+
+    # ----------------- payloads -----------------
+
+    def _stamp(self, when: datetime) -> str:
+        return when.strftime("%d/%m/%Y %H:%M:%S")
+
+    def _padding(self) -> str:
+        return "x" * self.config.pad_bytes
+
+    def render(self) -> Tuple[bytes, str]:
+        """Current payload and content type."""
+        if self._recorded is not None:
+            return self._recorded
+        fmt = self.config.format
+        if fmt == "html":
+            return self._render_html(), "text/html"
+        if fmt == "json":
+            events = [
+                {"time": self._stamp(t), "priority": str(level), "message": msg}
+                for t, level, msg in self.log.events
+            ]
+            doc: Dict[str, Any] = {"events": events}
+            if self.config.pad_bytes:
+                doc["padding"] = self._padding()
+            return json.dumps(doc).encode(), "application/json"
+        return json.dumps(self._oid_map()).encode(), "application/json"
+
+    def _oid_map(self) -> Dict[str, Any]:
+        rng = self.rng
+        data: Dict[str, Any] = {}
+        for i, (t, level, msg) in enumerate(self.log.events, start=1):
+            data[f"{OID_TIME}{i}"] = self._stamp(t)
+            data[f"{OID_PRI}{i}"] = str(level)
+            data[f"{OID_MSG}{i}"] = msg
+        for ch in range(self.config.downstream):
+            ifindex = 3 + ch
+            self.counters[ch] += rng.randint(0, 5000)
+            data[f"{OID_DS_CHANNEL_ID}{ifindex}"] = ch + 1
+            data[f"{OID_DS_POWER}{ifindex}"] = rng.randint(-40, 60)      # TenthdBmV
+            data[f"{OID_DS_SNR}{ifindex}"] = rng.randint(370, 405)       # TenthdB
+            data[f"{OID_DS_CORRECTED}{ifindex}"] = self.counters[ch]
+            data[f"{OID_DS_UNCORRECTED}{ifindex}"] = self.counters[ch] // 1000
+        for ch in range(self.config.upstream):
+            ifindex = 100 + ch
+            data[f"{OID_US_CHANNEL_ID}{ifindex}"] = ch + 1
+            data[f"{OID_US_POWER}{ifindex}"] = rng.randint(420, 480)
+        for n in range(self.config.extra_oids):
+            data[f"{OID_VENDOR}{n % 40 + 1}.{n // 40}"] = (
+                f"value {n}" if n % 3 else rng.randint(0, 1 << 31)
+            )
+        if self.config.pad_bytes:
+            data["1.3.6.1.4.1.4115.1.20.1.1.5.99.0"] = self._padding()
+        return data
+
+    def _render_html(self) -> bytes:
+        rows = "".join(
+            f"<tr><td>{self._stamp(t)}</td><td>{level}</td><td>{msg}</td></tr>"
+            for t, level, msg in self.log.events
+        )
+        return (
+            "<html><head><title>Router Status</title></head><body>"
+            f"<!-- {self._padding()} -->"
+            "<table><tr><th>Time</th><th>Priority</th><th>Description</th></tr>"
+            f"{rows}</table></body></html>"
+        ).encode()
+
+    # ----------------- handlers -----------------
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        cfg = self.config
+        self.requests += 1
+        self.log.rotate(cfg.rotation)
+        delay = cfg.latency + (self.rng.uniform(-cfg.jitter, cfg.jitter) if cfg.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        roll = self.rng.random()
+        if roll < cfg.hang_rate:
+            await self._release.wait()                 # the client's deadline fires first
+            raise web.HTTPServiceUnavailable()
+        roll -= cfg.hang_rate
+        if roll < cfg.reset_rate:
+            if request.transport is not None:
+                request.transport.close()
+            raise web.HTTPServiceUnavailable()         # never delivered; the socket is gone
+        roll -= cfg.reset_rate
+        if roll < cfg.fail_rate:
+            raise web.HTTPServiceUnavailable()
+        body, content_type = self.render()
+        return web.Response(body=body, content_type=content_type)
+
+    async def _handle_head(self, _request: web.Request) -> web.StreamResponse:
+        return web.Response()
+
+    # ----------------- lifecycle -----------------
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Serve on host:port (0 = any free port); returns the bound port."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self.port
+
+    async def stop(self) -> None:
+        self._release.set()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Stub options, shared with benchmark.py."""
+    defaults = StubConfig()
+    parser.add_argument("--format", choices=FORMATS, default=defaults.format)
+    parser.add_argument("--rows", type=int, default=defaults.rows)
+    parser.add_argument("--downstream", type=int, default=defaults.downstream)
+    parser.add_argument("--upstream", type=int, default=defaults.upstream)
+    parser.add_argument("--pad-bytes", type=int, default=defaults.pad_bytes)
+    parser.add_argument("--extra-oids", type=int, default=defaults.extra_oids)
+    parser.add_argument("--rotation", type=float, default=defaults.rotation)
+    parser.add_argument("--latency", type=float, default=defaults.latency)
+    parser.add_argument("--jitter", type=float, default=defaults.jitter)
+    parser.add_argument("--fail-rate", type=float, default=defaults.fail_rate)
+    parser.add_argument("--hang-rate", type=float, default=defaults.hang_rate)
+    parser.add_argument("--reset-rate", type=float, default=defaults.reset_rate)
+    parser.add_argument("--payload", help="serve a recorded /getRouterStatus body instead")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def config_from_args(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(
+        format=args.format,
+        rows=args.rows,
+        downstream=args.downstream,
+        upstream=args.upstream,
+        pad_bytes=args.pad_bytes,
+        extra_oids=args.extra_oids,
+        rotation=args.rotation,
+        latency=args.latency,
+        jitter=args.jitter,
+        fail_rate=args.fail_rate,
+        hang_rate=args.hang_rate,
+        reset_rate=args.reset_rate,
+        payload=args.payload,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_arguments(parser)
+    args = parser.parse_args()
+    stub = StubModem(config_from_args(args))
+    web.run_app(stub.app, host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""Virgin Modem Status – local stub SNMP v2c agent for development and tests."""
+# tools/stub_snmp.py
+#
+# Answers GetBulkRequests over UDP for the docsDevEventTable and the DOCSIS
+# channel tables the SNMP backend walks, the way a cable modem's agent does:
+# DateAndTime event stamps, docsDevEvLevel integers, TenthdB gauges and
+# Counter32 codeword counters. The BER codec is written out here on purpose
+# rather than borrowed from snmp.py, so the client is tested against an
+# independent implementation.
+#
+#   python tools/stub_snmp.py --port 1161 --rows 20 --max-varbinds 40
+#
+# then configure the integration with backend SNMP, 127.0.0.1, port 1161.
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from stub_modem import (
+    MESSAGES,
+    OID_DS_CHANNEL_ID,
+    OID_DS_CORRECTED,
+    OID_DS_POWER,
+    OID_DS_SNR,
+    OID_DS_UNCORRECTED,
+    OID_MSG,
+    OID_PRI,
+    OID_TIME,
+    OID_US_CHANNEL_ID,
+    OID_US_POWER,
+)
+
+Oid = Tuple[int, ...]
+
+INTEGER, OCTET_STRING, NULL, OBJECT_ID, SEQUENCE = 0x02, 0x04, 0x05, 0x06, 0x30
+COUNTER32, END_OF_MIB_VIEW = 0x41, 0x82
+GET_BULK, RESPONSE = 0xA5, 0xA2
+TOO_BIG = 1
+TIME_FORMATS = ("octets8", "octets11", "text")
+
+
+@dataclass
+class SnmpStubConfig:
+    rows: int = 20                  # rows in the modem's event log
+    downstream: int = 24            # downstream channels (0 = no channel tables)
+    upstream: int = 4
+    community: str = "public"       # requests with any other community are ignored
+    max_varbinds: int = 0           # replies longer than this are answered tooBig (0 = no limit)
+    time_format: str = "octets8"    # docsDevEvTime as 8 / 11 DateAndTime octets, or display text
+    drop_rate: float = 0.0          # share of requests never answered
+    seed: int = 1
+
+
+def _oid(text: str) -> Oid:
+    return tuple(int(x) for x in text.strip(".").split("."))
+
+
+# ----------------- BER -----------------
+
+def _tlv(tag: int, payload: bytes) -> bytes:
+    n = len(payload)
+    if n < 0x80:
+        head = bytes((tag, n))
+    else:
+        raw = n.to_bytes((n.bit_length() + 7) // 8, "big")
+        head = bytes((tag, 0x80 | len(raw))) + raw
+    return head + payload
+
+
+def _encode_int(tag: int, value: int, signed: bool = True) -> bytes:
+    size = value.bit_length() // 8 + 1
+    return _tlv(tag, value.to_bytes(size, "big", signed=signed))
+
+
+def _encode_oid(oid: Oid) -> bytes:
+    out = bytearray()
+    for arc in (oid[0] * 40 + oid[1], *oid[2:]):
+        chunk = [arc & 0x7F]
+        arc >>= 7
+        while arc:
+            chunk.append(0x80 | (arc & 0x7F))
+            arc >>= 7
+        out += bytes(reversed(chunk))
+    return _tlv(OBJECT_ID, bytes(out))
+
+
+def _items(buf: bytes) -> List[Tuple[int, bytes]]:
+    """The TLVs directly inside `buf`, as (tag, value bytes)."""
+    out: List[Tuple[int, bytes]] = []
+    pos = 0
+    while pos < len(buf):
+        tag, length = buf[pos], buf[pos + 1]
+        pos += 2
+        if length & 0x80:
+            n = length & 0x7F
+            length = int.from_bytes(buf[pos:pos + n], "big")
+            pos += n
+        out.append((tag, buf[pos:pos + length]))
+        pos += length
+    return out
+
+
+def _decode_oid(raw: bytes) -> Oid:
+    arcs: List[int] = []
+    value = 0
+    for byte in raw:
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            arcs.append(value)
+            value = 0
+    return (arcs[0] // 40, arcs[0] % 40, *arcs[1:])
+
+
+def decode_get_bulk(datagram: bytes) -> Tuple[bytes, int, int, int, List[Oid]]:
+    """(community, request-id, non-repeaters, max-repetitions, OIDs) of a GetBulkRequest."""
+    ((_, message),) = _items(datagram)
+    (_, _version), (_, community), (tag, pdu) = _items(message)
+    if tag != GET_BULK:
+        raise ValueError(f"not a GetBulkRequest (PDU tag 0x{tag:02x})")
+    (_, req_id), (_, non_rep), (_, max_rep), (_, varbinds) = _items(pdu)
+    oids = [_decode_oid(_items(vb)[0][1]) for _, vb in _items(varbinds)]
+    return (
+        community,
+        int.from_bytes(req_id, "big", signed=True),
+        int.from_bytes(non_rep, "big"),
+        int.from_bytes(max_rep, "big"),
+        oids,
+    )
+
+
+def encode_response(
+    community: bytes, request_id: int, varbinds: List[Tuple[Oid, bytes]], error_status: int = 0
+) -> bytes:
+    """A Response PDU; each varbind value is an already encoded TLV."""
+    body = b"".join(_tlv(SEQUENCE, _encode_oid(oid) + value) for oid, value in varbinds)
+    pdu = _tlv(
+        RESPONSE,
+        _encode_int(INTEGER, request_id) + _encode_int(INTEGER, error_status)
+        + _encode_int(INTEGER, 0) + _tlv(SEQUENCE, body),
+    )
+    return _tlv(SEQUENCE, _encode_int(INTEGER, 1) + _tlv(OCTET_STRING, community) + pdu)
+
+
+def date_and_time(when: datetime, octets: int = 8) -> bytes:
+    """SNMPv2-TC DateAndTime: year (2 octets), month, day, hour, minutes, seconds, deci-seconds[, UTC offset]."""
+    raw = when.year.to_bytes(2, "big") + bytes(
+        (when.month, when.day, when.hour, when.minute, when.second, 0)
+    )
+    return raw + b"+\x00\x00" if octets == 11 else raw
+
+
+# ----------------- agent -----------------
+
+class StubSnmpAgent(asyncio.DatagramProtocol):
+    """A modem's SNMP agent, in-process: start(), then walk 127.0.0.1:<port>."""
+
+    def __init__(self, config: Optional[SnmpStubConfig] = None) -> None:
+        self.config = config or SnmpStubConfig()
+        self.rng = random.Random(self.config.seed)
+        self.requests = 0
+        self.too_big = 0
+        self.repetitions: List[int] = []    # max-repetitions of every request, in order
+        self.clock = datetime(2024, 5, 1, 8, 0, 0)
+        self._mib: Dict[Oid, bytes] = {}
+        self._order: List[Oid] = []
+        self._next_index = 1
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self.port: Optional[int] = None
+        for _ in range(self.config.rows):
+            level, message = self.rng.choice(MESSAGES)
+            self.add_event(level, message)
+        self._add_channels()
+
+    # ----------------- MIB -----------------
+
+    def _set(self, oid: Oid, value: bytes) -> None:
+        if oid not in self._mib:
+            bisect.insort(self._order, oid)
+        self._mib[oid] = value
+
+    def add_event(self, level: int, message: str, when: Optional[datetime] = None) -> None:
+        """Append a docsDevEventTable row (the newest has the highest docsDevEvIndex)."""
+        if when is None:
+            self.clock += timedelta(seconds=self.rng.randint(5, 900))
+            when = self.clock
+        idx = self._next_index
+        self._next_index += 1
+        fmt = self.config.time_format
+        stamp = (
+            _tlv(OCTET_STRING, when.strftime("%d/%m/%Y %H:%M:%S").encode()) if fmt == "text"
+            else _tlv(OCTET_STRING, date_and_time(when, 11 if fmt == "octets11" else 8))
+        )
+        self._set(_oid(OID_TIME) + (idx,), stamp)
+        self._set(_oid(OID_PRI) + (idx,), _encode_int(INTEGER, level))
+        self._set(_oid(OID_MSG) + (idx,), _tlv(OCTET_STRING, message.encode()))
+
+    def _add_channels(self) -> None:
+        rng = self.rng
+        for ch in range(self.config.downstream):
+            ifindex = 3 + ch
+            corrected = rng.randint(0, 10 ** 6)
+            self._set(_oid(OID_DS_CHANNEL_ID) + (ifindex,), _encode_int(INTEGER, ch + 1))
+            self._set(_oid(OID_DS_POWER) + (ifindex,), _encode_int(INTEGER, rng.randint(-40, 60)))
+            self._set(_oid(OID_DS_SNR) + (ifindex,), _encode_int(INTEGER, rng.randint(370, 405)))
+            self._set(_oid(OID_DS_CORRECTED) + (ifindex,), _encode_int(COUNTER32, corrected, signed=False))
+            self._set(_oid(OID_DS_UNCORRECTED) + (ifindex,), _encode_int(COUNTER32, corrected // 1000, signed=False))
+        for ch in range(self.config.upstream):
+            ifindex = 100 + ch
+            self._set(_oid(OID_US_CHANNEL_ID) + (ifindex,), _encode_int(INTEGER, ch + 1))
+            self._set(_oid(OID_US_POWER) + (ifindex,), _encode_int(INTEGER, rng.randint(420, 480)))
+
+    def _next(self, oid: Oid) -> Tuple[Oid, bytes]:
+        i = bisect.bisect_right(self._order, oid)
+        if i == len(self._order):
+            return oid, _tlv(END_OF_MIB_VIEW, b"")
+        found = self._order[i]
+        return found, self._mib[found]
+
+    def get_bulk(self, oids: List[Oid], non_repeaters: int, max_repetitions: int) -> List[Tuple[Oid, bytes]]:
+        """RFC 3416 GetBulk: one successor per non-repeater, then rows of successors."""
+        out = [self._next(oid) for oid in oids[:non_repeaters]]
+        cursors = list(oids[non_repeaters:])
+        for _ in range(max_repetitions):
+            for i, oid in enumerate(cursors):
+                found, value = self._next(oid)
+                out.append((found, value))
+                cursors[i] = found
+        return out
+
+    # ----------------- transport -----------------
+
+    def connection_made(self, transport: Any) -> None:
+        self._transport = transport
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        cfg = self.config
+        try:
+            community, request_id, non_rep, max_rep, oids = decode_get_bulk(data)
+        except (ValueError, IndexError):
+            return
+        self.requests += 1
+        self.repetitions.append(max_rep)
+        if community != cfg.community.encode() or self.rng.random() < cfg.drop_rate:
+            return
+        varbinds = self.get_bulk(oids, non_rep, max_rep)
+        if cfg.max_varbinds and len(varbinds) > cfg.max_varbinds:
+            self.too_big += 1
+            reply = encode_response(community, request_id, [], TOO_BIG)
+        else:
+            reply = encode_response(community, request_id, varbinds)
+        assert self._transport is not None
+        self._transport.sendto(reply, addr)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Listen on host:port (0 = any free port); returns the bound port."""
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, local_addr=(host, port))
+        assert self._transport is not None
+        self.port = self._transport.get_extra_info("sockname")[1]
+        return self.port
+
+    def stop(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    defaults = SnmpStubConfig()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1161)
+    parser.add_argument("--rows", type=int, default=defaults.rows)
+    parser.add_argument("--downstream", type=int, default=defaults.downstream)
+    parser.add_argument("--upstream", type=int, default=defaults.upstream)
+    parser.add_argument("--community", default=defaults.community)
+    parser.add_argument("--max-varbinds", type=int, default=defaults.max_varbinds)
+    parser.add_argument("--time-format", choices=TIME_FORMATS, default=defaults.time_format)
+    parser.add_argument("--drop-rate", type=float, default=defaults.drop_rate)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+    agent = StubSnmpAgent(SnmpStubConfig(
+        rows=args.rows,
+        downstream=args.downstream,
+        upstream=args.upstream,
+        community=args.community,
+        max_varbinds=args.max_varbinds,
+        time_format=args.time_format,
+        drop_rate=args.drop_rate,
+        seed=args.seed,
+    ))
+
+    async def _serve() -> None:
+        port = await agent.start(args.host, args.port)
+        print(f"SNMP stub agent on {args.host}:{port} (community {args.community!r})")
+        await asyncio.Event().wait()
+
+    asyncio.run(_serve())
+
+
+if __name__ == "__main__":
+    main()